@@ -0,0 +1,51 @@
+from pyftd import FTDClient, FTDSpecCache
+from os import environ
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+
+def time_client_construction(spec_cache: FTDSpecCache, rounds: int) -> list:
+    """Build a client rounds times and return the wall time of each construction in seconds"""
+    timings = []
+    for _ in range(rounds):
+        start = perf_counter()
+        FTDClient(
+            environ.get("FTDIP"),
+            environ.get("FTDUSER"),
+            environ.get("FTDPASS"),
+            fdm_port=environ.get("FDMPORT"),
+            verify=True if environ.get("VERIFY") else False,
+            spec_cache=spec_cache,
+        )
+        timings.append(perf_counter() - start)
+    return timings
+
+
+def main(rounds: int):
+    with TemporaryDirectory() as cache_dir:
+        spec_cache = FTDSpecCache(cache_dir)
+
+        # Cold: the cache is emptied before every construction so each client downloads the spec
+        cold = []
+        for _ in range(rounds):
+            spec_cache.clear()
+            cold += time_client_construction(spec_cache, 1)
+
+        # Warm: the spec is already on disk (the last cold run left it there)
+        warm = time_client_construction(spec_cache, rounds)
+
+    print(f"Client construction over {rounds} rounds")
+    print("--------------------------------------------------")
+    print(f"cold (spec downloaded): avg {sum(cold) / len(cold):.3f}s  min {min(cold):.3f}s  max {max(cold):.3f}s")
+    print(f"warm (spec cached):     avg {sum(warm) / len(warm):.3f}s  min {min(warm):.3f}s  max {max(warm):.3f}s")
+
+
+if __name__ == "__main__":
+    # Get ftd ip, username, and password from the env variable
+    #  e.g. in bash:
+    #   export FTDIP="172.30.4.28"
+    #   export FTDUSER="admin"
+    #   export FTDPASS="P@$$w0rd1!"
+    #   export FDMPORT="8080"
+    # only set the env var "export VERIFY=True" if you want to enable TLS cert checking otherwise omit
+    main(int(environ.get("ROUNDS", 5)))
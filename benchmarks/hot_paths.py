@@ -0,0 +1,257 @@
+from pyftd import FTDClient, FTDMockServer, FTDRetryPolicy, FTDSpecCache, __version__
+from datetime import datetime, timezone
+from multiprocessing import get_context
+from os import environ, makedirs, path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+import json
+import logging
+import platform
+import resource
+import warnings
+
+USERNAME, PASSWORD = "admin", "Admin123"
+
+
+def network_object(i: int) -> dict:
+    """The i-th network object of the benchmark"""
+    return {"name": f"bench-{i}", "subType": "HOST", "value": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"}
+
+
+def serve_mock(conn, latency: float) -> None:
+    """Run an FTDMockServer in this process and call its methods for the benchmark process, see MockFDMProcess"""
+    mock_fdm = FTDMockServer(username=USERNAME, password=PASSWORD, latency=latency).start()
+    conn.send(mock_fdm.port)
+    while True:
+        method, args = conn.recv()
+        if method == "stop":
+            break
+        conn.send(getattr(mock_fdm, method)(*args))
+    mock_fdm.stop()
+
+
+class MockFDMProcess(object):
+    """
+    The mock FDM server in a process of its own, so that serving requests does not compete with the client for the GIL
+    and the memory of the mock objects does not count towards the peak RSS of the client
+    """
+
+    def __init__(self, latency: float):
+        context = get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=serve_mock, args=(child_conn, latency), daemon=True)
+        self.process.start()
+        self.port = self.conn.recv()
+
+    def call(self, method: str, *args):
+        self.conn.send((method, args))
+        return self.conn.recv()
+
+    def stop(self) -> None:
+        self.conn.send(("stop", ()))
+        self.process.join()
+
+
+def reset_peak_rss() -> None:
+    """Start measuring the peak RSS from the current RSS (Linux), otherwise the peak of the process is reported"""
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def peak_rss_mb() -> float:
+    """:return: float the peak resident set size since reset_peak_rss() in MB"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kB on Linux
+
+
+def new_client(mock_fdm: MockFDMProcess, **kwargs) -> FTDClient:
+    return FTDClient("127.0.0.1", USERNAME, PASSWORD, verify=False, fdm_port=mock_fdm.port, **kwargs)
+
+
+def measure(mock_fdm: MockFDMProcess, case, *args) -> dict:
+    """
+    Run one benchmark case
+    :param case: callable that runs the case and returns a dict of extra results, if any
+    :return: dict wall time in seconds, the number of requests the mock served, the peak RSS in MB and the extras
+    """
+    mock_fdm.call("reset_stats")
+    reset_peak_rss()
+    start = perf_counter()
+    extra = case(*args) or {}
+    wall = perf_counter() - start
+    stats = mock_fdm.call("stats")
+    return dict(
+        {"wall": round(wall, 4), "requests": stats["requests"], "peak_rss_mb": round(peak_rss_mb(), 1)}, **extra
+    )
+
+
+def construction(mock_fdm: MockFDMProcess, spec_cache, rounds: int) -> dict:
+    """Build a client rounds times"""
+    timings = []
+    for _ in range(rounds):
+        start = perf_counter()
+        new_client(mock_fdm, spec_cache=spec_cache)
+        timings.append(perf_counter() - start)
+    return {"avg": round(sum(timings) / rounds, 4), "min": round(min(timings), 4)}
+
+
+def list_objects(ftd_client: FTDClient, count: int) -> dict:
+    """Read every network object"""
+    net_objs = ftd_client.get_list_parallel(ftd_client.get_network_object_list, page_size=500)
+    if len(net_objs) != count:
+        raise ValueError(f"Expected {count} network objects, got {len(net_objs)}")
+
+
+def create_single(ftd_client: FTDClient, net_objs: list) -> None:
+    """Create the objects one call at a time, in order"""
+    for net_obj in net_objs:
+        ftd_client.create_network_object(dict(net_obj, type="networkobject"))
+
+
+def create_bulk(ftd_client: FTDClient, net_objs: list) -> None:
+    """Create the objects with the bulk endpoint"""
+    results = ftd_client.bulk_create_network_objects([dict(net_obj, type="networkobject") for net_obj in net_objs])
+    if any(result.status != "created" for result in results):
+        raise ValueError("Not every object was created")
+
+
+def reauth(mock_fdm: MockFDMProcess, ftd_client: FTDClient, rounds: int) -> dict:
+    """A read whose token is no longer valid: 401, a new token and the read again. The token is expired untimed."""
+    timings = []
+    for _ in range(rounds):
+        mock_fdm.call("expire_tokens")
+        start = perf_counter()
+        ftd_client.get_network_object_list(filter="name:bench-0")
+        timings.append(perf_counter() - start)
+    return {"avg": round(sum(timings) / rounds, 4)}
+
+
+def plain_read(ftd_client: FTDClient, rounds: int) -> dict:
+    """The same read with a valid token, the reference for reauth"""
+    timings = []
+    for _ in range(rounds):
+        start = perf_counter()
+        ftd_client.get_network_object_list(filter="name:bench-0")
+        timings.append(perf_counter() - start)
+    return {"avg": round(sum(timings) / rounds, 4)}
+
+
+def locked_retry(mock_fdm: MockFDMProcess, ftd_client: FTDClient, retries: int) -> dict:
+    """A read that hits 423 Locked retries times before it goes through"""
+    mock_fdm.call("fail_next", 423, retries)
+    retry_policy = ftd_client.retry_policy
+    backoff = sum(
+        min(retry_policy.max_delay, retry_policy.base_delay * retry_policy.multiplier**n) for n in range(retries)
+    )
+    start = perf_counter()
+    ftd_client.get_network_object_list(filter="name:bench-0")
+    wall = perf_counter() - start
+    # With jitter=0 the client sleeps exactly the backoff, what is left is the cost of the failed attempts
+    return {"backoff": round(backoff, 4), "overhead": round(wall - backoff, 4)}
+
+
+def run(latency: float, rounds: int, list_sizes: list, creates: int) -> dict:
+    """:return: dict case name: results, see measure()"""
+    mock_fdm = MockFDMProcess(latency)
+    results = {}
+    try:
+        results["construction_cold"] = measure(mock_fdm, construction, mock_fdm, None, rounds)
+        with TemporaryDirectory() as cache_dir:
+            spec_cache = FTDSpecCache(cache_dir)
+            new_client(mock_fdm, spec_cache=spec_cache)  # put the spec in the cache
+            results["construction_cached"] = measure(mock_fdm, construction, mock_fdm, spec_cache, rounds)
+
+        ftd_client = new_client(mock_fdm, max_in_flight=4)
+        seeded = 0
+        for size in sorted(list_sizes):
+            mock_fdm.call("seed", "NetworkObject", size - seeded, None, network_object)
+            seeded = size
+            results[f"list_{size}"] = measure(mock_fdm, list_objects, ftd_client, size)
+
+        new_objs = [network_object(i) for i in range(seeded, seeded + 2 * creates)]
+        results[f"create_single_{creates}"] = measure(mock_fdm, create_single, ftd_client, new_objs[:creates])
+        results[f"create_bulk_{creates}"] = measure(mock_fdm, create_bulk, ftd_client, new_objs[creates:])
+
+        results["read"] = measure(mock_fdm, plain_read, ftd_client, rounds * 10)
+        results["read_401_reauth"] = measure(mock_fdm, reauth, mock_fdm, ftd_client, rounds * 10)
+
+        ftd_client.retry_policy = FTDRetryPolicy(base_delay=0.05, multiplier=2, jitter=0)
+        results["read_423_retry_3"] = measure(mock_fdm, locked_retry, mock_fdm, ftd_client, 3)
+    finally:
+        mock_fdm.stop()
+    return results
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """Print the change of the wall times against a saved baseline"""
+    print(f"\nChange against pyftd {baseline['pyftd_version']} ({baseline['taken_at']})")
+    print("--------------------------------------------------")
+    for case, result in results.items():
+        previous = baseline["results"].get(case)
+        if previous and previous["wall"]:
+            change = (result["wall"] - previous["wall"]) / previous["wall"] * 100
+            print(f"{case:<24} {previous['wall']:9.3f}s -> {result['wall']:9.3f}s  {change:+7.1f}%")
+
+
+def main(latency: float, rounds: int, list_sizes: list, creates: int, output: str, baseline: str):
+    warnings.simplefilter("ignore")  # the mock has a self-signed certificate
+    logging.getLogger("pyftd").setLevel(logging.CRITICAL)  # the 401 and 423 cases log every error they provoke
+    results = run(latency, rounds, list_sizes, creates)
+
+    print(f"pyftd {__version__} hot paths against the mock FDM API ({latency * 1000:.1f}ms latency per request)")
+    print("--------------------------------------------------")
+    for case, result in results.items():
+        extra = "  ".join(
+            f"{key} {value}" for key, value in result.items() if key not in ("wall", "requests", "peak_rss_mb")
+        )
+        print(
+            f"{case:<24} {result['wall']:9.3f}s  {result['requests']:6d} req  {result['peak_rss_mb']:7.1f}MB  {extra}"
+        )
+
+    if baseline:
+        with open(baseline) as baseline_file:
+            compare(results, json.load(baseline_file))
+
+    if output:
+        makedirs(path.dirname(path.abspath(output)), exist_ok=True)
+        with open(output, "w") as output_file:
+            json.dump(
+                {
+                    "pyftd_version": __version__,
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "latency": latency,
+                    "taken_at": datetime.now(timezone.utc).isoformat(),
+                    "results": results,
+                },
+                output_file,
+                indent=2,
+            )
+        print(f"\nBaseline saved to {output}")
+
+
+if __name__ == "__main__":
+    # Runs against a local mock FDM server (see pyftd/mock_fdm.py), no device needed. Optional env variables:
+    #   export LATENCY="0.002"                  seconds the mock adds to every request
+    #   export ROUNDS="5"                       client constructions per case, and 10x that many reads
+    #   export LIST_SIZES="1000,10000,50000"    the number of network objects listed
+    #   export CREATES="500"                    objects created one at a time and in bulk
+    #   export OUTPUT="benchmarks/baselines/pyftd-2.1.0.json"   save the results as a baseline
+    #   export BASELINE="benchmarks/baselines/pyftd-2.0.0.json" print the change against an earlier baseline
+    main(
+        float(environ.get("LATENCY", 0)),
+        int(environ.get("ROUNDS", 5)),
+        [int(size) for size in environ.get("LIST_SIZES", "1000,10000,50000").split(",")],
+        int(environ.get("CREATES", 500)),
+        environ.get("OUTPUT", f"benchmarks/baselines/pyftd-{__version__}.json"),
+        environ.get("BASELINE"),
+    )
@@ -0,0 +1,49 @@
+from pyftd import FTDClient
+from concurrent.futures import ThreadPoolExecutor
+from os import environ
+from requests import Session
+from time import perf_counter
+
+
+def pooled_get(ftd_client: FTDClient, url: str) -> None:
+    """One request over the shared, keep-alive connection pool of the client"""
+    ftd_client.http_session.get(url, verify=ftd_client.verify, timeout=ftd_client.timeout)
+
+
+def unpooled_get(ftd_client: FTDClient, url: str) -> None:
+    """One request over a brand new connection, the way get_api_version() and post() used to send theirs"""
+    with Session() as http_session:
+        http_session.get(
+            url, headers=ftd_client.http_session.headers, verify=ftd_client.verify, timeout=ftd_client.timeout
+        )
+
+
+def measure(request_fn, ftd_client: FTDClient, url: str, requests: int, workers: int) -> float:
+    """:return: float requests per second"""
+    start = perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for future in [executor.submit(request_fn, ftd_client, url) for _ in range(requests)]:
+            future.result()
+    return requests / (perf_counter() - start)
+
+
+def main(requests: int, workers: int):
+    ftd_client = FTDClient(
+        environ.get("FTDIP"),
+        environ.get("FTDUSER"),
+        environ.get("FTDPASS"),
+        fdm_port=environ.get("FDMPORT"),
+        verify=True if environ.get("VERIFY") else False,
+        pool_maxsize=workers,
+    )
+    url = ftd_client.common_prefix + "/operational/systeminfo/default"
+    print(f"{requests} GET requests with {workers} workers")
+    print("--------------------------------------------------")
+    print(f"new connection per request: {measure(unpooled_get, ftd_client, url, requests, workers):8.1f} req/s")
+    print(f"shared connection pool:     {measure(pooled_get, ftd_client, url, requests, workers):8.1f} req/s")
+
+
+if __name__ == "__main__":
+    # Point FTDIP, FTDUSER, FTDPASS (and FDMPORT) at a device or at a local mock FDM server
+    # only set the env var "export VERIFY=True" if you want to enable TLS cert checking otherwise omit
+    main(int(environ.get("REQUESTS", 200)), int(environ.get("WORKERS", 10)))
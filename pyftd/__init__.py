@@ -15,6 +15,19 @@ from .nat import FTDNatPolicy
 from .platform import FTDPlatform
 from .download import FTDDownload
 from .dhcp import FTDDHCP
+from .spec_cache import FTDSpecCache
+from .bulk import FTDBulkOperations, FTDBulkResult
+from .retry import FTDRetryPolicy
+from .metrics import FTDMetrics, FTDCallRecord
+from .async_client import FTDAsyncClient
+from .fleet import FTDFleet, FTDFleetResult
+from .object_cache import FTDObjectCache, FTDObjectLookups
+from .reconcile import FTDReconciler, FTDPlan, FTDChange
+from .snapshot import FTDSnapshot, iter_snapshot
+from .snapshot_diff import FTDSnapshotChange, diff_snapshots
+from .digests import FTDDigests, FTDTypeDigest, compare_digests, snapshot_digests
+from .mock_fdm import FTDMockServer
+from .cassette import FTDCassette
 from typing import Optional
 
 # from .ftd_backups import FTDBackups
@@ -49,6 +62,11 @@ class FTDClient(
     FTDPlatform,
     FTDDownload,
     FTDDHCP,
+    FTDBulkOperations,
+    FTDObjectLookups,
+    FTDReconciler,
+    FTDSnapshot,
+    FTDDigests,
     # FTDBackups,
     # FTDFlexConfig,
     # FTDHighAvailability,
@@ -89,6 +107,14 @@ class FTDClient(
         fdm_port: Optional[str] = None,
         proxies: Optional[dict] = None,
         timeout: int = 30,
+        spec_cache: Optional[FTDSpecCache] = None,
+        lazy: bool = False,
+        pool_maxsize: int = 10,
+        max_in_flight: int = 4,
+        retry_policy: Optional[FTDRetryPolicy] = None,
+        metrics: Optional[FTDMetrics] = None,
+        object_cache: Optional[FTDObjectCache] = None,
+        skip_unchanged_edits: bool = False,
     ):
         """
         :param ftd_ip: str the ip address of the FTD device to be managed
@@ -98,5 +124,34 @@ class FTDClient(
         :param fdm_port: str (Optional) Used to connect to ftd on a port other than the standard port 443
         :type fdm_port: str (Optional) Soecify only if FDM is not listening on port 443
         :param proxies: dict (Optional) a dictionary of proxy servers like: proxies={"https": "socks5://127.0.0.1:9999"}
+        :param timeout: int wait this many seconds before declaring the device unreachable
+        :param spec_cache: FTDSpecCache (Optional) reuse swagger specs from disk instead of downloading them every time
+        :param lazy: bool defer the api version probe, login and spec load until the client is first used
+        :param pool_maxsize: int the maximum number of keep-alive connections to the device shared by all calls
+        :param max_in_flight: int the maximum number of list pages fetched from the device at the same time
+        :param retry_policy: FTDRetryPolicy (Optional) backoff and retry rules for transient errors like HTTPLocked
+        :param metrics: FTDMetrics (Optional) measure the latency and outcome of every API call
+        :param object_cache: FTDObjectCache (Optional) keep the objects we read and write in memory for lookups
+        :param skip_unchanged_edits: bool do not send edits that would not change anything (see edit_operation)
         """
-        FTDBaseClient.__init__(self, ftd_ip, username, password, verify, fdm_port, proxies, timeout)
+        FTDBaseClient.__init__(
+            self,
+            ftd_ip,
+            username,
+            password,
+            verify,
+            fdm_port,
+            proxies,
+            timeout,
+            spec_cache,
+            lazy,
+            pool_maxsize,
+            max_in_flight,
+            retry_policy,
+            metrics,
+            object_cache,
+            skip_unchanged_edits,
+        )
+
+
+FTDAsyncClient.add_api_methods(FTDClient)  # the coroutines of the FTDClient API methods, see FTDAsyncClient
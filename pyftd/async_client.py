@@ -0,0 +1,734 @@
+import asyncio
+import logging
+from bravado.client import SwaggerClient, construct_request
+from bravado.exception import HTTPForbidden, HTTPNotFound, HTTPUnauthorized, HTTPUnprocessableEntity
+from bravado.http_future import unmarshal_response
+from bravado_core.exception import SwaggerMappingError
+from bravado_core.response import IncomingResponse
+from functools import update_wrapper
+from inspect import signature
+from json import loads
+from time import monotonic, perf_counter
+from typing import AsyncIterator, Iterable, Optional, Union
+from .base import FTDAPIWrapper, FTDBaseClient
+from .compare import changed_fields, count_edit, edit_target
+from .metrics import FTDCallRecord, FTDMetrics
+from .object_cache import FTDInterfaceIndex
+from .port_objects import FTDPortObjects
+from .retry import FTDRetryPolicy
+from .spec_cache import FTDSpecCache
+from .token_manager import FTDTokenManager
+
+try:
+    import aiohttp
+except ImportError:  # pip install pyftd[async]
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+
+class FTDAsyncClient(object):
+    """
+    An asyncio flavour of FTDClient. Its API methods are coroutines that send their requests with aiohttp on the event
+    loop they are awaited from, so a sweep of hundreds of devices runs on a single thread and thousands of calls to a
+    device share one connection pool.
+
+    The API methods are generated from the metadata of the FTDClient methods (see add_api_methods()): every method
+    tagged with list_operation, edit_operation or api_operation is offered here with the same name and arguments. The
+    iter_*() methods return async generators. The paging helpers, gather(), the object lookups (find_object() and
+    friends), the port object searches and resolve_interface() are coroutines of this class. The FTDClient methods
+    that are none of these, like the bulk_*() and upsert_*() helpers, the reconciler, snapshot() and post(), are not
+    available: use asyncio.gather() over the single calls instead.
+
+    Errors are handled like FTDAPIWrapper does for FTDClient, per swagger operation: the token is refreshed before it
+    expires and after a 401, the setup wizard is skipped after a 403 and transient errors are retried with the
+    retry_policy, sending only the failed operation again. Duplicates are logged and return None.
+
+    Needs aiohttp: pip install pyftd[async]. Only http(s) proxies are supported, not socks.
+
+    Sample usage:
+
+    async with FTDAsyncClient("192.168.100.100", "admin", "Admin123", verify=False) as ftd_client:
+        net_objs = await ftd_client.get_network_object_list(filter="name:TEST-NET")
+        async for port_obj in ftd_client.iter_tcp_port_objects():
+            print(port_obj.name)
+    """
+
+    OBJECT_LIST_METHODS = {}  # object type: the name of the get_*_list method, filled by add_api_methods()
+
+    def __init__(
+        self,
+        ftd_ip: str,
+        username: str,
+        password: str,
+        verify: bool = True,
+        fdm_port: Optional[str] = None,
+        proxies: Optional[dict] = None,
+        timeout: int = 30,
+        spec_cache: Optional[FTDSpecCache] = None,
+        pool_maxsize: int = 10,
+        max_in_flight: int = 4,
+        retry_policy: Optional[FTDRetryPolicy] = None,
+        metrics: Optional[FTDMetrics] = None,
+        skip_unchanged_edits: bool = False,
+    ):
+        """
+        The constructor makes no network calls. Use "async with FTDAsyncClient(...)" or await connect() before the
+        first call.
+        :param ftd_ip: str the ip address of the FTD device to be managed
+        :param username: str an admin user
+        :param password: str password for the admin-user (above)
+        :param verify: bool verify the validity the SSL certificate or not (Hint, self-signed certs = FALSE)
+        :param fdm_port: str (Optional) Used to connect to ftd on a port other than the standard port 443
+        :param proxies: dict (Optional) a dictionary of proxy servers like: proxies={"https": "http://10.1.1.1:3128"}
+        :param timeout: int wait this many seconds before declaring the device unreachable
+        :param spec_cache: FTDSpecCache (Optional) reuse swagger specs from disk instead of downloading them every time
+        :param pool_maxsize: int the maximum number of connections to the device shared by all calls
+        :param max_in_flight: int the maximum number of list pages fetched from the device at the same time
+        :param retry_policy: FTDRetryPolicy (Optional) backoff and retry rules for transient errors like HTTPLocked
+        :param metrics: FTDMetrics (Optional) measure the latency and outcome of every API call
+        :param skip_unchanged_edits: bool do not send edits that would not change anything (see edit_operation)
+        """
+        if aiohttp is None:
+            raise ImportError("FTDAsyncClient needs aiohttp. Install it with: pip install pyftd[async]")
+        self.ftd_ip = ftd_ip
+        self.username = username
+        self.password = password
+        self.verify = verify
+        self.fdm_port = str(fdm_port) if fdm_port else None
+        self.base_url = f"https://{ftd_ip}:{self.fdm_port}" if fdm_port else f"https://{ftd_ip}"
+        self.common_prefix = f"{self.base_url}/api/fdm/latest"
+        self.proxy = (proxies or {}).get("https")
+        self.timeout = timeout
+        self.spec_cache = spec_cache
+        self.pool_maxsize = pool_maxsize
+        self.max_in_flight = max_in_flight
+        self.retry_policy = retry_policy if retry_policy is not None else FTDRetryPolicy()
+        self.metrics = metrics
+        self.object_cache = None  # lookups always go to the device
+        self.interface_index = FTDInterfaceIndex()  # loaded on the first resolve_interface()
+        self.skip_unchanged_edits = skip_unchanged_edits
+        self.edits_sent = 0
+        self.edits_skipped = 0
+        self.headers = {"Accept": "application/json"}
+        self.token = None
+        self.token_manager = FTDTokenManager(self)  # bookkeeping only, the renewal itself is done by ensure_token()
+        self.api_version = None
+        self.swagger_client = None
+        self.http_session = None
+        self.token_lock = None
+        self.interface_lock = None
+        self.in_flight = None
+
+    async def __aenter__(self) -> "FTDAsyncClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @classmethod
+    def add_api_methods(cls, client_class) -> None:
+        """
+        Generate a coroutine for every method of client_class tagged with list_operation, edit_operation or
+        api_operation that this class does not define itself. pyftd/__init__.py calls it once, with FTDClient.
+        :param client_class: the class whose API methods we offer, FTDClient
+        """
+        for name in dir(client_class):
+            method = getattr(client_class, name)
+            if getattr(method, "swagger_obj_type", None) is not None:
+                cls.OBJECT_LIST_METHODS[method.swagger_obj_type] = name
+            if hasattr(cls, name):
+                continue
+            if getattr(method, "edit_operation", None) is not None:
+                api_method = FTDAsyncClient.edit_method(method)
+            elif getattr(method, "swagger_operation", None) is not None:
+                api_method = FTDAsyncClient.list_method(method)
+            elif getattr(method, "api_operation", None) is not None:
+                api_method = FTDAsyncClient.single_method(method)
+            else:
+                continue
+            setattr(cls, name, update_wrapper(api_method, method))  # the name, docstring, signature and tags of method
+
+    @staticmethod
+    def arguments(method, *args, **kwargs) -> dict:
+        """:return: dict argument name: value of a call to a method of the client class, with the defaults filled in"""
+        bound_arguments = signature(method).bind(None, *args, **kwargs)
+        bound_arguments.apply_defaults()
+        return bound_arguments.arguments
+
+    @staticmethod
+    def list_method(list_method):
+        """:return: the coroutine of a get_*_list method tagged with list_operation"""
+
+        async def api_method(self, *args, **kwargs):
+            arguments = FTDAsyncClient.arguments(list_method, *args, **kwargs)
+            params = FTDBaseClient.list_params(list_method, None, *args, **kwargs)
+            if params is None:
+                return None  # a search key was provided with no value to search on
+            page = await self.request(
+                list_method.__name__,
+                list_method.swagger_resource,
+                list_method.swagger_operation,
+                limit=arguments["limit"],
+                offset=arguments["offset"],
+                **params,
+            )
+            return page.items
+
+        return api_method
+
+    @staticmethod
+    def single_method(method):
+        """:return: the coroutine (or async generator for the iter_*() methods) of a method tagged with api_operation"""
+        if method.api_pages:
+
+            def api_method(self, *args, **kwargs):
+                arguments = FTDAsyncClient.arguments(method, *args, **kwargs)
+                params = {
+                    swagger_name: arguments[arg_name] for swagger_name, arg_name in method.api_param_names.items()
+                }
+                return self.iter_pages(method.api_resource, method.api_operation, arguments["page_size"], **params)
+
+            return api_method
+
+        async def api_method(self, *args, **kwargs):
+            arguments = FTDAsyncClient.arguments(method, *args, **kwargs)
+            params = {swagger_name: arguments[arg_name] for swagger_name, arg_name in method.api_param_names.items()}
+            result = await self.request(method.__name__, method.api_resource, method.api_operation, **params)
+            if method.api_result is None or result is None:
+                return result
+            return getattr(result, method.api_result)
+
+        return api_method
+
+    @staticmethod
+    def edit_method(edit_method):
+        """
+        :return: the coroutine of an edit_* method tagged with edit_operation. It sends the object, its path parameters
+                 and any other argument of the method named like a parameter of the swagger operation (like "at"), and
+                 skips edits that would not change anything like edit_operation does for FTDClient.
+        """
+
+        async def api_method(self, *args, skip_unchanged: Optional[bool] = None, **kwargs):
+            obj, params = edit_target(edit_method, *args, **kwargs)
+            if self.skip_unchanged_edits if skip_unchanged is None else skip_unchanged:
+                _, current = await self.current_object(edit_method, *args, **kwargs)
+                if current is not None and not changed_fields(current, obj):
+                    logger.info(f"{edit_method.__name__}: {getattr(current, 'name', None)} is already up to date")
+                    count_edit(self, sent=False)
+                    return current
+            swagger_client = await self.load_swagger_client()
+            operation = getattr(getattr(swagger_client, edit_method.edit_resource), edit_method.edit_operation)
+            for arg_name, value in FTDAsyncClient.arguments(edit_method, *args, **kwargs).items():
+                if arg_name in operation.operation.params and arg_name not in params:
+                    params[arg_name] = value
+            result = await self.request(
+                edit_method.__name__, edit_method.edit_resource, edit_method.edit_operation, body=obj, **params
+            )
+            if result is not None:
+                count_edit(self, sent=True)
+            return result
+
+        return api_method
+
+    async def connect(self) -> None:
+        """Open the connection pool, then probe the api version, log in and load the swagger spec at the same time"""
+        if self.http_session is None:
+            self.http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize, **({} if self.verify else {"ssl": False})),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self.token_lock = asyncio.Lock()
+            self.interface_lock = asyncio.Lock()
+            self.in_flight = asyncio.Semaphore(self.max_in_flight)
+        if self.spec_cache is None:
+            await asyncio.gather(self.get_api_version(), self.ensure_token(), self.load_swagger_client())
+        else:  # the spec_cache lookup probes the api version first
+            await asyncio.gather(self.ensure_token(), self.load_swagger_client())
+        if self.token is None:
+            logger.error("We failed to acquire a token from the FTD, so the client cannot be used.")
+            raise ValueError
+
+    async def close(self) -> None:
+        """Close the connection pool"""
+        if self.http_session is not None:
+            await self.http_session.close()
+            self.http_session = None
+
+    async def send(
+        self, method: str, url: str, call_record: Optional[FTDCallRecord] = None, **kwargs
+    ) -> "FTDAsyncResponse":
+        """
+        Send one request and read the whole response
+        :param method: str the http method like "GET"
+        :param url: str the full url
+        :param call_record: FTDCallRecord (Optional) the call this request is accounted to
+        :param kwargs: passed to aiohttp, like params, json, data and headers
+        :return: FTDAsyncResponse
+        """
+        # A header set to None is dropped from this request only, like the token requests of FTDBaseClient do
+        headers = {k: v for k, v in dict(self.headers, **(kwargs.pop("headers", None) or {})).items() if v is not None}
+        started = perf_counter()
+        async with self.http_session.request(method, url, headers=headers, proxy=self.proxy, **kwargs) as response:
+            raw_bytes = await response.read()
+        if call_record is not None:
+            call_record.add_request(perf_counter() - started, len(raw_bytes))
+        return FTDAsyncResponse(response.status, response.reason, response.headers, raw_bytes)
+
+    async def get_api_version(self) -> int:
+        """:return: int the highest api version supported by this appliance, see FTDBaseClient.get_api_version()"""
+        if self.api_version is None:
+            data = (await self.send("GET", f"{self.base_url}/api/versions")).json()
+            self.api_version = int(data["supportedVersions"][len(data["supportedVersions"]) - 2][1:])
+        return self.api_version
+
+    async def ensure_token(self) -> None:
+        """Make sure we hold an access token that will not expire soon, see FTDTokenManager.ensure_token()"""
+        if not self.token_manager.needs_refresh():
+            return
+        async with self.token_lock:
+            if not self.token_manager.needs_refresh():  # another call refreshed the token while we waited
+                return
+            if self.token_manager.can_refresh():
+                if await self.refresh_access_token() is None:
+                    return
+                logger.warning("The refresh_token grant failed. Falling back to the password grant.")
+            await self.get_access_token()
+
+    async def renew_token(self, rejected_token: Optional[str]) -> None:
+        """
+        Log in again after the device rejected a token with a 401. Calls that were rejected at the same time wait for
+        the first one to log in and then use its token.
+        :param rejected_token: str the Authorization header the 401 answered
+        """
+        async with self.token_lock:
+            if self.headers.get("Authorization") == rejected_token:
+                await self.get_access_token()
+
+    async def get_access_token(self) -> Union["FTDAsyncResponse", None]:
+        """
+        Log in with the password grant
+        :return: None if successful, else the API response
+        """
+        auth_payload = {"grant_type": "password", "username": self.username, "password": self.password}
+        api_response = await self.request_token(auth_payload)
+        if api_response is not None:
+            logger.error(
+                "We failed to successfully acquire a token from the FTD. Check your credentials and try again."
+            )
+            return api_response
+
+    async def refresh_access_token(self) -> Union["FTDAsyncResponse", None]:
+        """
+        Get a new access token with the refresh_token grant
+        :return: None if successful, else the API response
+        """
+        refresh_payload = {"grant_type": "refresh_token", "refresh_token": self.token_manager.refresh_token}
+        return await self.request_token(refresh_payload)
+
+    async def request_token(self, auth_payload: dict) -> Union["FTDAsyncResponse", None]:
+        """
+        POST a grant to /fdm/token and, if successful, send the new token with every following request
+        :param auth_payload: dict the grant we are sending
+        :return: None if successful, else the API response
+        """
+        api_response = await self.send(
+            "POST", self.common_prefix + "/fdm/token", json=auth_payload, headers={"Authorization": None}
+        )
+        if 200 <= api_response.status_code <= 299:
+            self.token = api_response.json()
+            self.token_manager.set_token(self.token)
+            self.headers["Authorization"] = f"Bearer {self.token['access_token']}"
+            logger.debug(f"Token successfully acquired with the {auth_payload['grant_type']} grant")
+        else:
+            return api_response
+
+    async def logout(self) -> Union["FTDAsyncResponse", None]:
+        """This call will invalidate a token"""
+        logout_payload = {
+            "grant_type": "revoke_token",
+            "access_token": self.token["access_token"],
+            "token_to_revoke": self.token["access_token"],
+        }
+        api_response = await self.send("POST", self.common_prefix + "/fdm/token", json=logout_payload)
+        if 200 <= api_response.status_code <= 299:
+            logger.warning("Logout Successful. Your API token is no longer valid.")
+        else:
+            logger.error("We failed to successfully Log out of the FTD.")
+            return api_response
+
+    async def get_software_version(self) -> Union[str, None]:
+        """:return: str the software build running on the device, like "7.0.1-84" """
+        api_response = await self.send("GET", self.common_prefix + "/operational/systeminfo/default")
+        if 200 <= api_response.status_code <= 299:
+            return api_response.json().get("softwareVersion")
+        logger.warning(f"Unable to determine the software version of the FTD: {api_response.status_code}")
+
+    async def load_swagger_client(self) -> SwaggerClient:
+        """Load the swagger spec, from the spec_cache when we can, and build the swagger_client"""
+        if self.swagger_client is not None:
+            return self.swagger_client
+        cache_key = None
+        checked = False
+        spec_dict = None
+        if self.spec_cache is not None:  # see FTDBaseClient.get_swagger_spec()
+            api_version = await self.get_api_version()
+            cache_key = self.spec_cache.device_key(self.base_url, api_version)
+            if cache_key is None:
+                await self.ensure_token()
+                software_version = await self.get_software_version()
+                if software_version:
+                    cache_key = self.spec_cache.cache_key(api_version, software_version)
+                    checked = True
+            if cache_key is not None:
+                spec_dict = self.spec_cache.get(cache_key)
+        if spec_dict is None:
+            spec_dict = (await self.send("GET", self.base_url + "/apispec/ngfw.json")).json()
+            if cache_key is not None:
+                self.spec_cache.put(cache_key, spec_dict)
+        if checked:
+            self.spec_cache.put_device(self.base_url, await self.get_api_version(), cache_key)
+        if self.swagger_client is None:  # another coroutine may have built it while we were downloading
+            self.swagger_client = SwaggerClient.from_spec(
+                spec_dict,
+                origin_url=self.base_url + "/apispec/ngfw.json",
+                config={"validate_responses": False, "validate_swagger_spec": False},
+            )
+        return self.swagger_client
+
+    async def call_operation(self, callable_operation, op_kwargs: dict, call_record: Optional[FTDCallRecord] = None):
+        """
+        Send one swagger operation and unmarshal its response, the way bravado's HttpFuture.result() does
+        :param callable_operation: bravado CallableOperation like swagger_client.NetworkObject.getNetworkObjectList
+        :param op_kwargs: dict the parameters of the operation
+        :param call_record: FTDCallRecord (Optional) the call this operation is accounted to
+        :return: the unmarshalled response, like a swagger model object
+        """
+        operation = callable_operation.operation
+        op_kwargs = dict(op_kwargs)
+        request_params = construct_request(operation, op_kwargs.pop("_request_options", {}), **op_kwargs)
+        if call_record is not None:
+            call_record.operations.append(operation.operation_id)
+        kwargs = {
+            # aiohttp only takes strings as query values, requests used to str() them for us
+            "params": [
+                (name, str(v))
+                for name, value in (request_params.get("params") or {}).items()
+                for v in (value if isinstance(value, (list, tuple)) else [value])
+            ],
+            "headers": request_params.get("headers"),
+        }
+        if "data" in request_params:
+            kwargs["data"] = request_params["data"]
+        incoming_response = await self.send(
+            request_params["method"], request_params["url"], call_record=call_record, **kwargs
+        )
+        unmarshal_response(incoming_response, operation)  # raises the same HTTPError subclasses as FTDClient
+        return incoming_response.swagger_result
+
+    async def request(self, name: str, resource: str, operation: str, **op_kwargs):
+        """
+        Send the swagger operation of an API method with the error handling of FTDAPIWrapper (see the class docstring)
+        :param name: str the name of the API method, for the logs and the metrics
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger operation like "getNetworkObjectList"
+        :param op_kwargs: the parameters of the operation
+        :return: the unmarshalled response, or None if the object we tried to create already exists
+        """
+        swagger_client = await self.load_swagger_client()
+        callable_operation = getattr(getattr(swagger_client, resource), operation)
+        call_record = FTDCallRecord(name) if self.metrics is not None else None  # many calls share this thread
+        try:
+            result = await self.send_operation(callable_operation, op_kwargs, call_record)
+        except HTTPUnprocessableEntity as ex:
+            duplicate = FTDAPIWrapper.duplicate_message(ex)
+            if duplicate is None:
+                if self.retry_policy.retry_reason(ex) is None:
+                    logger.error(f"{name} was called, but we got an error: {ex}")
+                self.finish(call_record, ex)
+                raise
+            logger.error(f"{duplicate} Skipping...")
+            result = None
+        except Exception as ex:
+            if isinstance(ex, SwaggerMappingError):
+                logger.error(f"{name} was called, but we got an error: {ex}")
+            self.finish(call_record, ex)
+            raise
+        self.finish(call_record)
+        return result
+
+    def finish(self, call_record: Optional[FTDCallRecord], exception: Optional[Exception] = None) -> None:
+        """Hand a measured call to the metrics hook, see FTDMetrics.finish()"""
+        if call_record is not None:
+            self.metrics.finish(call_record, exception)
+
+    async def send_operation(self, callable_operation, op_kwargs: dict, call_record: Optional[FTDCallRecord] = None):
+        """
+        Send one swagger operation until it succeeds, fails for a reason that is not transient or the retry_policy
+        gives up
+        :return: the unmarshalled response, see call_operation()
+        """
+        name = callable_operation.operation.operation_id
+        retries = 0
+        started = monotonic()
+        while True:
+            try:
+                return await self.send_authorized(callable_operation, op_kwargs, call_record)
+            except Exception as ex:
+                reason = self.retry_policy.retry_reason(ex)
+                if reason is None:
+                    raise
+                delay = self.retry_policy.next_delay(reason, retries, monotonic() - started)
+                if delay is None:
+                    logger.error(f"{name} failed with {reason} and we are out of retries: {ex}")
+                    raise
+                retries += 1
+                if call_record is not None:
+                    call_record.retries = retries
+                logger.error(
+                    f"{name} failed with {reason}. Waiting {delay:.1f} seconds and then retrying (retry {retries})."
+                )
+                started_backoff = perf_counter()
+                await asyncio.sleep(delay)
+                if call_record is not None:
+                    call_record.add_backoff(perf_counter() - started_backoff)
+
+    async def send_authorized(self, callable_operation, op_kwargs: dict, call_record: Optional[FTDCallRecord] = None):
+        """Send one swagger operation, with a new token after a 401 and the setup wizard skipped after a 403"""
+        name = callable_operation.operation.operation_id
+        await self.ensure_token()
+        token = self.headers.get("Authorization")
+        try:
+            return await self.call_operation(callable_operation, op_kwargs, call_record)
+        except HTTPUnauthorized as ex:
+            logger.error(f"{name} was sent, but our token appears to be invalid: {ex}")
+            logger.error("Attempting to obtain a new token...")
+            await self.renew_token(token)
+            logger.warning(f"New token acquired. Now sending {name} again")
+            return await self.call_operation(callable_operation, op_kwargs, call_record)
+        except HTTPForbidden as ex:
+            if not await self.is_setup_wizard():
+                logger.warning(
+                    f"{name} was sent but the setup wizard has yet not been executed. "
+                    f"We will attempt to skip the setup wizard and activate an evaluation base license."
+                )
+                await self.skip_setup_wizard()
+                logger.warning(f"Sending {name} again")
+                return await self.call_operation(callable_operation, op_kwargs, call_record)
+            logger.error(f"There is a problem accessing the FTD's API: {ex}")
+            raise
+
+    async def is_setup_wizard(self) -> bool:
+        """:return: True if the setup wizard has been run or skipped, see FTDBaseClient.is_setup_wizard()"""
+        api_response = await self.send("GET", self.common_prefix + "/easysetup/easysetupstatus")
+        return api_response.status_code == 200
+
+    async def skip_setup_wizard(self) -> None:
+        """Skip the setup wizard and enable the trial licensing, see FTDBaseClient.skip_setup_wizard()"""
+        payload = {"token": None, "connectionType": "EVALUATION", "type": "smartagentconnection", "version": None}
+        await self.send("POST", self.common_prefix + "/license/smartagentconnections", json=payload)
+        payload = {
+            "taskComplete": True,
+            "nextPage": None,
+            "currentPage": None,
+            "type": "easysetupstatus",
+            "version": None,
+        }
+        await self.send("POST", self.common_prefix + "/easysetup/easysetupstatus", json=payload)
+
+    async def get_object(self, resource: str, operation: str, **params):
+        """Fetch a single object with any swagger read operation, see FTDBaseClient.get_object()"""
+        return await self.request("get_object", resource, operation, **params)
+
+    async def current_object(self, edit_method, *args, **kwargs) -> tuple:
+        """Read the object an edit call would overwrite, see FTDBaseClient.current_object()"""
+        swagger_client = await self.load_swagger_client()
+        obj, params = edit_target(edit_method, *args, **kwargs)
+        operation = FTDBaseClient.read_operation(swagger_client, edit_method.edit_resource, edit_method.edit_operation)
+        if operation is None:
+            return obj, None
+        return obj, await self.get_object(edit_method.edit_resource, operation, **params)
+
+    async def get_page(self, resource: str, operation: str, limit: int, offset: int = 0, **params):
+        """Fetch a single page of any swagger list operation, see FTDBaseClient.get_page()"""
+        return await self.request("get_page", resource, operation, limit=limit, offset=offset, **params)
+
+    async def iter_pages(self, resource: str, operation: str, page_size: int = 100, **params) -> AsyncIterator:
+        """Yield the items of any swagger list operation one page at a time, see FTDBaseClient.iter_pages()"""
+        if ":" in (params.get("filter") or "") and not params["filter"].split(":")[1]:
+            return  # a search key was provided with no value to search on
+        offset = 0
+        while True:
+            page = await self.get_page(resource, operation, page_size, offset, **params)
+            for item in page.items or []:
+                yield item
+            offset += len(page.items or [])
+            if not page.items or FTDBaseClient.is_last_page(page.paging, offset):
+                return
+
+    async def get_list_parallel(self, list_method, *args, page_size: int = 500, **kwargs) -> list:
+        """Fetch every page of a get_*_list method at the same time, see FTDBaseClient.get_list_parallel()"""
+        params = FTDBaseClient.list_params(list_method, *args, **kwargs)
+        if params is None:
+            return []
+        return await self.get_pages_parallel(
+            list_method.swagger_resource, list_method.swagger_operation, page_size=page_size, **params
+        )
+
+    async def get_pages_parallel(self, resource: str, operation: str, page_size: int = 500, **params) -> list:
+        """Fetch every page of a swagger list operation at the same time, see FTDBaseClient.get_pages_parallel()"""
+        first_page = await self.get_page(resource, operation, page_size, 0, **params)
+        items = list(first_page.items or [])
+        if not items or FTDBaseClient.is_last_page(first_page.paging, len(items)):
+            return items
+
+        page_size = len(items)  # what the device returned, it may cap the page size below what we asked for
+        if first_page.paging.count is None:  # the offsets are unknown, so follow the pages one after another
+            while True:
+                page = await self.get_page(resource, operation, page_size, len(items), **params)
+                items += page.items or []
+                if not page.items or FTDBaseClient.is_last_page(page.paging, len(items)):
+                    return items
+
+        async def get_page(offset):
+            async with self.in_flight:
+                return await self.get_page(resource, operation, page_size, offset, **params)
+
+        offsets = range(page_size, first_page.paging.count, page_size)
+        for page in await asyncio.gather(*[get_page(offset) for offset in offsets]):
+            items += page.items or []
+        return items
+
+    async def gather(self, *calls) -> list:
+        """
+        Await independent calls to this device at the same time, at most max_in_flight at a time, see
+        FTDBaseClient.gather()
+        :param calls: callables without arguments that return an awaitable, like
+                      lambda: self.get_tcp_port_object_list(filter="name:http")
+        :return: list of their results in the same order as calls
+        """
+        max_in_flight = asyncio.Semaphore(self.max_in_flight)
+
+        async def run(call):
+            async with max_in_flight:
+                return await call()
+
+        return list(await asyncio.gather(*[run(call) for call in calls]))
+
+    ################################
+    # Object lookups, see FTDObjectLookups. There is no object_cache, every lookup goes to the device.
+    def object_list_method(self, obj_type: str):
+        """:return: the get_*_list method that lists the objects of a type"""
+        if obj_type not in FTDAsyncClient.OBJECT_LIST_METHODS:
+            raise ValueError(f"There is no list method for objects of type {obj_type}")
+        return getattr(self, FTDAsyncClient.OBJECT_LIST_METHODS[obj_type])
+
+    async def load_object_index(self, obj_type: str) -> list:
+        """:return: list of all objects of a type, see FTDObjectLookups.load_object_index()"""
+        return await self.get_list_parallel(self.object_list_method(obj_type))
+
+    async def find_object(self, obj_type: str, name: str):
+        """:return: the object of a type with exactly this name or None, see FTDObjectLookups.find_object()"""
+        objs = await self.object_list_method(obj_type)(filter=f"name:{name}")
+        return next((obj for obj in objs or [] if obj.name == name), None)
+
+    async def find_object_by_id(self, obj_type: str, obj_id: str):
+        """:return: the object of a type with this id or None, see FTDObjectLookups.find_object_by_id()"""
+        list_method = self.object_list_method(obj_type)
+        swagger_client = await self.load_swagger_client()
+        operation = FTDBaseClient.object_operation(
+            swagger_client, list_method.swagger_resource, list_method.swagger_operation
+        )
+        if operation is None:
+            return next((obj for obj in await self.load_object_index(obj_type) if obj.id == obj_id), None)
+        try:
+            return await self.get_object(list_method.swagger_resource, operation, objId=obj_id)
+        except HTTPNotFound:
+            return None
+
+    ################################
+    # Port object searches, see FTDPortObjects
+    async def search_port_objects(self, port_obj_name: str):
+        """:return: the first TCP, UDP or ICMPv4 port object with exactly this name, see FTDPortObjects"""
+        return next(iter(await self.find_port_objects(port_obj_name)), None)
+
+    async def find_port_objects(self, port_obj_name: str) -> list:
+        """:return: list of the port objects of any protocol with exactly this name, see FTDPortObjects"""
+        port_obj_lists = await self.gather(
+            *[
+                lambda obj_type=obj_type: self.object_list_method(obj_type)(filter=f"name:{port_obj_name}")
+                for obj_type in FTDPortObjects.PORT_OBJECT_TYPES
+            ]
+        )
+        return [
+            port_obj
+            for port_obj_list in port_obj_lists
+            for port_obj in port_obj_list or []
+            if port_obj.name == port_obj_name
+        ]
+
+    async def resolve_port_objects(self, port_obj_names: Iterable[str]) -> dict:
+        """:return: dict name: list of the port objects with that name, see FTDPortObjects.resolve_port_objects()"""
+        port_obj_index = {}
+        for port_obj_list in await self.gather(
+            *[
+                lambda obj_type=obj_type: self.load_object_index(obj_type)
+                for obj_type in FTDPortObjects.PORT_OBJECT_TYPES
+            ]
+        ):
+            for port_obj in port_obj_list:
+                port_obj_index.setdefault(port_obj.name, []).append(port_obj)
+        return {name: port_obj_index.get(name, []) for name in port_obj_names}
+
+    ################################
+    # Interface index, see FTDInterfaces
+    async def resolve_interface(self, name: str):
+        """:return: the interface with this nameif or hardwareName or None, see FTDInterfaces.resolve_interface()"""
+        if not self.interface_index.loaded:
+            async with self.interface_lock:
+                if not self.interface_index.loaded:  # another call may have loaded it while we waited
+                    await self.refresh_interface_index()
+        return self.interface_index.get(name)
+
+    async def refresh_interface_index(self) -> list:
+        """:return: list of all interfaces of the device, see FTDInterfaces.refresh_interface_index()"""
+        swagger_client = await self.load_swagger_client()
+        list_methods = [self.get_physical_interface_list, self.get_vlan_interface_list]
+        if hasattr(swagger_client.Interface, "getEtherChannelInterfaceList"):  # not on every platform/version
+            list_methods.append(self.get_etherchannel_interface_list)
+        interface_lists = await self.gather(
+            *[lambda list_method=list_method: self.get_list_parallel(list_method) for list_method in list_methods]
+        )
+        parents = [(self.get_sub_interface_list, interface.id) for interface in interface_lists[0]]
+        if hasattr(swagger_client.Interface, "getEtherChannelSubInterfaceList"):
+            etherchannel_interfaces = interface_lists[2] if len(interface_lists) > 2 else []
+            parents += [
+                (self.get_etherchannel_sub_interface_list, interface.id) for interface in etherchannel_interfaces
+            ]
+        interface_lists += await self.gather(
+            *[
+                lambda list_method=list_method, parent_id=parent_id: self.get_list_parallel(list_method, parent_id)
+                for list_method, parent_id in parents
+            ]
+        )
+        interfaces = [interface for interface_list in interface_lists for interface in interface_list]
+        self.interface_index.load(interfaces)
+        return interfaces
+
+
+class FTDAsyncResponse(IncomingResponse):
+    """A fully read aiohttp response in the shape bravado expects for unmarshalling"""
+
+    def __init__(self, status_code: int, reason: str, headers, raw_bytes: bytes):
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self.raw_bytes = raw_bytes
+
+    @property
+    def text(self) -> str:
+        return self.raw_bytes.decode("utf-8", errors="replace")
+
+    def json(self, **kwargs):
+        return loads(self.raw_bytes.decode("utf-8"), **kwargs)
@@ -2,23 +2,39 @@ import logging
 import sys
 from bravado.client import SwaggerClient
 from bravado.requests_client import RequestsClient
-from bravado.exception import HTTPUnauthorized, HTTPForbidden, HTTPUnprocessableEntity, HTTPLocked
+from bravado.swagger_model import Loader
+from bravado.exception import HTTPUnauthorized, HTTPForbidden, HTTPUnprocessableEntity
 from bravado_core.exception import SwaggerMappingError
-from typing import Optional, Union
+from typing import Iterator, Optional, Union
 from requests import Session
+from requests.adapters import HTTPAdapter
 from functools import wraps
-from time import sleep
+from time import monotonic, perf_counter, sleep
+from threading import BoundedSemaphore, Lock, local
+from inspect import signature
+from concurrent.futures import ThreadPoolExecutor
 from json import loads
-import requests
+from .spec_cache import FTDSpecCache
+from .token_manager import FTDTokenManager
+from .retry import FTDRetryPolicy
+from .metrics import FTDCallRecord, FTDMetrics, active_call_records, use_call_records
+from .object_cache import FTDInterfaceIndex, FTDObjectCache
+from .compare import edit_target
 
 logger = logging.getLogger(__name__)
 
+# Set while FTDAPIWrapper.retry() runs a call on this thread. The wrapped methods that call makes, here or on the worker
+# threads of gather() and the pagers (see FTDAPIWrapper.carry), are sent once and leave the retries to the outer call.
+_retry_state = local()
+
 
 class FTDAPIWrapper(object):
     """This decorator class wraps all API methods of ths client and solves a number of issues.
 
     1. HTTPUnauthorized: If the token comes back as invalid, presumably due to expiration, the wrapper will obtain a new
-    token and retry the original API call.
+    token and retry the original API call. The swagger_client shares its headers with http_session, so a new token is
+    a single POST to /fdm/token and the swagger spec is not downloaded or parsed again. Calls that are rejected at the
+    same time log in only once, see FTDTokenManager.renew_rejected().
 
     2. HTTPForbidden: If the setup wizard has never been run, catch that condition with a HTTPForbidden error, bypass
     the startup wizard and obtain an evaluation base license for the ftd. This removes the need for a script to check
@@ -33,64 +49,194 @@ class FTDAPIWrapper(object):
     the name of the method that made the original call and then re-throw the SwaggerMappingError.
 
     5. HTTPLocked: Occasionally, the database becomes locked due to heavy operations like vulnerability updates or SI
-    update. This catches a database lock error, waits 10 seconds for the lock to cear and then retires the original
-    call. If the DB is still locked, this will throw "an exception while handling an exception" error and the call will
-    fail.
+    update. This, and the other transient errors listed in FTDRetryPolicy (like "Failed to schedule deployment job"),
+    are retried with exponential backoff and jitter until the client's retry_policy gives up, at which point the
+    original exception is raised. Only the outermost wrapped call retries: a wrapped method that calls other wrapped
+    methods, like a search that lists several object types, is run again as a whole instead of every inner call
+    running a retry loop of its own.
+
+    6. Metrics: If the client has a metrics hook (see FTDMetrics), every call is measured: the swagger operations it
+    sent, its wall time split into network, backoff and unmarshal time, the size of the responses, the number of
+    retries and the class of the exception it raised, if any.
     """
 
+    DUPLICATE_ERROR_CODES = (
+        "duplicateName",
+        "duplicateSyslogServerIPAddressAndPortNumber",
+        "manualNatDuplicateRule",
+        "objectNatDupRuleWithSameOrigNetwork",
+    )
+
     def __call__(self, fn):
         # TODO: Add HA check here....
         @wraps(fn)
         def new_func(*args, **kwargs):
+            metrics = args[0].metrics
+            if metrics is None:
+                return FTDAPIWrapper.retry(fn, None, *args, **kwargs)
+            call_record = metrics.start(fn.__name__)
             try:
-                return fn(*args, **kwargs)
-            except HTTPUnauthorized as ex:
-                logger.error(f"FTDAPIWrapper called by {fn.__name__}, but our token appears to be invalid: {ex}")
-                logger.error("Attempting to obtain a new token...")
-                args[0].get_access_token()  # Update the token in our objects
-                args[0].get_swagger_client()  # swagger_client has a copy of the token, so update it too!
-                logger.warning(f"New token acquired. Now executing the original call to {fn.__name__}")
-                return fn(*args, **kwargs)
-            except HTTPForbidden as ex:
-                if not args[0].is_setup_wizard():
-                    logger.warning(
-                        f"{fn.__name__} was called but the setup wizard has yet not been executed. "
-                        f"We will attempt to skip the setup wizard and activate an evaluation base license."
+                result = FTDAPIWrapper.retry(fn, call_record, *args, **kwargs)
+            except Exception as ex:
+                metrics.finish(call_record, ex)
+                raise
+            metrics.finish(call_record)
+            return result
+
+        return new_func
+
+    @staticmethod
+    def retry(fn, call_record: Optional[FTDCallRecord], *args, **kwargs):
+        """Run fn until it succeeds, fails for a reason that is not transient or the retry_policy gives up"""
+        if getattr(_retry_state, "active", False):
+            return FTDAPIWrapper.call(fn, *args, **kwargs)  # an outer wrapped call retries, see _retry_state
+        retry_policy = args[0].retry_policy
+        retries = 0
+        started = monotonic()
+        _retry_state.active = True
+        try:
+            while True:
+                try:
+                    return FTDAPIWrapper.call(fn, *args, **kwargs)
+                except Exception as ex:
+                    reason = retry_policy.retry_reason(ex)
+                    if reason is None:
+                        raise
+                    delay = retry_policy.next_delay(reason, retries, monotonic() - started)
+                    if delay is None:
+                        logger.error(f"{fn.__name__} failed with {reason} and we are out of retries: {ex}")
+                        raise
+                    retries += 1
+                    if call_record is not None:
+                        call_record.retries = retries
+                    logger.error(
+                        f"{fn.__name__} failed with {reason}. Waiting {delay:.1f} seconds and then retrying "
+                        f"(retry {retries})."
                     )
-                    args[0].skip_setup_wizard()
-                    logger.warning("Setup wizard and licensing stage appears to have been successful.")
-                    logger.warning(f"Executing the original call to {fn.__name__}")
-                    return fn(*args, **kwargs)
-                else:
-                    logger.error(f"There is a problem accessing the FTD's API: {ex}")
-                    raise HTTPForbidden
-            except HTTPUnprocessableEntity as ex:
-                for message in ex.swagger_result.error.messages:
-                    if message.code in [
-                        "duplicateName",
-                        "duplicateSyslogServerIPAddressAndPortNumber",
-                        "manualNatDuplicateRule",
-                        "objectNatDupRuleWithSameOrigNetwork",
-                    ]:
-                        logger.error(f"{message.description} Skipping...")
-                        return
-                    if message.description == "Failed to schedule deployment job":
-                        logger.error("We failed to schedule the deployment job. Waiting 10 seconds and then retrying.")
-                        sleep(10)
-                        return fn(*args, **kwargs)
-                logger.error(f"FTDAPIWrapper called by {fn.__name__}, but we got an error: {ex}")
-                logger.debug({sys.exc_info()[0]})
-                raise HTTPUnprocessableEntity
-            except SwaggerMappingError as ex:
-                logger.error(f"FTDAPIWrapper called by {fn.__name__}, but we got an error: {ex}")
-                logger.error({sys.exc_info()[0]})
-                raise SwaggerMappingError
-            except HTTPLocked as ex:
-                logger.error("We got a database locked response from the API. Waiting 10 seconds and then retrying.")
-                sleep(10)
+                    started_backoff = perf_counter()
+                    sleep(delay)
+                    for active_record in active_call_records():  # not network or unmarshal time of the call
+                        active_record.add_backoff(perf_counter() - started_backoff)
+        finally:
+            _retry_state.active = False
+
+    @staticmethod
+    def carry(fn):
+        """
+        Hand the retry state and the calls being measured (see FTDMetrics) of this thread on to a worker thread, so
+        that its requests are retried and accounted like those of the calling thread, see _retry_state
+        :param fn: the callable the worker thread runs
+        :return: callable that runs fn with the retry state and the call records of the thread that called carry()
+        """
+        active = getattr(_retry_state, "active", False)
+        call_records = list(active_call_records())
+
+        def run(*args, **kwargs):
+            previous = getattr(_retry_state, "active", False)
+            _retry_state.active = active
+            previous_records = use_call_records(list(call_records))
+            try:
                 return fn(*args, **kwargs)
+            finally:
+                _retry_state.active = previous
+                use_call_records(previous_records)
 
-        return new_func
+        return run
+
+    @staticmethod
+    def duplicate_message(ex: HTTPUnprocessableEntity) -> Optional[str]:
+        """:return: str the description of the error if ex says that the object already exists, otherwise None"""
+        error = getattr(ex.swagger_result, "error", None)
+        for message in getattr(error, "messages", None) or []:
+            if message.code in FTDAPIWrapper.DUPLICATE_ERROR_CODES:
+                return message.description
+        return None
+
+    @staticmethod
+    def call(fn, *args, **kwargs):
+        """Run fn once, handling the errors that do not need a backoff (see the class docstring)"""
+        token_manager = args[0].token_manager
+        token = None
+        try:
+            token_manager.ensure_token()  # refresh the token before it expires instead of after a 401
+            token = token_manager.access_token
+            return fn(*args, **kwargs)
+        except HTTPUnauthorized as ex:
+            logger.error(f"FTDAPIWrapper called by {fn.__name__}, but our token appears to be invalid: {ex}")
+            logger.error("Attempting to obtain a new token...")
+            token_manager.renew_rejected(token)  # swagger_client shares our session headers, so this updates it too
+            logger.warning(f"New token acquired. Now executing the original call to {fn.__name__}")
+            return fn(*args, **kwargs)
+        except HTTPForbidden as ex:
+            if not args[0].is_setup_wizard():
+                logger.warning(
+                    f"{fn.__name__} was called but the setup wizard has yet not been executed. "
+                    f"We will attempt to skip the setup wizard and activate an evaluation base license."
+                )
+                args[0].skip_setup_wizard()
+                logger.warning("Setup wizard and licensing stage appears to have been successful.")
+                logger.warning(f"Executing the original call to {fn.__name__}")
+                return fn(*args, **kwargs)
+            else:
+                logger.error(f"There is a problem accessing the FTD's API: {ex}")
+                raise HTTPForbidden
+        except HTTPUnprocessableEntity as ex:
+            duplicate = FTDAPIWrapper.duplicate_message(ex)
+            if duplicate is not None:
+                logger.error(f"{duplicate} Skipping...")
+                return
+            if FTDRetryPolicy.retry_reason(ex) is not None:
+                raise  # retried with backoff by the retry_policy
+            logger.error(f"FTDAPIWrapper called by {fn.__name__}, but we got an error: {ex}")
+            logger.debug({sys.exc_info()[0]})
+            raise HTTPUnprocessableEntity
+        except SwaggerMappingError as ex:
+            logger.error(f"FTDAPIWrapper called by {fn.__name__}, but we got an error: {ex}")
+            logger.error({sys.exc_info()[0]})
+            raise SwaggerMappingError
+
+
+def list_operation(resource: str, operation: str, obj_type: Optional[str] = None, **param_names):
+    """
+    Tag a get_*_list method with the swagger list operation it wraps, so that generic helpers like
+    FTDBaseClient.get_list_parallel() can page through it without knowing the method.
+    :param resource: str the swagger resource (tag) like "NetworkObject"
+    :param operation: str the swagger list operation like "getNetworkObjectList"
+    :param obj_type: str (Optional) the type of the listed objects like "networkobject", for the object_cache
+    :param param_names: swagger parameter name = method argument name, for arguments like parentId="parent_id"
+    """
+
+    def decorator(fn):
+        fn.swagger_resource = resource
+        fn.swagger_operation = operation
+        fn.swagger_obj_type = obj_type
+        fn.swagger_param_names = dict(param_names, filter="filter")
+        return fn
+
+    return decorator
+
+
+def api_operation(resource: str, operation: str, result: Optional[str] = None, pages: bool = False, **param_names):
+    """
+    Tag a method that sends a single swagger operation and returns its result, so that a client that sends requests
+    differently, like FTDAsyncClient, can offer the same method without running its body. The get_*_list and edit_*
+    methods are described by list_operation and edit_operation instead.
+    :param resource: str the swagger resource (tag) like "NetworkObject"
+    :param operation: str the swagger operation like "addNetworkObject"
+    :param result: str (Optional) the field of the response the method returns, like "items"
+    :param pages: bool the method returns iter_pages() of a list operation, paged by its page_size argument
+    :param param_names: swagger parameter name = method argument name, like objId="obj_id" or body="network_obj"
+    """
+
+    def decorator(fn):
+        fn.api_resource = resource
+        fn.api_operation = operation
+        fn.api_result = result
+        fn.api_pages = pages
+        fn.api_param_names = param_names
+        return fn
+
+    return decorator
 
 
 class FTDBaseClient(object):
@@ -98,6 +244,9 @@ class FTDBaseClient(object):
     This class is inherited by all FTD API classes and is always instantiated and is where the auth token for the FTD
     is obtained and other functions that are needed by multiple inherited classes
 
+    With lazy=True the constructor makes no network calls. The api version probe, the login and the swagger spec load
+    each run once, on first use, and are safe to trigger from several threads at the same time.
+
     Note that if an environment variable HTTP_PROXY=socks5://<proxyip>:<proxyport> exists, the client libraries will
     use this socks proxy by default and we do not have to expressly configure it in the constructor
     """
@@ -111,29 +260,120 @@ class FTDBaseClient(object):
         fdm_port: Optional[str] = None,
         proxies: Optional[dict] = None,
         timeout: int = 30,
+        spec_cache: Optional[FTDSpecCache] = None,
+        lazy: bool = False,
+        pool_maxsize: int = 10,
+        max_in_flight: int = 4,
+        retry_policy: Optional[FTDRetryPolicy] = None,
+        metrics: Optional[FTDMetrics] = None,
+        object_cache: Optional[FTDObjectCache] = None,
+        skip_unchanged_edits: bool = False,
     ):
+        self.ftd_ip = ftd_ip
         self.proxies = proxies
         self.fdm_port = str(fdm_port) if fdm_port else None
         self.base_url = f"https://{ftd_ip}:{self.fdm_port}" if fdm_port else f"https://{ftd_ip}"
         self.verify = verify  # allow API self-signed certs * DANGER *
         self.common_prefix = f"{self.base_url}/api/fdm/latest"
-        self.swagger_client = None
+        self._swagger_client = None
+        self._api_version = None
+        self.api_version_lock = Lock()  # guards the one-time version probe
+        self.swagger_client_lock = Lock()  # guards the one-time spec load
         self.ha_role = None  # SINGLE_NODE, HA_PRIMARY, or HA_SECONDARY
         self.verify = verify
-        self.http_session = Session()
-        self.http_session.proxies = proxies
+        self.http_session = FTDBaseClient.get_http_session(proxies=proxies, pool_maxsize=pool_maxsize)
         self.timeout = timeout
-        self.api_version = FTDBaseClient.get_api_version(
-            ftd_ip, proxies=self.proxies, verify=self.verify, timeout=self.timeout, fdm_port=self.fdm_port
-        )
+        self.max_in_flight = max_in_flight
+        self.retry_policy = retry_policy if retry_policy is not None else FTDRetryPolicy()
+        self.metrics = metrics  # None = calls are not measured
+        self.object_cache = object_cache  # None = every lookup goes to the device
+        self.interface_index = FTDInterfaceIndex()  # loaded on the first resolve_interface()
+        self.skip_unchanged_edits = skip_unchanged_edits  # the default of skip_unchanged for all edit_* methods
+        self.edits_sent = 0  # edits that changed the device and need a deployment
+        self.edits_skipped = 0  # edits that were not sent because the device already had the same settings
+        self.in_flight = BoundedSemaphore(max_in_flight)  # caps concurrent page fetches to this device
+        self.spec_cache = spec_cache
         self.username = username
         self.password = password
         self.token = None
-        self.get_access_token()  # Get an auth token
-        self.get_swagger_client()  # download the swagger spec
+        self.token_manager = FTDTokenManager(self)
+        if not lazy:
+            self.bootstrap()  # probe the api version, get an auth token and download the swagger spec
+
+    @property
+    def api_version(self) -> int:
+        """The api version of the device. Probed on first use and then remembered."""
+        if self._api_version is None:
+            with self.api_version_lock:
+                if self._api_version is None:
+                    self._api_version = FTDBaseClient.get_api_version(
+                        self.ftd_ip,
+                        proxies=self.proxies,
+                        verify=self.verify,
+                        timeout=self.timeout,
+                        fdm_port=self.fdm_port,
+                        http_session=self.http_session,
+                    )
+        return self._api_version
+
+    @property
+    def swagger_client(self) -> SwaggerClient:
+        """The bravado swagger client. In lazy mode we log in and load the spec the first time it is used."""
+        self.token_manager.ensure_token()
+        return self.load_swagger_client()
+
+    @swagger_client.setter
+    def swagger_client(self, swagger_client: SwaggerClient) -> None:
+        self._swagger_client = swagger_client
+
+    def load_swagger_client(self) -> SwaggerClient:
+        """Load the swagger spec and build the swagger_client, unless another call (or thread) already did"""
+        if self._swagger_client is None:
+            with self.swagger_client_lock:
+                if self._swagger_client is None:
+                    self.get_swagger_client()
+        return self._swagger_client
+
+    def bootstrap(self) -> None:
+        """
+        Probe the api version, log in and load the swagger spec, overlapping the network round trips. The spec
+        download needs neither the token nor the api version, and a spec_cache lookup for a known device only needs the
+        api version (see get_swagger_spec), so all three run at the same time.
+        """
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="pyftd-bootstrap") as executor:
+            futures = [
+                executor.submit(lambda: self.api_version),
+                executor.submit(self.token_manager.ensure_token),
+                executor.submit(self.load_swagger_client),
+            ]
+            for future in futures:
+                future.result()  # re-raise anything that went wrong in the worker threads
+        if self.token is None:
+            logger.error("We failed to acquire a token from the FTD, so the client cannot be used.")
+            raise ValueError
+
+    @staticmethod
+    def get_http_session(proxies: Optional[dict] = None, pool_maxsize: int = 10) -> Session:
+        """
+        Build the one connection pool that every request to a device goes through: the http_session calls, file
+        uploads in post() and the swagger_client. Connections are kept alive and reused, so the TCP and TLS handshakes
+        are paid once per pooled connection instead of once per request.
+        :param proxies: dict (Optional) a dictionary of proxy servers like: proxies={"https": "socks5://127.0.0.1:9999"}
+        :param pool_maxsize: int the maximum number of connections kept open to the device
+        :return: FTDSession
+        """
+        http_session = FTDSession()
+        if proxies:
+            http_session.proxies = proxies
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        http_session.mount("https://", adapter)
+        http_session.mount("http://", adapter)
+        return http_session
 
     @staticmethod
-    def get_api_version(ftd_ip, proxies=None, verify=True, timeout=30, fdm_port=443) -> int:
+    def get_api_version(
+        ftd_ip, proxies=None, verify=True, timeout=30, fdm_port=443, http_session: Optional[Session] = None
+    ) -> int:
         """
         This is callable without authentication and without instantiation the swagger client or this class to get the
         API version.
@@ -143,42 +383,62 @@ class FTDBaseClient(object):
 
         The method will return the highest API version supported by this appliance
         e.g. if /api/versions returns [v1,v2,v3,v4,v5,latest] then this method will return 5
+        :param http_session: Session (Optional) reuse the connection pool of an existing client
         :return: int api version
         """
         base_url = f"https://{ftd_ip}:{fdm_port}" if fdm_port else f"https://{ftd_ip}"
-        http_session = Session()
-        if proxies:
-            http_session.proxies = proxies
+        if http_session is None:
+            http_session = FTDBaseClient.get_http_session(proxies=proxies)
         api_response = http_session.get(url=f"{base_url}/api/versions", verify=verify, timeout=timeout)
         data = api_response.json()
         return int(data["supportedVersions"][len(data["supportedVersions"]) - 2][1:])
 
     def get_access_token(self) -> Union[dict, None]:
         """
-        :param timeout: wait this many seconds before declaring the device unreachable
+        Log in with the password grant
         :return:    If successful: None - simply add the bearer token to the object and move on
                     Else:   return the API response so that the client consumer might capture the error and handle
         """
         # TODO: Handle 503 responses from the FTD (Booting or manager on-boxing not yet complete)
-        # Remove existing token if there is one stored in the request object
-        if "Authorization" in self.http_session.headers:
-            del self.http_session.headers["Authorization"]
-            logger.debug("Existing Authorization token found. Deleting...")
-
         auth_payload = {"grant_type": "password", "username": self.username, "password": self.password}
+        api_response = self.request_token(auth_payload)
+        if api_response is not None:
+            logger.error(
+                "We failed to successfully acquire a token from the FTD. Check your credentials and try again."
+            )
+            return api_response
+
+    def refresh_access_token(self) -> Union[dict, None]:
+        """
+        Get a new access token with the refresh_token grant, without sending the username and password again
+        :return:    If successful: None - simply add the bearer token to the object and move on
+                    Else:   return the API response so that the caller can fall back to get_access_token()
+        """
+        refresh_payload = {"grant_type": "refresh_token", "refresh_token": self.token_manager.refresh_token}
+        return self.request_token(refresh_payload)
 
-        # Auth to FTD and retrieve a bearer token and update the headers in the request object with the auth header
+    def request_token(self, auth_payload: dict) -> Union[dict, None]:
+        """
+        POST a grant to /fdm/token and, if successful, update the headers in the request object with the auth header
+        :param auth_payload: dict the grant we are sending
+        :return:    If successful: None
+                    Else:   the API response
+        """
+        # Never send the existing (possibly expired) token with a token request. Passing None drops the header from
+        # this request only, so other threads sharing the session headers keep using the current token meanwhile.
         api_response = self.http_session.post(
-            self.common_prefix + "/fdm/token", json=auth_payload, verify=self.verify, timeout=self.timeout
+            self.common_prefix + "/fdm/token",
+            json=auth_payload,
+            headers={"Authorization": None},
+            verify=self.verify,
+            timeout=self.timeout,
         )
         if api_response is not None and 200 <= api_response.status_code <= 299:
-            self.http_session.headers.update({"Authorization": f"Bearer {api_response.json()['access_token']}"})
             self.token = api_response.json()
-            logger.debug("Token successfully acquired")
+            self.token_manager.set_token(self.token)
+            self.http_session.headers.update({"Authorization": f"Bearer {self.token['access_token']}"})
+            logger.debug(f"Token successfully acquired with the {auth_payload['grant_type']} grant")
         else:
-            logger.error(
-                "We failed to successfully acquire a token from the FTD. Check your credentials and try again."
-            )
             return api_response
 
     def post(
@@ -196,21 +456,25 @@ class FTDBaseClient(object):
         :param headers: Any additional headers needed
         :return: request response
         """
-        if headers is None:  # Allows us to override obj headers
-            headers = self.http_session.headers
         try:
             if file_path:  # Handle file uploads
-                files = {"fileToUpload": open(file_path, "rb")}
+                with open(file_path, "rb") as upload_file:
+                    response = self.http_session.post(
+                        self.common_prefix + endpoint,
+                        headers=headers,  # merged with (and allowed to override) the session headers
+                        json=post_data,
+                        files={"fileToUpload": upload_file},
+                        verify=self.verify,
+                        timeout=self.timeout,
+                    )
             else:
-                files = None
-            response = requests.post(
-                self.common_prefix + endpoint,
-                headers=headers,
-                json=post_data,
-                files=files,
-                verify=self.verify,
-                timeout=self.timeout,
-            )
+                response = self.http_session.post(
+                    self.common_prefix + endpoint,
+                    headers=headers,
+                    json=post_data,
+                    verify=self.verify,
+                    timeout=self.timeout,
+                )
             if response.content:
                 payload = loads(response.content.decode("utf-8"))
             else:
@@ -238,27 +502,268 @@ class FTDBaseClient(object):
             logger.error("We failed to successfully Log out of the FTD.")
             return api_response
 
+    def get_software_version(self) -> Union[str, None]:
+        """
+        Get the software build running on the device, like "7.0.1-84". This is not in the swagger_client SPEC file as we
+        need it before the spec is loaded, so we do this the old fashioned way.
+        :return: str software version or None if the device did not tell us
+        """
+        api_response = self.http_session.get(
+            self.common_prefix + "/operational/systeminfo/default", verify=self.verify, timeout=self.timeout
+        )
+        if api_response is not None and 200 <= api_response.status_code <= 299:
+            return api_response.json().get("softwareVersion")
+        logger.warning(f"Unable to determine the software version of the FTD: {api_response.status_code}")
+
+    def get_swagger_spec(self, http_client: RequestsClient) -> dict:
+        """
+        Return the swagger spec for this device. If a spec_cache was given to the client, the spec is read from the
+        cache and only downloaded (and then cached) when this api version and software build has not been seen before.
+        A device the cache checked within its device_ttl is looked up by its api version alone, so a cache hit costs no
+        request beyond the version probe. Otherwise the software build is read again, which needs a token.
+        :param http_client: the bravado http client used to download the spec
+        :return: dict swagger spec
+        """
+        cache_key = None
+        checked = False
+        if self.spec_cache is not None:
+            cache_key = self.spec_cache.device_key(self.base_url, self.api_version)
+            if cache_key is None:
+                self.token_manager.ensure_token()  # the software version used in the cache key needs a token
+                software_version = self.get_software_version()
+                if software_version:
+                    cache_key = self.spec_cache.cache_key(self.api_version, software_version)
+                    checked = True
+            if cache_key is not None:
+                spec_dict = self.spec_cache.get(cache_key)
+                if spec_dict is not None:
+                    if checked:
+                        self.spec_cache.put_device(self.base_url, self.api_version, cache_key)
+                    return spec_dict
+
+        spec_dict = Loader(http_client).load_spec(self.base_url + "/apispec/ngfw.json")
+        if cache_key is not None:
+            self.spec_cache.put(cache_key, spec_dict)
+        if checked:
+            self.spec_cache.put_device(self.base_url, self.api_version, cache_key)
+        return spec_dict
+
     def get_swagger_client(self) -> None:
         """From here on out, most of the API calls to the FTD will be swagger calls through the bravado client instead
         of using the standard Requests library. We use our extended class ExtendedRequestsClient which extends the
         bravado RequestsClient and give us an opportunity to add proxy support"""
-        bravado_req_client = ExtendedRequestsClient(proxies=self.proxies)
-        bravado_req_client.session.trust_env = self.verify
+        # The bravado client sends its requests over our http_session, so it shares the connection pool and the
+        # headers. A new token is picked up by both without having to rebuild the swagger_client
+        bravado_req_client = ExtendedRequestsClient(session=self.http_session)
         bravado_req_client.ssl_verify = self.verify
 
-        if "Authorization" not in self.http_session.headers:
-            logger.error("swagger_client was called but no auth token was passed!")
-            raise ValueError
-
-        # Copy the session headers to the bravado client for authentication
-        bravado_req_client.session.headers = self.http_session.headers.copy()
-
-        self.swagger_client = SwaggerClient.from_url(
-            self.base_url + "/apispec/ngfw.json",
+        self.swagger_client = SwaggerClient.from_spec(
+            self.get_swagger_spec(bravado_req_client),
+            origin_url=self.base_url + "/apispec/ngfw.json",
             http_client=bravado_req_client,
             config={"validate_responses": False, "validate_swagger_spec": False},
         )
 
+    @FTDAPIWrapper()
+    def get_page(self, resource: str, operation: str, limit: int, offset: int = 0, **params):
+        """
+        Fetch a single page of any swagger list operation
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger list operation like "getNetworkObjectList"
+        :param limit: int the number of records to return
+        :param offset: int starting index of records to return
+        :param params: any other parameters of the operation like filter or parentId
+        :return: the list wrapper object of the operation with .items and .paging
+        """
+        swagger_operation = getattr(getattr(self.swagger_client, resource), operation)
+        return swagger_operation(limit=limit, offset=offset, **params).result()
+
+    @FTDAPIWrapper()
+    @FTDAPIWrapper()
+    def get_object(self, resource: str, operation: str, **params):
+        """
+        Fetch a single object with any swagger read operation
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger read operation like "getNetworkObject"
+        :param params: the parameters of the operation like objId and parentId
+        :return: the object
+        """
+        return getattr(getattr(self.swagger_client, resource), operation)(**params).result()
+
+    @staticmethod
+    def read_operation(swagger_client: SwaggerClient, resource: str, operation: str) -> Optional[str]:
+        """
+        :param swagger_client: SwaggerClient of the device
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger edit operation like "editNetworkObject"
+        :return: str the swagger operation that reads the object the edit operation writes (the GET on the same path),
+                 None if there is none
+        """
+        path_name = getattr(getattr(swagger_client, resource), operation).operation.path_name
+        for swagger_operation in swagger_client.swagger_spec.resources[resource].operations.values():
+            if swagger_operation.path_name == path_name and swagger_operation.http_method == "get":
+                return swagger_operation.operation_id
+        return None
+
+    @staticmethod
+    def object_operation(swagger_client: SwaggerClient, resource: str, operation: str) -> Optional[str]:
+        """
+        :param swagger_client: SwaggerClient of the device
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger list operation like "getNetworkObjectList"
+        :return: str the swagger operation that reads one of the listed objects by its objId alone (the GET on the path
+                 of the list below /{objId}), None if there is none or the objects belong to a parent
+        """
+        path_name = getattr(getattr(swagger_client, resource), operation).operation.path_name
+        if "{" in path_name:
+            return None
+        for swagger_operation in swagger_client.swagger_spec.resources[resource].operations.values():
+            if swagger_operation.path_name == path_name + "/{objId}" and swagger_operation.http_method == "get":
+                return swagger_operation.operation_id
+        return None
+
+    def current_object(self, edit_method, *args, **kwargs) -> tuple:
+        """
+        Read the object an edit call would overwrite, from the object_cache if we have it there
+        :param edit_method: an edit_* method of the client class tagged with @edit_operation
+        :param args: the arguments of the edit call
+        :return: tuple (the object the edit call sends, the object on the device or None if it cannot be read)
+        """
+        obj, params = edit_target(edit_method, *args, **kwargs)
+        if self.object_cache is not None:
+            current = self.object_cache.get(FTDObjectCache.fields(obj)[0], obj_id=params["objId"])
+            if current is not None:
+                return obj, current
+        operation = FTDBaseClient.read_operation(
+            self.swagger_client, edit_method.edit_resource, edit_method.edit_operation
+        )
+        if operation is None:
+            return obj, None
+        return obj, self.get_object(edit_method.edit_resource, operation, **params)
+
+    def iter_pages(self, resource: str, operation: str, page_size: int = 100, **params) -> Iterator:
+        """
+        Yield the items of a swagger list operation one page at a time, following the paging offsets until the device
+        has returned every record. Only one page is held in memory at a time.
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger list operation like "getNetworkObjectList"
+        :param page_size: int the number of records to request per page
+        :param params: any other parameters of the operation like filter or parentId
+        :return: generator of the items of the list operation
+        """
+        filter = params.get("filter")
+        if filter and ":" in filter and not filter.split(":")[1]:  # a search key was provided with no value
+            return
+        offset = 0
+        while True:
+            page = self.get_page(resource, operation, page_size, offset, **params)
+            items = page.items or []
+            yield from items
+            offset += len(items)
+            if not items or FTDBaseClient.is_last_page(page.paging, offset):
+                return
+
+    def get_list_parallel(self, list_method, *args, page_size: int = 500, **kwargs) -> list:
+        """
+        Return every record of a get_*_list method. The first page tells us how many records there are, the remaining
+        pages are then fetched concurrently (at most max_in_flight at a time for this device) and put back in order.
+
+        Sample usage:
+
+        net_objs = ftd_client.get_list_parallel(ftd_client.get_network_object_list, filter="fts~10.1")
+        routes = ftd_client.get_list_parallel(ftd_client.get_static_route_list, parent_id="default")
+
+        :param list_method: one of the get_*_list methods of this client
+        :param args: positional arguments of the list method, like the parent id
+        :param page_size: int the number of records to request per page
+        :param kwargs: keyword arguments of the list method, like filter
+        :return: list of all records
+        """
+        params = FTDBaseClient.list_params(list_method, *args, **kwargs)
+        if params is None:
+            return []
+        return self.get_pages_parallel(
+            list_method.swagger_resource, list_method.swagger_operation, page_size=page_size, **params
+        )
+
+    @staticmethod
+    def list_params(list_method, *args, **kwargs) -> Optional[dict]:
+        """
+        Map the arguments of a call to a get_*_list method to the parameters of its swagger list operation
+        :param list_method: a bound get_*_list method tagged with @list_operation
+        :return: dict swagger parameters or None if a search key was provided with no value to search on
+        """
+        arguments = signature(list_method).bind_partial(*args, **kwargs).arguments
+        params = {
+            swagger_name: arguments[arg_name]
+            for swagger_name, arg_name in list_method.swagger_param_names.items()
+            if arguments.get(arg_name) is not None
+        }
+        filter = params.get("filter")
+        if filter and ":" in filter and not filter.split(":")[1]:
+            return None
+        return params
+
+    def get_pages_parallel(self, resource: str, operation: str, page_size: int = 500, **params) -> list:
+        """
+        Return every record of a swagger list operation, fetching all pages after the first one concurrently
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger list operation like "getNetworkObjectList"
+        :param page_size: int the number of records to request per page
+        :param params: any other parameters of the operation like filter or parentId
+        :return: list of all records, in the order the device returned them
+        """
+        first_page = self.get_page(resource, operation, page_size, 0, **params)
+        items = list(first_page.items or [])
+        if not items or FTDBaseClient.is_last_page(first_page.paging, len(items)):
+            return items
+
+        # The device may cap the page size below what we asked for, so step by what it actually returned
+        page_size = len(items)
+        if first_page.paging.count is None:  # the offsets are unknown, so follow the pages one after another
+            while True:
+                page = self.get_page(resource, operation, page_size, len(items), **params)
+                items.extend(page.items or [])
+                if not page.items or FTDBaseClient.is_last_page(page.paging, len(items)):
+                    return items
+        offsets = range(page_size, first_page.paging.count, page_size)
+
+        def get_page(offset):
+            with self.in_flight:
+                return self.get_page(resource, operation, page_size, offset, **params)
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="pyftd-pager") as executor:
+            for page in executor.map(FTDAPIWrapper.carry(get_page), offsets):  # yields the pages in offset order
+                items.extend(page.items or [])
+        return items
+
+    @staticmethod
+    def is_last_page(paging, offset: int) -> bool:
+        """
+        :param paging: the paging object of a list response like {"offset": 0, "limit": 100, "count": 250, "next": []}
+        :param offset: int the number of records received so far
+        :return: True if there are no more records to fetch
+        """
+        if paging is None:
+            return True
+        if paging.count is not None:
+            return offset >= paging.count
+        return not paging.next
+
+    def gather(self, *calls) -> list:
+        """
+        Run independent calls to this device at the same time, at most max_in_flight at a time
+        :param calls: callables without arguments, like lambda: self.get_tcp_port_object_list(filter="name:http")
+        :return: list of their results in the same order as calls
+        """
+        if len(calls) <= 1:
+            return [call() for call in calls]
+        with ThreadPoolExecutor(
+            max_workers=min(len(calls), self.max_in_flight), thread_name_prefix="pyftd-gather"
+        ) as executor:
+            futures = [executor.submit(FTDAPIWrapper.carry(call)) for call in calls]
+            return [future.result() for future in futures]
+
     @FTDAPIWrapper()
     def skip_setup_wizard(self) -> None:
         """If the setup wizard has not been run or skipped, we cannot configure the device with API calls. Skip the
@@ -314,9 +819,37 @@ class FTDBaseClient(object):
 
 
 class ExtendedRequestsClient(RequestsClient):
-    """This extends the bravado requests client to add proxy support"""
+    """This extends the bravado requests client to add proxy support and to share an existing requests session"""
 
-    def __init__(self, proxies: Optional[dict] = None) -> None:
+    def __init__(self, proxies: Optional[dict] = None, session: Optional[Session] = None) -> None:
         super(ExtendedRequestsClient, self).__init__()
+        if session is not None:
+            self.session = session
         if proxies is not None:
             self.session.proxies.update(proxies)
+
+    def request(self, request_params, operation=None, request_config=None):
+        """Note the swagger operation on the calls being measured before handing the request to bravado"""
+        if operation is not None:
+            for call_record in active_call_records():
+                call_record.operations.append(operation.operation_id)
+        return super(ExtendedRequestsClient, self).request(request_params, operation, request_config)
+
+
+class FTDSession(Session):
+    """
+    A requests Session that accounts the network time and the response size of every request to the calls being
+    measured on the same thread (see FTDMetrics). When no call is measured it behaves exactly like a Session.
+    """
+
+    def send(self, request, **kwargs):
+        call_records = active_call_records()
+        if not call_records:
+            return super(FTDSession, self).send(request, **kwargs)
+        started = perf_counter()
+        response = super(FTDSession, self).send(request, **kwargs)
+        network_time = perf_counter() - started  # the body is read inside send() unless the request is streamed
+        response_bytes = 0 if kwargs.get("stream") else len(response.content)
+        for call_record in call_records:
+            call_record.add_request(network_time, response_bytes)
+        return response
@@ -0,0 +1,364 @@
+import logging
+from .base import FTDAPIWrapper
+from .compare import SERVER_MANAGED_FIELDS, changed_fields, count_edit, to_plain
+from .object_cache import FTDObjectCache
+from bravado.exception import HTTPUnprocessableEntity, make_http_exception
+from bravado.requests_client import RequestsResponseAdapter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from requests.exceptions import HTTPError
+from typing import Callable, Iterable, Optional
+
+log = logging.getLogger(__name__)
+
+
+class FTDBulkResult(object):
+    """
+    The outcome of one item of a bulk call
+
+    status is one of:
+        created, edited, deleted: the device accepted the item
+        unchanged: (upserts only) the object already exists with the same settings, result is the existing object
+        duplicate: an object with this name already exists (see FTDAPIWrapper), result is None
+        failed: the device rejected the item, the exception is in error
+        skipped: (reconcile plans only) the change was not attempted because a change it depends on failed
+    """
+
+    def __init__(self, item, status: str, result=None, error: Optional[Exception] = None):
+        self.item = item
+        self.status = status
+        self.result = result
+        self.error = error
+
+    def __repr__(self):
+        return f"FTDBulkResult(status={self.status!r}, item={self.item!r}, error={self.error!r})"
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("created", "edited", "deleted", "unchanged")
+
+
+class FTDBulkOperations:
+    """
+    Generic machinery for the bulk_* methods of the object classes. Where the device API declares a bulk parameter on
+    an operation (FDM API v6 and later), items are sent in chunks with ?bulk=true. Otherwise, or if the device refuses
+    a bulk chunk, the items of the chunk are sent one call at a time, at most max_in_flight at the same time.
+
+    A bulk chunk is refused with one of BULK_REFUSED_STATUSES: the device does not take the bulk request (400, 404,
+    405), or it rejects one of its items (422), like a duplicate name, and all of the chunk with it. The single calls
+    then tell the items apart. Any other error, like a lock that outlasted the retry_policy, is raised.
+    """
+
+    BULK_REFUSED_STATUSES = (400, 404, 405, 422)
+    # Raised as bravado exceptions from bulk_request(), so that FTDAPIWrapper logs in again or retries like for the
+    # swagger operations: 401, 423 and 503
+    BULK_WRAPPED_STATUSES = (401, 423, 503)
+
+    def supports_bulk(self, resource: str, operation: str) -> bool:
+        """
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger operation like "addNetworkObject"
+        :return: True if the operation accepts the bulk query parameter on this device
+        """
+        swagger_operation = getattr(getattr(self.swagger_client, resource), operation).operation
+        return "bulk" in swagger_operation.params
+
+    def run_bulk(
+        self,
+        items: Iterable,
+        status: str,
+        single_call: Callable,
+        bulk_call: Optional[Callable] = None,
+        chunk_size: int = 500,
+    ) -> list:
+        """
+        Send items to the device in chunks and report the outcome of every item
+        :param items: iterable of the items to send
+        :param status: str the status of an accepted item: "created", "edited" or "deleted"
+        :param single_call: the wrapped client method that sends one item
+        :param bulk_call: (Optional) callable that sends a whole chunk and returns one result per item. Items the device
+                          returned no result for are reported as failed.
+        :param chunk_size: int the number of items sent per bulk request
+        :return: list of FTDBulkResult in the same order as items
+        """
+        results = []
+        items = iter(items)
+        # One pool for every chunk that is sent one item at a time, its threads are only started when one is
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="pyftd-bulk") as executor:
+            while True:
+                chunk = list(islice(items, chunk_size))
+                if not chunk:
+                    return results
+                chunk_results = self.send_chunk(chunk, status, bulk_call) if bulk_call is not None else None
+                if chunk_results is None:  # the single calls update the object_cache
+                    chunk_results = self.fan_out(chunk, status, single_call, executor)
+                results += chunk_results
+
+    def send_chunk(self, chunk: list, status: str, bulk_call: Callable) -> Optional[list]:
+        """
+        Send a chunk with one bulk request. The results the device returns are paired with the items in the same order.
+        Should the device return fewer results than it was sent items, the items without a result are reported as
+        failed: we cannot tell whether it took them, so sending them again could create them twice.
+        :return: list of FTDBulkResult in the same order as chunk, None if the device refused the bulk request
+        """
+        try:
+            returned = list(bulk_call(chunk))
+        except HTTPError as ex:
+            if ex.response is None or ex.response.status_code not in FTDBulkOperations.BULK_REFUSED_STATUSES:
+                raise
+            log.warning(f"Bulk request for {len(chunk)} items was refused ({ex}). Sending them one at a time.")
+            return None
+        chunk_results = [FTDBulkResult(item, status, result) for item, result in zip(chunk, returned)]
+        if len(returned) != len(chunk):
+            error = ValueError(f"The device returned {len(returned)} results for a bulk request of {len(chunk)} items")
+            log.error(f"{error}, the items without a result are reported as failed")
+            chunk_results += [FTDBulkResult(item, "failed", error=error) for item in chunk[len(returned) :]]
+        self.cache_bulk_results(chunk_results)
+        if status == "edited":  # the single calls count their own edits
+            for bulk_result in chunk_results:
+                if bulk_result.ok:
+                    count_edit(self, sent=True)
+        return chunk_results
+
+    def run_bulk_edit(
+        self,
+        items: Iterable,
+        single_call: Callable,
+        bulk_call: Optional[Callable] = None,
+        chunk_size: int = 500,
+        skip_unchanged: Optional[bool] = None,
+    ) -> list:
+        """
+        run_bulk() for edits. With skip_unchanged the items are compared with the objects on the device first, read with
+        one listing per object type (or from the object_cache), and only the items that differ are sent. The others are
+        reported with the status "unchanged".
+        :param items: iterable of the objects to edit
+        :param single_call: the edit_* method that sends one item
+        :param bulk_call: (Optional) callable that sends a whole chunk and returns one result per item
+        :param chunk_size: int the number of items sent per bulk request
+        :param skip_unchanged: bool (Optional) by default the skip_unchanged_edits of the client
+        :return: list of FTDBulkResult in the same order as items
+        """
+        items = list(items)
+        if not (self.skip_unchanged_edits if skip_unchanged is None else skip_unchanged):
+            return self.run_bulk(items, "edited", single_call, bulk_call, chunk_size)
+        current = self.current_objects(items)
+        results = [None] * len(items)
+        changed = []
+        for index, item in enumerate(items):
+            current_obj = current.get(FTDObjectCache.fields(item)[1])
+            if current_obj is not None and not changed_fields(current_obj, item):
+                results[index] = FTDBulkResult(item, "unchanged", current_obj)
+                count_edit(self, sent=False)
+            else:
+                changed.append(index)
+        edit_results = self.run_bulk(
+            [items[index] for index in changed],
+            "edited",
+            lambda item: single_call(item, skip_unchanged=False),  # we have just compared it
+            bulk_call,
+            chunk_size,
+        )
+        for index, edit_result in zip(changed, edit_results):
+            results[index] = edit_result
+        return results
+
+    def current_objects(self, objs: list) -> dict:
+        """
+        Fetch the objects on the device with the same ids as objs
+        :param objs: list of dicts or swagger model objects with the id and the type of the objects
+        :return: dict id: object on the device, for the objects that were found
+        """
+        ids_by_type = {}
+        for obj in objs:
+            obj_type, obj_id, _ = FTDObjectCache.fields(obj)
+            ids_by_type.setdefault(obj_type, set()).add(obj_id)
+
+        def fetch(obj_type: str, obj_ids: set) -> list:
+            if self.object_cache is not None:
+                return [self.find_object_by_id(obj_type, obj_id) for obj_id in obj_ids]
+            return [obj for obj in self.load_object_index(obj_type) if obj.id in obj_ids]
+
+        found = self.gather(*[lambda item=item: fetch(*item) for item in ids_by_type.items()])
+        return {obj.id: obj for fetched in found for obj in fetched if obj is not None}
+
+    def cache_bulk_results(self, results: list) -> None:
+        """Write the outcome of a bulk request through to the object_cache, like the single calls do"""
+        if self.object_cache is None:
+            return
+        for bulk_result in results:
+            if bulk_result.status == "deleted":
+                self.object_cache.remove(getattr(bulk_result.item, "id", bulk_result.item))
+            elif bulk_result.result is not None:
+                self.object_cache.put(bulk_result.result)
+
+    def fan_out(
+        self, chunk: list, status: str, single_call: Callable, executor: Optional[ThreadPoolExecutor] = None
+    ) -> list:
+        """
+        Send every item with its own call, at most max_in_flight at a time
+        :param executor: ThreadPoolExecutor (Optional) the pool of the run_bulk() call, by default a pool of its own
+        :return: list of FTDBulkResult in the same order as chunk
+        """
+
+        def send(item):
+            try:
+                result = single_call(item)
+            except Exception as ex:
+                return FTDBulkResult(item, "failed", error=ex)
+            if result is None and status == "created":  # FTDAPIWrapper swallowed a duplicate name
+                return FTDBulkResult(item, "duplicate")
+            return FTDBulkResult(item, status, result)
+
+        if executor is not None:
+            return list(executor.map(FTDAPIWrapper.carry(send), chunk))
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="pyftd-bulk") as executor:
+            return list(executor.map(FTDAPIWrapper.carry(send), chunk))
+
+    @FTDAPIWrapper()
+    def bulk_request(self, resource: str, operation: str, chunk: list, **params) -> list:
+        """
+        Send a chunk of items to a swagger operation with ?bulk=true. The chunk is posted as a json list to the path of
+        the operation, so this also works where bravado would refuse a list body for the operation. An expired token, a
+        locked database and an unavailable API are handled by FTDAPIWrapper (see BULK_WRAPPED_STATUSES), the other
+        errors are raised as requests.HTTPError.
+        :param resource: str the swagger resource (tag) like "NetworkObject"
+        :param operation: str the swagger operation like "addNetworkObject"
+        :param chunk: list of dicts or swagger model objects, None for a request without a body like a bulk delete
+        :param params: query parameters to send along with bulk=true
+        :return: list of the objects the device returned
+        """
+        swagger_operation = getattr(getattr(self.swagger_client, resource), operation).operation
+        # Bulk requests go to the collection, e.g. PUT /object/networks rather than PUT /object/networks/{objId}
+        path_name = swagger_operation.path_name.split("/{objId}")[0]
+        api_response = self.http_session.request(
+            swagger_operation.http_method.upper(),
+            self.common_prefix + path_name,
+            params=dict(params, bulk="true"),
+            json=[FTDBulkOperations.to_dict(item) for item in chunk] if chunk is not None else None,
+            verify=self.verify,
+            timeout=self.timeout,
+        )
+        if api_response.status_code in FTDBulkOperations.BULK_WRAPPED_STATUSES:
+            raise make_http_exception(RequestsResponseAdapter(api_response))
+        api_response.raise_for_status()
+        if not api_response.content:
+            return [None] * len(chunk or [])
+        payload = api_response.json()
+        return payload.get("items", []) if isinstance(payload, dict) else payload
+
+    def to_models(self, model_name: str, payload: list) -> list:
+        """
+        Turn the json objects of a bulk response into swagger model objects, like the single calls return
+        :param model_name: str the swagger definition like "NetworkObject"
+        :param payload: list of dicts
+        :return: list of swagger model objects
+        """
+        model = self.swagger_client.get_model(model_name)
+        return [model._unmarshal(obj) if isinstance(obj, dict) else obj for obj in payload]
+
+    @staticmethod
+    def to_dict(item) -> dict:
+        """:return: dict the json representation of a dict or a swagger model object"""
+        return item._marshal() if hasattr(item, "_marshal") else item
+
+    def upsert(self, obj, create: Callable, edit: Callable):
+        """
+        Make sure an object exists with the given settings. The create is sent first, so a new object costs a single
+        call. If the name already exists, the existing object is fetched and edited only if one of the fields of obj
+        differs on the device (see compare.changed_fields).
+        :param obj: dict (or swagger model object) with at least the name and the type of the object
+        :param create: the wrapped client method that creates one object, like self.create_network_object
+        :param edit: the wrapped client method that edits one object, like self.edit_network_object
+        :return: the created, edited or unchanged object
+        """
+        obj = to_plain(obj)
+        try:
+            created = create(obj)
+        except HTTPUnprocessableEntity as ex:  # the async client hands the duplicate error to us instead
+            if FTDAPIWrapper.duplicate_message(ex) is None:
+                raise
+            created = None
+        if created is not None:
+            return created
+        current = self.find_object(obj["type"], obj["name"])
+        if current is None:
+            raise ValueError(f"The name {obj['name']} is already used by an object that is not a {obj['type']}")
+        fields = changed_fields(current, obj)
+        if not fields:
+            log.info(f"{obj['type']} {obj['name']} is up to date")
+            return current
+        log.info(f"{obj['type']} {obj['name']} differs in {', '.join(fields)}. Updating it.")
+        return edit(FTDBulkOperations.merge(current, obj))
+
+    def bulk_upsert(
+        self,
+        objs: Iterable,
+        create: Callable,
+        edit: Callable,
+        bulk_create: Optional[Callable] = None,
+        bulk_edit: Optional[Callable] = None,
+        chunk_size: int = 500,
+    ) -> list:
+        """
+        upsert() many objects. All objects are created first (see run_bulk), then the existing objects of the names
+        that were duplicates are fetched, with one listing per object type when there are several of them, and the
+        ones that differ are edited in bulk.
+        :param objs: iterable of dicts (or swagger model objects) with at least the name and the type of the object
+        :param create: the wrapped client method that creates one object
+        :param edit: the wrapped client method that edits one object
+        :param bulk_create: (Optional) callable that creates a whole chunk, see run_bulk
+        :param bulk_edit: (Optional) callable that edits a whole chunk, see run_bulk
+        :param chunk_size: int the number of items sent per bulk request
+        :return: list of FTDBulkResult, one per object and in the same order, with the status created, edited,
+                 unchanged or failed
+        """
+        objs = [to_plain(obj) for obj in objs]
+        results = self.run_bulk(objs, "created", create, bulk_create, chunk_size)
+        duplicates = [index for index, bulk_result in enumerate(results) if bulk_result.status == "duplicate"]
+        existing = self.existing_objects([objs[index] for index in duplicates])
+        edits = []  # (index, merged object)
+        for index in duplicates:
+            obj = objs[index]
+            current = existing.get((obj["type"], obj["name"]))
+            if current is None:
+                error = ValueError(f"The name {obj['name']} is already used by an object that is not a {obj['type']}")
+                results[index] = FTDBulkResult(obj, "failed", error=error)
+            elif changed_fields(current, obj):
+                edits.append((index, FTDBulkOperations.merge(current, obj)))
+            else:
+                results[index] = FTDBulkResult(obj, "unchanged", current)
+        edit_results = self.run_bulk([merged for _, merged in edits], "edited", edit, bulk_edit, chunk_size)
+        for (index, _), edit_result in zip(edits, edit_results):
+            results[index] = FTDBulkResult(objs[index], edit_result.status, edit_result.result, edit_result.error)
+        return results
+
+    def existing_objects(self, objs: list) -> dict:
+        """
+        Fetch the objects on the device with the same type and name as objs
+        :param objs: list of dicts with the name and the type of the objects
+        :return: dict (type, name): object on the device, for the objects that were found
+        """
+        names_by_type = {}
+        for obj in objs:
+            names_by_type.setdefault(obj["type"], set()).add(obj["name"])
+
+        def fetch(obj_type: str, names: set) -> list:
+            if len(names) == 1 or self.object_cache is not None:
+                return [(obj_type, name, self.find_object(obj_type, name)) for name in names]
+            return [(obj_type, obj.name, obj) for obj in self.load_object_index(obj_type) if obj.name in names]
+
+        found = self.gather(*[lambda item=item: fetch(*item) for item in names_by_type.items()])
+        return {(obj_type, name): obj for fetched in found for obj_type, name, obj in fetched if obj is not None}
+
+    @staticmethod
+    def merge(current, desired: dict):
+        """
+        :return: the existing object with the fields of desired, as the same kind of object (a swagger model object or
+                 a dict). The server managed fields of the existing object, like its id and version, are kept.
+        """
+        merged = dict(
+            FTDBulkOperations.to_dict(current),
+            **{key: value for key, value in to_plain(desired).items() if key not in SERVER_MANAGED_FIELDS},
+        )
+        return type(current)._unmarshal(merged) if hasattr(current, "_unmarshal") else merged
@@ -0,0 +1,235 @@
+import base64
+import gzip
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from requests import Response, Session
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError
+from requests.structures import CaseInsensitiveDict
+from threading import Lock
+from time import perf_counter, sleep
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+log = logging.getLogger(__name__)
+
+# Fields of the /fdm/token responses that are never written to a cassette, with what is written instead
+CASSETTE_REDACT = {"access_token": "cassette-access-token", "refresh_token": "cassette-refresh-token"}
+
+
+class FTDCassette(object):
+    """
+    Record the HTTP exchanges of a client with a device and replay them later without a network.
+
+    Everything a client sends goes through its http_session, the swagger_client (see ExtendedRequestsClient) included,
+    so record() and replay() mount an adapter on the http_session: the api version probe, the token, the ngfw.json spec
+    and every swagger operation are recorded and replayed. Requests are matched by method, path and query, in the order
+    they were recorded, so a cassette recorded on one device replays for a client of any address. The request bodies
+    and the Authorization headers are not recorded and the tokens in the token responses are redacted. Only a sha256
+    hash of every request body is kept, except for the token requests, and replay warns when a POST or PUT sends a
+    different body than the one that was recorded: its response is likely not the one the client expects.
+
+    The time every exchange took is recorded with it. Replay waits that long times time_scale before it answers:
+    1 reproduces the latency of the device, 0 removes it so that only the time the client spends itself is left, like
+    building requests and unmarshalling responses with bravado.
+
+    Sample usage:
+
+    cassette = FTDCassette()
+    ftd_client = FTDClient("192.168.100.100", "admin", "Admin123", verify=False, lazy=True)
+    cassette.record(ftd_client.http_session)
+    net_objs = ftd_client.get_network_object_list()
+    cassette.save("ftd1.jsonl.gz")
+
+    cassette = FTDCassette.load("ftd1.jsonl.gz")
+    ftd_client = FTDClient("192.168.100.100", "admin", "Admin123", verify=False, lazy=True)
+    cassette.replay(ftd_client.http_session, time_scale=0)
+    net_objs = ftd_client.get_network_object_list()  # no network, no device latency
+
+    The FTDAsyncClient sends its requests with aiohttp and is not recorded.
+    """
+
+    def __init__(self, interactions: list = None):
+        """
+        :param interactions: list (Optional) the recorded exchanges, see load()
+        """
+        self.interactions = interactions or []
+        self.lock = Lock()
+        self.replay_queues = None  # key: list of the interactions that have not been replayed yet
+
+    def __len__(self):
+        return len(self.interactions)
+
+    @staticmethod
+    def key(method: str, url: str) -> tuple:
+        """:return: tuple (method, path, query with the parameters sorted), what requests are matched by"""
+        parts = urlsplit(url)
+        return method.upper(), parts.path, urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+
+    def record(self, http_session: Session) -> None:
+        """
+        Record every request of the http_session from now on. Use a lazy client to record its login and spec download.
+        :param http_session: the http_session of a client
+        """
+        for prefix, adapter in list(http_session.adapters.items()):
+            if not isinstance(adapter, FTDRecordingAdapter):
+                http_session.mount(prefix, FTDRecordingAdapter(self, adapter))
+
+    def replay(self, http_session: Session, time_scale: float = 1.0, repeat: bool = True) -> None:
+        """
+        Answer every request of the http_session from the cassette, no request reaches the network
+        :param http_session: the http_session of a client
+        :param time_scale: float how much of the recorded time to wait before answering, 0 answers at once
+        :param repeat: bool answer with the last recorded response once the responses of a request are used up,
+                       so that a short recording can be replayed in a loop
+        """
+        with self.lock:
+            self.replay_queues = {}
+            for interaction in self.interactions:
+                key = (interaction["method"], interaction["path"], interaction["query"])
+                self.replay_queues.setdefault(key, []).append(interaction)
+        for prefix in list(http_session.adapters):
+            http_session.mount(prefix, FTDReplayAdapter(self, time_scale, repeat))
+
+    def add(self, request, response: Response, elapsed: float) -> None:
+        """
+        Record one exchange
+        :param request: the PreparedRequest that was sent
+        :param response: the Response, with its content read
+        :param elapsed: float the seconds from sending the request to having read the response
+        """
+        method, url_path, query = FTDCassette.key(request.method, request.url)
+        interaction = {
+            "method": method,
+            "path": url_path,
+            "query": query,
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {name: value for name, value in response.headers.items() if name.lower() == "content-type"},
+            "elapsed": round(elapsed, 6),
+        }
+        body_hash = FTDCassette.body_hash(request.body)
+        if body_hash is not None and not url_path.endswith("/fdm/token"):  # the hash of a password is no secret
+            interaction["body_sha256"] = body_hash
+        content = response.content or b""
+        if url_path.endswith("/fdm/token") and content:
+            content = FTDCassette.redact(content)
+        try:
+            interaction["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            interaction["body_base64"] = base64.b64encode(content).decode("ascii")
+        with self.lock:
+            self.interactions.append(interaction)
+
+    @staticmethod
+    def body_hash(body) -> Optional[str]:
+        """:return: str the sha256 hex digest of a request body, None if the request has no body"""
+        if not body:
+            return None
+        return hashlib.sha256(body.encode("utf-8") if isinstance(body, str) else body).hexdigest()
+
+    @staticmethod
+    def redact(content: bytes) -> bytes:
+        """:return: bytes the token response without the tokens, see CASSETTE_REDACT"""
+        try:
+            token = json.loads(content)
+        except ValueError:
+            return content
+        if isinstance(token, dict):
+            token.update({field: value for field, value in CASSETTE_REDACT.items() if field in token})
+        return json.dumps(token).encode()
+
+    def next_interaction(self, method: str, url: str, repeat: bool) -> dict:
+        """:return: dict the recorded exchange that answers the request, raises ConnectionError if there is none"""
+        key = FTDCassette.key(method, url)
+        with self.lock:
+            queue = self.replay_queues.get(key)
+            if queue:
+                return queue.pop(0) if len(queue) > 1 or not repeat else queue[0]
+        raise ConnectionError(f"The cassette has no (more) responses for {key[0]} {key[1]}?{key[2]}")
+
+    def save(self, path: str) -> None:
+        """
+        Write the cassette to a JSON lines file, gzip compressed if the path ends with .gz. The first line describes the
+        cassette, every other line is one exchange.
+        :param path: str the file to write
+        """
+        header = {"recorded_at": datetime.now(timezone.utc).isoformat(), "interactions": len(self.interactions)}
+        with (gzip.open if path.endswith(".gz") else open)(path, "wt", encoding="utf-8") as cassette_file:
+            cassette_file.write(json.dumps({"cassette": header}) + "\n")
+            for interaction in self.interactions:
+                cassette_file.write(json.dumps(interaction) + "\n")
+        log.info(f"Saved {len(self.interactions)} exchanges to {path}")
+
+    @staticmethod
+    def load(path: str):
+        """
+        :param path: str a file written by save()
+        :return: FTDCassette
+        """
+        interactions = []
+        with (gzip.open if path.endswith(".gz") else open)(path, "rt", encoding="utf-8") as cassette_file:
+            for line in cassette_file:
+                record = json.loads(line)
+                if "cassette" not in record:
+                    interactions.append(record)
+        return FTDCassette(interactions)
+
+
+class FTDRecordingAdapter(BaseAdapter):
+    """Sends the requests with the adapter that was mounted before and records the exchanges, see FTDCassette.record()"""
+
+    def __init__(self, cassette: FTDCassette, adapter: BaseAdapter):
+        super(FTDRecordingAdapter, self).__init__()
+        self.cassette = cassette
+        self.adapter = adapter
+
+    def send(self, request, **kwargs):
+        started = perf_counter()
+        response = self.adapter.send(request, **kwargs)
+        response.content  # read the body, also of streamed downloads, so that it is part of the recorded time
+        self.cassette.add(request, response, perf_counter() - started)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+class FTDReplayAdapter(BaseAdapter):
+    """Answers the requests from a cassette, see FTDCassette.replay()"""
+
+    def __init__(self, cassette: FTDCassette, time_scale: float = 1.0, repeat: bool = True):
+        super(FTDReplayAdapter, self).__init__()
+        self.cassette = cassette
+        self.time_scale = time_scale
+        self.repeat = repeat
+
+    def send(self, request, **kwargs):
+        interaction = self.cassette.next_interaction(request.method, request.url, self.repeat)
+        if request.method.upper() in ("POST", "PUT") and "body_sha256" in interaction:
+            if FTDCassette.body_hash(request.body) != interaction["body_sha256"]:
+                log.warning(
+                    f"{request.method.upper()} {interaction['path']} sends a different body than the one recorded, "
+                    f"the recorded response is replayed anyway"
+                )
+        if self.time_scale:
+            sleep(interaction["elapsed"] * self.time_scale)
+        response = Response()
+        response.status_code = interaction["status"]
+        response.reason = interaction["reason"]
+        response.headers = CaseInsensitiveDict(interaction["headers"])
+        if "body_base64" in interaction:
+            response._content = base64.b64decode(interaction["body_base64"])
+        else:
+            response._content = interaction["body"].encode("utf-8")
+            response.encoding = "utf-8"
+        response._content_consumed = True
+        response.url = request.url
+        response.request = request
+        response.elapsed = timedelta(seconds=interaction["elapsed"] * self.time_scale)
+        return response
+
+    def close(self):
+        pass
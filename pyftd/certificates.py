@@ -1,6 +1,8 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterator, Optional
 
 log = logging.getLogger(__name__)
 
@@ -8,6 +10,7 @@ log = logging.getLogger(__name__)
 class FTDCertificateObjects:
     ################################
     # External CA Certificates
+    @list_operation("Certificate", "getExternalCACertificateList", obj_type="externalcacertificate")
     @FTDAPIWrapper()
     def get_external_ca_certificate_list(
         self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None
@@ -26,6 +29,18 @@ class FTDCertificateObjects:
             .items
         )
 
+    @api_operation("Certificate", "getExternalCACertificateList", pages=True, filter="filter")
+    def iter_external_ca_certificates(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the external CA certificates one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of ExternalCACertificate objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Certificate", "getExternalCACertificateList", page_size, filter=filter)
+
+    @api_operation("Certificate", "getExternalCACertificate", objId="obj_id")
     @FTDAPIWrapper()
     def get_external_ca_certificate(self, obj_id: str) -> dict:
         """
@@ -36,6 +51,8 @@ class FTDCertificateObjects:
         """
         return self.swagger_client.Certificate.getExternalCACertificate(objId=obj_id).result()
 
+    @cache_put
+    @api_operation("Certificate", "addExternalCACertificate", body="certificate_obj")
     @FTDAPIWrapper()
     def create_external_ca_certificate(self, certificate_obj: dict) -> dict:
         """
@@ -52,6 +69,8 @@ class FTDCertificateObjects:
         """
         return self.swagger_client.Certificate.addExternalCACertificate(body=certificate_obj).result()
 
+    @cache_put
+    @edit_operation("Certificate", "editExternalCACertificate", body="certificate_obj")
     @FTDAPIWrapper()
     def edit_external_ca_certificate(self, certificate_obj: dict) -> dict:
         """
@@ -63,6 +82,8 @@ class FTDCertificateObjects:
             objId=certificate_obj.id, body=certificate_obj
         ).result()
 
+    @cache_evict("obj_id")
+    @api_operation("Certificate", "deleteExternalCACertificate", objId="obj_id")
     @FTDAPIWrapper()
     def delete_external_ca_certificate(self, obj_id: str) -> None:
         """
@@ -73,6 +94,7 @@ class FTDCertificateObjects:
 
     ################################
     # Internal CA Certificates
+    @list_operation("Certificate", "getInternalCACertificateList", obj_type="internalcacertificate")
     @FTDAPIWrapper()
     def get_internal_ca_certificate_list(
         self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None
@@ -87,6 +109,18 @@ class FTDCertificateObjects:
             .items
         )
 
+    @api_operation("Certificate", "getInternalCACertificateList", pages=True, filter="filter")
+    def iter_internal_ca_certificates(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the internal CA certificates one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of InternalCACertificate objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Certificate", "getInternalCACertificateList", page_size, filter=filter)
+
+    @api_operation("Certificate", "getInternalCACertificate", objId="obj_id")
     @FTDAPIWrapper()
     def get_internal_ca_certificate(self, obj_id: str) -> list:
         """
@@ -95,6 +129,8 @@ class FTDCertificateObjects:
         """
         return self.swagger_client.Certificate.getInternalCACertificate(objId=obj_id).result()
 
+    @cache_put
+    @api_operation("Certificate", "addInternalCACertificate", body="certificate_obj")
     @FTDAPIWrapper()
     def create_internal_ca_certificate(self, certificate_obj: dict) -> dict:
         """
@@ -113,6 +149,8 @@ class FTDCertificateObjects:
         """
         return self.swagger_client.Certificate.addInternalCACertificate(body=certificate_obj).result()
 
+    @cache_put
+    @edit_operation("Certificate", "editInternalCACertificate", body="certificate_obj")
     @FTDAPIWrapper()
     def edit_internal_ca_certificate(self, certificate_obj: dict) -> dict:
         """
@@ -124,6 +162,8 @@ class FTDCertificateObjects:
             objId=certificate_obj.id, body=certificate_obj
         ).result()
 
+    @cache_evict("obj_id")
+    @api_operation("Certificate", "deleteInternalCACertificate", objId="obj_id")
     @FTDAPIWrapper()
     def delete_internal_ca_certificate(self, obj_id: str) -> None:
         """
@@ -134,6 +174,7 @@ class FTDCertificateObjects:
 
     ################################
     # Internal Certificates
+    @list_operation("Certificate", "getInternalCertificateList", obj_type="internalcertificate")
     @FTDAPIWrapper()
     def get_internal_certificate_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         if ":" in filter and not filter.split(":")[1]:  # a search key was provided with no value to search on
@@ -148,6 +189,18 @@ class FTDCertificateObjects:
             .items
         )
 
+    @api_operation("Certificate", "getInternalCertificateList", pages=True, filter="filter")
+    def iter_internal_certificates(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the internal certificates one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of InternalCertificate objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Certificate", "getInternalCertificateList", page_size, filter=filter)
+
+    @api_operation("Certificate", "getInternalCertificate", objId="obj_id")
     @FTDAPIWrapper()
     def get_internal_certificate(self, obj_id: str) -> dict:
         """
@@ -156,6 +209,8 @@ class FTDCertificateObjects:
         """
         return self.swagger_client.Certificate.getInternalCertificate(objId=obj_id).result()
 
+    @cache_put
+    @api_operation("Certificate", "addInternalCertificate", body="certificate_obj")
     @FTDAPIWrapper()
     def create_internal_certificate(self, certificate_obj: dict) -> dict:
         """
@@ -174,6 +229,8 @@ class FTDCertificateObjects:
         """
         return self.swagger_client.Certificate.addInternalCertificate(body=certificate_obj).result()
 
+    @cache_put
+    @edit_operation("Certificate", "editInternalCertificate", body="certificate_obj")
     @FTDAPIWrapper()
     def edit_internal_certificate(self, certificate_obj: dict) -> dict:
         """
@@ -185,6 +242,8 @@ class FTDCertificateObjects:
             objId=certificate_obj.id, body=certificate_obj
         ).result()
 
+    @cache_evict("obj_id")
+    @api_operation("Certificate", "deleteInternalCertificate", objId="obj_id")
     @FTDAPIWrapper()
     def delete_internal_certificate(self, obj_id: str) -> None:
         """
@@ -195,6 +254,7 @@ class FTDCertificateObjects:
 
     ################################
     # External CA Certificates
+    @list_operation("Certificate", "getExternalCertificateList", obj_type="externalcertificate")
     @FTDAPIWrapper()
     def get_external_certificate_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -207,6 +267,18 @@ class FTDCertificateObjects:
             .items
         )
 
+    @api_operation("Certificate", "getExternalCertificateList", pages=True, filter="filter")
+    def iter_external_certificates(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the external certificates one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of ExternalCertificate objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Certificate", "getExternalCertificateList", page_size, filter=filter)
+
+    @api_operation("Certificate", "getExternalCertificate", objId="obj_id")
     @FTDAPIWrapper()
     def get_external_certificate(self, obj_id: str) -> dict:
         """
@@ -215,6 +287,8 @@ class FTDCertificateObjects:
         """
         return self.swagger_client.Certificate.getExternalCertificate(objId=obj_id).result()
 
+    @cache_put
+    @api_operation("Certificate", "addExternalCertificate", body="certificate_obj")
     @FTDAPIWrapper()
     def create_external_certificate(self, certificate_obj: dict) -> dict:
         """
@@ -233,6 +307,8 @@ class FTDCertificateObjects:
         """
         return self.swagger_client.Certificate.addExternalCertificate(body=certificate_obj).result()
 
+    @cache_put
+    @edit_operation("Certificate", "editExternalCertificate", body="certificate_obj")
     @FTDAPIWrapper()
     def edit_external_certificate(self, certificate_obj: dict) -> dict:
         """
@@ -244,6 +320,8 @@ class FTDCertificateObjects:
             objId=certificate_obj.id, body=certificate_obj
         ).result()
 
+    @cache_evict("obj_id")
+    @api_operation("Certificate", "deleteExternalCertificate", objId="obj_id")
     @FTDAPIWrapper()
     def delete_external_certificate(self, obj_id: str) -> None:
         """
@@ -0,0 +1,178 @@
+import logging
+from functools import wraps
+from inspect import signature
+from json import dumps
+from threading import Lock
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+# Fields the device sets on every object. They are never sent back by the caller with the same values, so they are
+# left out of every comparison.
+SERVER_MANAGED_FIELDS = ("id", "version", "links")
+
+# Lists the device keeps as sets and returns in an order of its own, like the members of a group or the networks of a
+# rule. They are sorted before comparing. Every other list is compared in order, like the servers of a DNS server group
+# or of NTP, whose order is the order of preference.
+UNORDERED_LIST_FIELDS = (
+    "objects",
+    "networks",
+    "interfaces",
+    "sourceZones",
+    "destinationZones",
+    "sourceNetworks",
+    "destinationNetworks",
+    "sourcePorts",
+    "destinationPorts",
+)
+
+_edit_counts_lock = Lock()
+
+
+def to_plain(obj):
+    """:return: the json representation of a swagger model object, or of dicts and lists that contain them"""
+    if hasattr(obj, "_marshal"):
+        return obj._marshal()
+    if isinstance(obj, dict):
+        return {key: to_plain(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_plain(value) for value in obj]
+    return obj
+
+
+def normalize(obj, keep_none: bool = False):
+    """
+    Bring an object into a form that compares equal to any other representation of the same configuration: swagger
+    models become dicts, server managed fields and fields without a value are dropped (at every level, so references
+    to other objects compare by name and type) and the lists in UNORDERED_LIST_FIELDS are sorted, as the device returns
+    the members of groups in its own order.
+    :param obj: a swagger model object, a dict, a list or a scalar
+    :param keep_none: bool keep the fields set to None, for a configuration we want in which None clears a field
+    :return: the normalized json representation of obj
+    """
+    return normalize_json(to_plain(obj), keep_none)
+
+
+def normalize_json(obj, keep_none: bool = False, field: Optional[str] = None):
+    """
+    normalize() for an object that is json already, like a snapshot record, without converting it again
+    :param field: str (Optional) the name of the field obj is the value of
+    """
+    if isinstance(obj, dict):
+        return {
+            key: normalize_json(value, keep_none, key)
+            for key, value in obj.items()
+            if key not in SERVER_MANAGED_FIELDS and (keep_none or value is not None)
+        }
+    if isinstance(obj, list):
+        values = [normalize_json(value, keep_none) for value in obj]
+        if field in UNORDERED_LIST_FIELDS:
+            values.sort(key=lambda value: dumps(value, sort_keys=True))
+        return values
+    return obj
+
+
+def contains(current, desired) -> bool:
+    """
+    :return: True if current has every field of desired with the same value. Fields the device added to current, like
+             defaults the caller did not ask for, do not count.
+    """
+    if isinstance(desired, dict):
+        return isinstance(current, dict) and all(contains(current.get(key), value) for key, value in desired.items())
+    if isinstance(desired, list):
+        return (
+            isinstance(current, list)
+            and len(current) == len(desired)
+            and all(contains(current_value, value) for current_value, value in zip(current, desired))
+        )
+    return current == desired
+
+
+def changed_fields(current, desired) -> list:
+    """
+    Compare an object on the device with the configuration we want it to have
+    :param current: the object as the device returned it (a swagger model object or a dict)
+    :param desired: the object we would send to the device (a dict or a swagger model object)
+    :return: list of the names of the top level fields of desired that differ on the device, empty if there is nothing
+             to change. A field desired sets to None differs if the device has a value for it.
+    """
+    current, desired = normalize(current), normalize(desired, keep_none=True)
+    return sorted(field for field, value in desired.items() if not contains(current.get(field), value))
+
+
+def field_changes(old, new) -> dict:
+    """
+    Compare two versions of an object, like the same object in two snapshots
+    :param old: the object before (a swagger model object or a dict)
+    :param new: the object after
+    :return: dict name of every top level field that differs: tuple (old value, new value), normalized (see normalize)
+             and None where the field is missing
+    """
+    old, new = normalize(old), normalize(new)
+    return {
+        field: (old.get(field), new.get(field))
+        for field in sorted(set(old) | set(new))
+        if old.get(field) != new.get(field)
+    }
+
+
+def edit_operation(resource: str, operation: str, **param_names):
+    """
+    Tag an edit_* method with the swagger edit operation it sends, and let callers skip edits that would not change
+    anything. With skip_unchanged=True, or a client built with skip_unchanged_edits=True, the object is read first
+    (from the object_cache if the client has one) and the PUT is only sent if a field of the payload differs on the
+    device (see changed_fields). A skipped edit returns the object on the device. Every edit is counted in the
+    edits_sent or edits_skipped of the client.
+    :param resource: str the swagger resource (tag) like "NetworkObject"
+    :param operation: str the swagger edit operation like "editNetworkObject"
+    :param param_names: swagger parameter name = method argument name, body= for the object and path parameters other
+                        than objId like parentId="parent_id"
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def new_func(self, *args, skip_unchanged: Optional[bool] = None, **kwargs):
+            if self.skip_unchanged_edits if skip_unchanged is None else skip_unchanged:
+                obj, current = self.current_object(new_func, *args, **kwargs)
+                if current is not None and not changed_fields(current, obj):
+                    log.info(
+                        f"{fn.__name__}: {getattr(current, 'name', None)} is already up to date, skipping the edit"
+                    )
+                    count_edit(self, sent=False)
+                    return current
+            result = fn(self, *args, **kwargs)
+            if result is not None:
+                count_edit(self, sent=True)
+            return result
+
+        new_func.edit_resource = resource
+        new_func.edit_operation = operation
+        new_func.edit_param_names = param_names
+        return new_func
+
+    return decorator
+
+
+def edit_target(edit_method, *args, **kwargs) -> tuple:
+    """
+    :param edit_method: an edit_* method of the client class (not bound to a client) tagged with @edit_operation
+    :param args: the arguments of the edit call
+    :return: tuple (the object the edit call sends, dict the path parameters of the object like objId and parentId)
+    """
+    arguments = signature(edit_method).bind(None, *args, **kwargs)
+    arguments.apply_defaults()
+    params = {
+        swagger_name: arguments.arguments[arg_name] for swagger_name, arg_name in edit_method.edit_param_names.items()
+    }
+    obj = params.pop("body")
+    params["objId"] = obj["id"] if isinstance(obj, dict) else obj.id
+    return obj, params
+
+
+def count_edit(client, sent: bool) -> None:
+    """Count an edit that was sent to the device, or skipped because nothing had changed"""
+    with _edit_counts_lock:
+        if sent:
+            client.edits_sent += 1
+        else:
+            client.edits_skipped += 1
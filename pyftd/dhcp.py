@@ -1,11 +1,14 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_put
+from typing import Iterator, Optional
 
 log = logging.getLogger(__name__)
 
 
 class FTDDHCP:
+    @list_operation("DHCPRelayService", "getDHCPRelayServiceList", obj_type="dhcprelayservice")
     @FTDAPIWrapper()
     def get_dhcp_relay_services(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         return (
@@ -14,9 +17,23 @@ class FTDDHCP:
             .items
         )
 
+    @api_operation("DHCPRelayService", "getDHCPRelayServiceList", pages=True, filter="filter")
+    def iter_dhcp_relay_services(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the DHCP relay services one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of DHCPRelayService objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("DHCPRelayService", "getDHCPRelayServiceList", page_size, filter=filter)
+
+    @api_operation("DHCPRelayService", "getDHCPRelayService", objId="dhcp_relay_svc_obj_id")
     def get_dhcp_relay_service(self, dhcp_relay_svc_obj_id) -> list:
         return self.swagger_client.DHCPRelayService.getDHCPRelayService(objId=dhcp_relay_svc_obj_id).result()
 
+    @cache_put
+    @edit_operation("DHCPRelayService", "editDHCPRelayService", body="dhcp_relay_svc_obj")
     def update_dhcp_relay_service(self, dhcp_relay_svc_obj) -> list:
         # dhcp_relay_svc_obj
         # {
@@ -0,0 +1,169 @@
+import logging
+from .snapshot import iter_snapshot
+from .snapshot_diff import digest, record_keys
+from hashlib import blake2b
+from typing import Iterable, Optional
+
+log = logging.getLogger(__name__)
+
+
+class FTDTypeDigest(object):
+    """
+    An order independent digest of all records of one type, like all network objects or all manual NAT rules of a
+    device, built like a small Merkle tree.
+
+    Every record is a leaf: the hash of its key (parent, name) and the hash of its content without the server managed
+    fields (see compare.normalize). The leaves are spread over bucket_count buckets by the hash of their key, so the
+    same object lands in the same bucket on every device. A bucket digest hashes the sorted leaves of the bucket and
+    the type digest hashes the count and the sorted bucket digests. Two devices with the same digest have the same
+    records. Where the digests differ, comparing the buckets narrows the difference down to a few buckets, and only
+    their leaves need to be compared (see compare_digests).
+    """
+
+    def __init__(self, obj_type: str, bucket_count: int = 256):
+        self.obj_type = obj_type
+        self.bucket_count = bucket_count
+        self.leaves = {}  # bucket: {key: hash of the key + hash of the content}
+        self.count = 0
+        self._digest = None
+        self._buckets = None
+
+    def __repr__(self):
+        return f"FTDTypeDigest(type={self.obj_type!r}, count={self.count}, digest={self.digest[:16]!r})"
+
+    def add(self, key: tuple, content_hash: bytes) -> None:
+        """
+        Add a leaf
+        :param key: tuple (parent, name, occurrence) of the record, see snapshot_diff.record_keys()
+        :param content_hash: bytes the hash of the normalized object, see snapshot_diff.digest()
+        """
+        key_hash = blake2b(repr(key).encode(), digest_size=16).digest()
+        bucket = int.from_bytes(key_hash[:4], "big") % self.bucket_count
+        self.leaves.setdefault(bucket, {})[key] = key_hash + content_hash
+        self.count += 1
+        self._digest = self._buckets = None
+
+    @property
+    def buckets(self) -> dict:
+        """dict bucket: str hex digest of the leaves in the bucket, for the buckets that have leaves"""
+        if self._buckets is None:
+            self._buckets = {
+                bucket: blake2b(b"".join(sorted(leaves.values())), digest_size=16).hexdigest()
+                for bucket, leaves in self.leaves.items()
+            }
+        return self._buckets
+
+    @property
+    def digest(self) -> str:
+        """str hex digest of all records of the type"""
+        if self._digest is None:
+            type_hash = blake2b(str(self.count).encode(), digest_size=16)
+            for bucket, bucket_digest in sorted(self.buckets.items()):
+                type_hash.update(f"{bucket}:{bucket_digest}".encode())
+            self._digest = type_hash.hexdigest()
+        return self._digest
+
+    def to_dict(self) -> dict:
+        """:return: dict the digest and the bucket digests, the part that is sent around first (without the leaves)"""
+        return {"type": self.obj_type, "count": self.count, "digest": self.digest, "buckets": self.buckets}
+
+
+def digest_records(records: Iterable[dict], bucket_count: int = 256, obj_types: Optional[Iterable[str]] = None) -> dict:
+    """
+    :param records: iterable of snapshot records, see FTDSnapshot.record() and iter_snapshot()
+    :param bucket_count: int the number of buckets per type
+    :param obj_types: iterable of str (Optional) only digest the records of these types
+    :return: dict type: FTDTypeDigest
+    """
+    obj_types = set(obj_types) if obj_types is not None else None
+    digests = {}
+    wanted = ((None, record) for record in records if obj_types is None or record["type"] in obj_types)
+    for (key, record), _ in record_keys(wanted):
+        type_digest = digests.get(record["type"])
+        if type_digest is None:
+            type_digest = digests[record["type"]] = FTDTypeDigest(record["type"], bucket_count)
+        type_digest.add(key[1:], digest(record["object"]))
+    return digests
+
+
+def snapshot_digests(path: str, bucket_count: int = 256, obj_types: Optional[Iterable[str]] = None) -> dict:
+    """
+    digest_records() of a snapshot file, so the digests of last night's backups can be compared with a live device
+    :param path: str the .jsonl.gz file
+    :return: dict type: FTDTypeDigest
+    """
+    return digest_records(iter_snapshot(path), bucket_count, obj_types)
+
+
+def compare_digests(reference: dict, other: dict) -> dict:
+    """
+    Find the records that differ between two sets of digests, like the ones of a template device and a branch. Types
+    with the same digest are skipped, then buckets with the same digest, and only the leaves of the remaining buckets
+    are compared.
+    :param reference: dict type: FTDTypeDigest
+    :param other: dict type: FTDTypeDigest, built with the same bucket_count
+    :return: dict type: sorted list of the keys (parent, name, occurrence) that are missing on one side or differ, for
+             the types that differ
+    """
+    drift = {}
+    for obj_type in sorted(set(reference) | set(other)):
+        reference_digest = reference.get(obj_type) or FTDTypeDigest(obj_type)
+        other_digest = other.get(obj_type) or FTDTypeDigest(obj_type)
+        if reference_digest.digest == other_digest.digest:
+            continue
+        if reference_digest.bucket_count != other_digest.bucket_count and reference_digest.count and other_digest.count:
+            raise ValueError(f"The digests of {obj_type} were built with a different number of buckets")
+        keys = set()
+        for bucket in set(reference_digest.buckets) | set(other_digest.buckets):
+            if reference_digest.buckets.get(bucket) == other_digest.buckets.get(bucket):
+                continue
+            reference_leaves = reference_digest.leaves.get(bucket, {})
+            other_leaves = other_digest.leaves.get(bucket, {})
+            keys.update(
+                key
+                for key in set(reference_leaves) | set(other_leaves)
+                if reference_leaves.get(key) != other_leaves.get(key)
+            )
+        drift[obj_type] = sorted(keys, key=repr)
+    return drift
+
+
+class FTDDigests:
+    """
+    Content digests of the configuration of a device for cheap drift detection, see FTDTypeDigest.
+
+    Sample usage:
+
+    template = template_client.type_digests(["networkobject", "manualnatrule"])
+    branch = branch_client.type_digests(["networkobject", "manualnatrule"])
+    for obj_type, keys in compare_digests(template, branch).items():
+        print(obj_type, [name for parent, name, _ in keys])
+
+    Across a fleet: fleet.run("type_digests", ["networkobject"]) and compare every result with the template.
+    """
+
+    def type_digests(
+        self, obj_types: Optional[Iterable[str]] = None, bucket_count: int = 256, page_size: int = 100
+    ) -> dict:
+        """
+        Read the records of the given types, every list at the same time like snapshot(), and digest them as they
+        arrive. Only the digests are kept in memory, not the records.
+        :param obj_types: iterable of str (Optional) record types like "networkobject", by default every type
+        :param bucket_count: int the number of buckets per type
+        :param page_size: int the number of records to request per page
+        :return: dict type: FTDTypeDigest
+        """
+        obj_types = list(obj_types) if obj_types is not None else None
+        errors = []
+
+        def records():
+            for item in self.stream_records(self.snapshot_sources(page_size, obj_types)):
+                if item[0] == "record":
+                    yield item[1]
+                else:
+                    errors.append(item[2])
+
+        digests = digest_records(records(), bucket_count, obj_types)
+        if errors:
+            raise errors[0]  # incomplete digests would report drift that is not there
+        return digests
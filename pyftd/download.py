@@ -1,5 +1,5 @@
 import logging
-from .base import FTDAPIWrapper
+from .base import FTDAPIWrapper, api_operation
 from typing import Optional
 
 log = logging.getLogger(__name__)
@@ -10,6 +10,7 @@ class FTDDownload:
     Download various files from the FTD Appliance
     """
 
+    @api_operation("Download", "getdownloaddiskfile", objId="file_name")
     @FTDAPIWrapper()
     def download_disk_file(self, file_name: str) -> dict:
         """
@@ -0,0 +1,204 @@
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from inspect import Parameter, signature
+from threading import Lock
+from time import monotonic
+from typing import Callable, Iterable, Iterator, Optional, Union
+
+log = logging.getLogger(__name__)
+
+
+class FTDFleetResult(object):
+    """
+    The outcome of running one operation on one device of a FTDFleet
+
+    result is what the operation returned, error is the exception it raised (a TimeoutError if the device did not
+    finish within the timeout) and elapsed the seconds it ran, including building the client the first time.
+    """
+
+    def __init__(self, device: dict, result=None, error: Optional[Exception] = None, elapsed: float = 0.0):
+        self.device = device
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return f"FTDFleetResult(ftd_ip={self.ftd_ip!r}, ok={self.ok}, elapsed={self.elapsed:.2f}, error={self.error!r})"
+
+    @property
+    def ftd_ip(self) -> str:
+        return self.device["ftd_ip"]
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class FTDFleet(object):
+    """
+    Run the same operation against many FTD devices at the same time.
+
+    The inventory is a list of dicts with the connection details of every device: ftd_ip, username, password and
+    optionally fdm_port, proxies and verify. Keys the client does not take, like a site or a tag, stay in the inventory
+    (and in the device of every FTDFleetResult) but are not passed to the client. The client of a device is built by
+    the worker that first runs an operation on it, so building hundreds of clients is spread over the workers too, and
+    is reused by later runs.
+
+    Operations run on at most max_workers devices at a time. A device that fails, or does not finish within timeout
+    seconds, is reported in its FTDFleetResult and does not affect the others. Results are yielded as soon as each
+    device finishes, not after the slowest one. A timed out operation cannot be interrupted. It keeps its worker until
+    its own requests time out (see the timeout of the clients), but its result is no longer waited for.
+
+    Sample usage:
+
+    inventory = [
+        {"ftd_ip": "192.168.100.100", "username": "admin", "password": "Admin123"},
+        {"ftd_ip": "192.168.100.101", "username": "admin", "password": "Admin123", "fdm_port": "8443"},
+    ]
+    fleet = FTDFleet(inventory, max_workers=50, timeout=120, verify=False, spec_cache=FTDSpecCache())
+    for fleet_result in fleet.run("get_system_information"):
+        print(fleet_result.ftd_ip, fleet_result.result if fleet_result.ok else fleet_result.error)
+    """
+
+    def __init__(
+        self,
+        inventory: Iterable[dict],
+        max_workers: int = 32,
+        timeout: Optional[float] = None,
+        client_class: Optional[type] = None,
+        **client_options,
+    ):
+        """
+        :param inventory: iterable of dicts with the ftd_ip, username and password (and optionally fdm_port, proxies
+                          and verify) of every device
+        :param max_workers: int the maximum number of devices we talk to at the same time
+        :param timeout: float (Optional) seconds each device gets to run an operation, by default it has no limit
+        :param client_class: (Optional) the client to build for every device, FTDClient by default
+        :param client_options: passed to every client, like verify=False, lazy=True or spec_cache=FTDSpecCache().
+                               Sharing one FTDSpecCache saves every device with the same software the spec download.
+        """
+        if client_class is None:
+            from . import FTDClient  # pyftd/__init__.py imports this module before FTDClient is defined
+
+            client_class = FTDClient
+        self.inventory = [dict(device) for device in inventory]
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.client_class = client_class
+        self.client_options = client_options
+        parameters = signature(client_class).parameters
+        if any(parameter.kind == Parameter.VAR_KEYWORD for parameter in parameters.values()):
+            self.client_parameters = None  # the client takes any keyword argument
+        else:
+            self.client_parameters = set(parameters)
+        self.clients = {}
+        self.client_locks = {FTDFleet.device_key(device): Lock() for device in self.inventory}
+
+    @staticmethod
+    def device_key(device: dict) -> str:
+        """:return: str the identity of a device in the inventory like "192.168.100.100:8443" """
+        return f"{device['ftd_ip']}:{device.get('fdm_port') or 443}"
+
+    def get_client(self, device: dict):
+        """
+        :param device: dict an entry of the inventory
+        :return: the client of the device, built on first use
+        """
+        key = FTDFleet.device_key(device)
+        with self.client_locks[key]:  # building the same client twice would log in twice
+            if key not in self.clients:
+                self.clients[key] = self.client_class(**self.client_arguments(device))
+            return self.clients[key]
+
+    def client_arguments(self, device: dict) -> dict:
+        """
+        :param device: dict an entry of the inventory
+        :return: dict the keyword arguments of the client of the device, without the keys the client does not take
+        """
+        arguments = dict(self.client_options, **device)
+        if self.client_parameters is None:
+            return arguments
+        return {name: value for name, value in arguments.items() if name in self.client_parameters}
+
+    def run(
+        self, operation: Union[str, Callable], *args, devices: Optional[Iterable[dict]] = None, **kwargs
+    ) -> Iterator[FTDFleetResult]:
+        """
+        Run an operation on every device and yield the results in the order the devices finish
+        :param operation: str the name of a client method like "get_system_information", or a callable that takes the
+                          client of a device as its first argument
+        :param args: passed to the operation
+        :param devices: iterable of dicts (Optional) run on these inventory entries only, like the failures of a run
+        :param kwargs: passed to the operation
+        :return: generator of FTDFleetResult
+        """
+        devices = self.inventory if devices is None else list(devices)
+        unknown = [
+            FTDFleet.device_key(device) for device in devices if FTDFleet.device_key(device) not in self.client_locks
+        ]
+        if unknown:
+            raise ValueError(f"{', '.join(unknown)} are not in the inventory of the fleet")
+        started = {}  # device key: when a worker picked it up, so time spent in the queue is not held against it
+
+        def run_on(device: dict):
+            started[FTDFleet.device_key(device)] = monotonic()
+            ftd_client = self.get_client(device)
+            if isinstance(operation, str):
+                return getattr(ftd_client, operation)(*args, **kwargs)
+            return operation(ftd_client, *args, **kwargs)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="pyftd-fleet")
+        devices_by_future = {executor.submit(run_on, device): device for device in devices}
+        pending = set(devices_by_future)
+        try:
+            while pending:
+                running = {future: started.get(FTDFleet.device_key(devices_by_future[future])) for future in pending}
+                done, pending = wait(pending, timeout=self.next_deadline(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    device = devices_by_future[future]
+                    elapsed = monotonic() - started.get(FTDFleet.device_key(device), monotonic())
+                    try:
+                        fleet_result = FTDFleetResult(device, future.result(), elapsed=elapsed)
+                    except Exception as ex:
+                        log.error(f"{FTDFleet.device_key(device)} failed: {ex!r}")
+                        fleet_result = FTDFleetResult(device, error=ex, elapsed=elapsed)
+                    yield fleet_result
+                for future in self.timed_out(running, pending):
+                    pending.discard(future)
+                    log.error(f"{FTDFleet.device_key(devices_by_future[future])} timed out after {self.timeout}s")
+                    yield FTDFleetResult(
+                        devices_by_future[future], error=TimeoutError(self.timeout), elapsed=self.timeout
+                    )
+        finally:
+            for future in pending:  # the caller stopped iterating early
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def next_deadline(self, running: dict) -> Optional[float]:
+        """
+        :param running: dict future: when its device was picked up by a worker, None if it is still queued
+        :return: float seconds until the next running device times out, None if there is no timeout
+        """
+        if self.timeout is None:
+            return None
+        started = [started_at for started_at in running.values() if started_at is not None]
+        if not started:
+            return self.timeout  # nothing has been picked up yet, check again after a while
+        return max(0.0, min(started) + self.timeout - monotonic())
+
+    def timed_out(self, running: dict, pending: set) -> list:
+        """:return: list of the pending futures that have been running for longer than the timeout"""
+        if self.timeout is None:
+            return []
+        now = monotonic()
+        return [
+            future for future in pending if running.get(future) is not None and now - running[future] >= self.timeout
+        ]
+
+    def close(self) -> None:
+        """Close the connection pools of all clients"""
+        for ftd_client in self.clients.values():
+            http_session = getattr(ftd_client, "http_session", None)
+            if http_session is not None:
+                http_session.close()
+        self.clients.clear()
@@ -1,6 +1,8 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterator, Optional
 
 log = logging.getLogger(__name__)
 
@@ -8,6 +10,7 @@ log = logging.getLogger(__name__)
 class FTDIdentityObjects:
     #####################
     #  Radius Object
+    @list_operation("RadiusIdentitySource", "getRadiusIdentitySourceList", obj_type="radiusidentitysource")
     @FTDAPIWrapper()
     def get_radius_identity_source_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -26,6 +29,18 @@ class FTDIdentityObjects:
             .items
         )
 
+    @api_operation("RadiusIdentitySource", "getRadiusIdentitySourceList", pages=True, filter="filter")
+    def iter_radius_identity_sources(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the radius servers one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of RadiusIdentitySource objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("RadiusIdentitySource", "getRadiusIdentitySourceList", page_size, filter=filter)
+
+    @api_operation("RadiusIdentitySource", "getRadiusIdentitySource", objId="radius_src_obj_id")
     @FTDAPIWrapper()
     def get_radius_identity_source(self, radius_src_obj_id: str) -> dict:
         """
@@ -33,6 +48,8 @@ class FTDIdentityObjects:
         """
         return self.swagger_client.RadiusIdentitySource.getRadiusIdentitySource(objId=radius_src_obj_id).result()
 
+    @cache_put
+    @api_operation("RadiusIdentitySource", "addRadiusIdentitySource", body="radius_obj")
     @FTDAPIWrapper()
     def create_radius_identity_source(self, radius_obj: dict) -> dict:
         """
@@ -56,6 +73,8 @@ class FTDIdentityObjects:
         """
         return self.swagger_client.RadiusIdentitySource.addRadiusIdentitySource(body=radius_obj).result()
 
+    @cache_put
+    @edit_operation("RadiusIdentitySource", "editRadiusIdentitySource", body="radius_obj")
     @FTDAPIWrapper()
     def edit_radius_identity_source(self, radius_obj: dict) -> dict:
         """
@@ -68,6 +87,8 @@ class FTDIdentityObjects:
             body=radius_obj, objId=radius_obj.id
         ).result()
 
+    @cache_evict("radius_src_obj_id")
+    @api_operation("RadiusIdentitySource", "deleteRadiusIdentitySource", objId="radius_src_obj_id")
     @FTDAPIWrapper()
     def delete_radius_identity_source(self, radius_src_obj_id: str) -> None:
         """
@@ -77,6 +98,9 @@ class FTDIdentityObjects:
 
     ######################
     #  Radius Group Object
+    @list_operation(
+        "RadiusIdentitySourceGroup", "getRadiusIdentitySourceGroupList", obj_type="radiusidentitysourcegroup"
+    )
     @FTDAPIWrapper()
     def get_radius_identity_source_group_list(
         self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None
@@ -96,6 +120,20 @@ class FTDIdentityObjects:
             .items
         )
 
+    @api_operation("RadiusIdentitySourceGroup", "getRadiusIdentitySourceGroupList", pages=True, filter="filter")
+    def iter_radius_identity_source_groups(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the radius server groups one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of RadiusIdentitySourceGroup objects
+        :rtype: Iterator
+        """
+        return self.iter_pages(
+            "RadiusIdentitySourceGroup", "getRadiusIdentitySourceGroupList", page_size, filter=filter
+        )
+
+    @api_operation("RadiusIdentitySourceGroup", "getRadiusIdentitySourceGroup", objId="radius_src_grp_id")
     @FTDAPIWrapper()
     def get_radius_identity_source_group(self, radius_src_grp_id: str) -> dict:
         """
@@ -105,6 +143,8 @@ class FTDIdentityObjects:
             objId=radius_src_grp_id
         ).result()
 
+    @cache_put
+    @api_operation("RadiusIdentitySourceGroup", "addRadiusIdentitySourceGroup", body="radius_group_obj")
     @FTDAPIWrapper()
     def create_radius_identity_source_group(self, radius_group_obj: dict) -> dict:
         """
@@ -128,6 +168,8 @@ class FTDIdentityObjects:
             body=radius_group_obj
         ).result()
 
+    @cache_put
+    @edit_operation("RadiusIdentitySourceGroup", "editRadiusIdentitySourceGroup", body="radius_group_obj")
     @FTDAPIWrapper()
     def edit_radius_identity_source_group(self, radius_group_obj: dict) -> dict:
         """
@@ -140,6 +182,8 @@ class FTDIdentityObjects:
             body=radius_group_obj, objId=radius_group_obj.id
         ).result()
 
+    @cache_evict("radius_src_grp_id")
+    @api_operation("RadiusIdentitySourceGroup", "deleteRadiusIdentitySourceGroup", objId="radius_src_grp_id")
     @FTDAPIWrapper()
     def delete_radius_identity_source_group(self, radius_src_grp_id: str) -> None:
         """
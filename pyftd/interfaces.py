@@ -1,6 +1,8 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterator, Optional
 
 log = logging.getLogger(__name__)
 
@@ -8,6 +10,7 @@ log = logging.getLogger(__name__)
 class FTDInterfaces:
     ################################
     # Physical Interface Objects
+    @list_operation("Interface", "getPhysicalInterfaceList", obj_type="physicalinterface")
     @FTDAPIWrapper()
     def get_physical_interface_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -24,12 +27,26 @@ class FTDInterfaces:
             .items
         )
 
+    @api_operation("Interface", "getPhysicalInterfaceList", pages=True, filter="filter")
+    def iter_physical_interfaces(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the physical interfaces one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of PhysicalInterface objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Interface", "getPhysicalInterfaceList", page_size, filter=filter)
+
+    @api_operation("Interface", "getPhysicalInterface", objId="physical_int_obj_id")
     def get_physical_interface(self, physical_int_obj_id):
         """
         Given a physical interface object ID, return the physical interface object
         """
         return self.swagger_client.Interface.getPhysicalInterface(objId=physical_int_obj_id).result()
 
+    @cache_put
+    @edit_operation("Interface", "editPhysicalInterface", body="physical_int_obj")
     def edit_physical_interface(self, physical_int_obj):
         """
         Edit the settings of an interface
@@ -65,6 +82,7 @@ class FTDInterfaces:
 
     ################################
     # Sub-Interface Objects
+    @list_operation("Interface", "getSubInterfaceList", parentId="parent_interface_id")
     @FTDAPIWrapper()
     def get_sub_interface_list(
         self, parent_interface_id: str, limit: int = 9999, offset: int = 0, filter: Optional[str] = None
@@ -85,6 +103,23 @@ class FTDInterfaces:
             .items
         )
 
+    @api_operation("Interface", "getSubInterfaceList", pages=True, parentId="parent_interface_id", filter="filter")
+    def iter_sub_interfaces(
+        self, parent_interface_id: str, page_size: int = 100, filter: Optional[str] = None
+    ) -> Iterator:
+        """
+        Yield the sub-interfaces of a physical interface one page at a time until the device has returned all of them
+        :param parent_interface_id: str the physical interface
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of SubInterface objects
+        :rtype: Iterator
+        """
+        return self.iter_pages(
+            "Interface", "getSubInterfaceList", page_size, parentId=parent_interface_id, filter=filter
+        )
+
+    @api_operation("Interface", "getSubInterface", parentId="parent_interface_id", objId="sub_interface_id")
     @FTDAPIWrapper()
     def get_sub_interface(self, parent_interface_id: str, sub_interface_id: str) -> dict:
         """Given a parentId (physical interface object id) and a sunb interface id, get this sub-interface configuration
@@ -95,6 +130,8 @@ class FTDInterfaces:
             parentId=parent_interface_id, objId=sub_interface_id
         ).result()
 
+    @cache_put
+    @api_operation("Interface", "addSubInterface", body="sub_int_obj", parentId="parent_interface_id")
     @FTDAPIWrapper()
     def create_sub_interface(self, parent_interface_id: str, sub_int_obj: dict) -> dict:
         """
@@ -129,12 +166,16 @@ class FTDInterfaces:
         """
         return self.swagger_client.Interface.addSubInterface(body=sub_int_obj, parentId=parent_interface_id).result()
 
+    @cache_put
+    @edit_operation("Interface", "editSubInterface", body="sub_int_obj", parentId="parent_interface_id")
     @FTDAPIWrapper()
     def update_sub_interface(self, parent_interface_id: str, sub_int_obj: dict) -> dict:
         return self.swagger_client.Interface.editSubInterface(
             parentId=parent_interface_id, body=sub_int_obj, objId=sub_int_obj.id
         ).result()
 
+    @cache_evict("sub_interface_id")
+    @api_operation("Interface", "deleteSubInterface", parentId="parent_interface_id", objId="sub_interface_id")
     @FTDAPIWrapper()
     def delete_sub_interface(self, parent_interface_id: str, sub_interface_id: str) -> None:
         """Given a parentId (physical interface object id) and a sub interface id, delete this sub-interface config"""
@@ -144,6 +185,7 @@ class FTDInterfaces:
 
     ################################
     # VLAN Interface Objects
+    @list_operation("Interface", "getVlanInterfaceList", obj_type="vlaninterface")
     @FTDAPIWrapper()
     def get_vlan_interface_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -158,6 +200,18 @@ class FTDInterfaces:
             self.swagger_client.Interface.getVlanInterfaceList(limit=limit, offset=offset, filter=filter).result().items
         )
 
+    @api_operation("Interface", "getVlanInterfaceList", pages=True, filter="filter")
+    def iter_vlan_interfaces(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the vlan interfaces one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of VlanInterface objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Interface", "getVlanInterfaceList", page_size, filter=filter)
+
+    @api_operation("Interface", "getVlanInterface", objId="vlan_interface_id")
     @FTDAPIWrapper()
     def get_vlan_interface(self, vlan_interface_id: str) -> list:
         """
@@ -165,10 +219,14 @@ class FTDInterfaces:
         """
         return self.swagger_client.Interface.getVlanInterface(objId=vlan_interface_id).result()
 
+    @cache_put
+    @edit_operation("Interface", "editVlanInterface", body="vlan_intf_obj")
     @FTDAPIWrapper()
     def update_vlan_interface(self, vlan_intf_obj: dict) -> dict:
         return self.swagger_client.Interface.editVlanInterface(body=vlan_intf_obj, objId=vlan_intf_obj.id).result()
 
+    @cache_evict("vlan_interface_id")
+    @api_operation("Interface", "deleteVlanInterface", objId="vlan_interface_id")
     @FTDAPIWrapper()
     def delete_vlan_interface(self, vlan_interface_id: str) -> list:
         """
@@ -176,6 +234,8 @@ class FTDInterfaces:
         """
         return self.swagger_client.Interface.deleteVlanInterface(objId=vlan_interface_id).result()
 
+    @cache_put
+    @api_operation("Interface", "addVlanInterface", body="vlan_intf_obj")
     @FTDAPIWrapper()
     def create_vlan_interface(self, vlan_intf_obj: dict) -> dict:
         """
@@ -210,9 +270,127 @@ class FTDInterfaces:
         """
         return self.swagger_client.Interface.addVlanInterface(body=vlan_intf_obj).result()
 
+    ################################
+    # EtherChannel Interface Objects
+    @list_operation("Interface", "getEtherChannelInterfaceList", obj_type="etherchannelinterface")
+    @FTDAPIWrapper()
+    def get_etherchannel_interface_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
+        """
+        Get a list of etherchannel interfaces
+        :param limit: limit the number of records returned
+        :param offset: starting index of records to return (for paging)
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: list of interface objects
+        :rtype: list
+        """
+        return (
+            self.swagger_client.Interface.getEtherChannelInterfaceList(limit=limit, offset=offset, filter=filter)
+            .result()
+            .items
+        )
+
+    @api_operation("Interface", "getEtherChannelInterfaceList", pages=True, filter="filter")
+    def iter_etherchannel_interfaces(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the etherchannel interfaces one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of EtherChannelInterface objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Interface", "getEtherChannelInterfaceList", page_size, filter=filter)
+
+    @list_operation("Interface", "getEtherChannelSubInterfaceList", parentId="parent_interface_id")
+    @FTDAPIWrapper()
+    def get_etherchannel_sub_interface_list(
+        self, parent_interface_id: str, limit: int = 9999, offset: int = 0, filter: Optional[str] = None
+    ) -> list:
+        """
+        Given a parentId (etherchannel interface object id), get all sub-interface configurations
+        :param parent_interface_id: str the etherchannel interface
+        :param limit: limit the number of records returned
+        :param offset: starting index of records to return (for paging)
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: list of all sub-interface details for a given etherchannel interface
+        :rtype: list
+        """
+        return (
+            self.swagger_client.Interface.getEtherChannelSubInterfaceList(
+                parentId=parent_interface_id, limit=limit, offset=offset, filter=filter
+            )
+            .result()
+            .items
+        )
+
+    @api_operation(
+        "Interface", "getEtherChannelSubInterfaceList", pages=True, parentId="parent_interface_id", filter="filter"
+    )
+    def iter_etherchannel_sub_interfaces(
+        self, parent_interface_id: str, page_size: int = 100, filter: Optional[str] = None
+    ) -> Iterator:
+        """
+        Yield the sub-interfaces of an etherchannel interface one page at a time until the device has returned all of
+        them
+        :param parent_interface_id: str the etherchannel interface
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of SubInterface objects
+        :rtype: Iterator
+        """
+        return self.iter_pages(
+            "Interface", "getEtherChannelSubInterfaceList", page_size, parentId=parent_interface_id, filter=filter
+        )
+
+    ################################
+    # Interface Index
+    def resolve_interface(self, name: str):
+        """
+        Find a physical, etherchannel, VLAN or sub-interface by its nameif (like "inside") or its hardwareName (like
+        "GigabitEthernet0/1"). The first call loads every interface of the device, later calls are served from memory.
+        Call refresh_interface_index() after interfaces were added, renamed or removed.
+        :param name: str the nameif or the hardwareName of the interface
+        :return: the interface object or None if there is no such interface
+        """
+        if not self.interface_index.loaded:
+            with self.interface_index.lock:
+                if not self.interface_index.loaded:  # another thread may have loaded it while we waited
+                    self.refresh_interface_index()
+        return self.interface_index.get(name)
+
+    def refresh_interface_index(self) -> list:
+        """
+        (Re)load the interface index used by resolve_interface(). The physical, etherchannel and VLAN interfaces are
+        listed at the same time, then the sub-interfaces of all physical and etherchannel interfaces at the same time.
+        :return: list of all interfaces of the device
+        """
+        list_methods = [self.get_physical_interface_list, self.get_vlan_interface_list]
+        if hasattr(self.swagger_client.Interface, "getEtherChannelInterfaceList"):  # not on every platform/version
+            list_methods.append(self.get_etherchannel_interface_list)
+        interface_lists = self.gather(
+            *[lambda list_method=list_method: self.get_list_parallel(list_method) for list_method in list_methods]
+        )
+        parents = [(self.get_sub_interface_list, interface.id) for interface in interface_lists[0]]
+        if hasattr(self.swagger_client.Interface, "getEtherChannelSubInterfaceList"):
+            etherchannel_interfaces = interface_lists[2] if len(interface_lists) > 2 else []
+            parents += [
+                (self.get_etherchannel_sub_interface_list, interface.id) for interface in etherchannel_interfaces
+            ]
+        interface_lists.extend(
+            self.gather(
+                *[
+                    lambda list_method=list_method, parent_id=parent_id: self.get_list_parallel(list_method, parent_id)
+                    for list_method, parent_id in parents
+                ]
+            )
+        )
+        interfaces = [interface for interface_list in interface_lists for interface in interface_list]
+        self.interface_index.load(interfaces)
+        return interfaces
+
     ################################
     # All Interface Objects (Read Only Calls!)
 
+    @list_operation("Interface", "getInterfaceDataList")
     @FTDAPIWrapper()
     def get_interface_operational_status_list(
         self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None
@@ -229,6 +407,18 @@ class FTDInterfaces:
             self.swagger_client.Interface.getInterfaceDataList(limit=limit, offset=offset, filter=filter).result().items
         )
 
+    @api_operation("Interface", "getInterfaceDataList", pages=True, filter="filter")
+    def iter_interface_operational_status(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the operational status of every interface one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of InterfaceData objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Interface", "getInterfaceDataList", page_size, filter=filter)
+
+    @api_operation("Interface", "getInterfaceData", objId="interface_id")
     @FTDAPIWrapper()
     def get_interface_operational_status(self, interface_id: str) -> dict:
         """
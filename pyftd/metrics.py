@@ -0,0 +1,190 @@
+import logging
+from bisect import bisect_left
+from threading import Lock, local
+from time import perf_counter
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# The calls that are being measured on this thread, outermost first. Wrapped methods may call other wrapped methods,
+# and every request is accounted to all of the calls that are in progress on its thread. Worker threads that send
+# requests for a call, like those of gather() and the pagers, take over the calls of the thread that started them
+# (see FTDAPIWrapper.carry).
+_active = local()
+
+
+def active_call_records() -> list:
+    """:return: list of the FTDCallRecord objects in progress on this thread"""
+    return getattr(_active, "records", [])
+
+
+def use_call_records(call_records: list) -> list:
+    """
+    Make call_records the calls in progress on this thread
+    :param call_records: list of FTDCallRecord objects, outermost first
+    :return: list the calls that were in progress before, to restore them afterwards
+    """
+    previous = active_call_records()
+    _active.records = call_records
+    return previous
+
+
+class FTDCallRecord(object):
+    """
+    The measurements of a single call to a client method
+
+    network_time is the time spent sending requests and reading responses, summed over the requests, which overlap when
+    the call sends them in parallel. backoff_time is the time spent waiting between retries (see FTDRetryPolicy).
+    unmarshal_time is everything else: building the request, unmarshalling the response into swagger model objects and
+    our own bookkeeping.
+    """
+
+    def __init__(self, method: str):
+        self.method = method
+        self.operations = []  # swagger operation ids, in the order they were sent
+        self.started = perf_counter()
+        self.wall_time = 0.0
+        self.network_time = 0.0
+        self.backoff_time = 0.0
+        self.response_bytes = 0
+        self.requests = 0
+        self.retries = 0
+        self.exception = None  # class name of the exception the call raised, if any
+        self.lock = Lock()  # the worker threads of the call add their requests at the same time
+
+    @property
+    def unmarshal_time(self) -> float:
+        return max(0.0, self.wall_time - self.network_time - self.backoff_time)
+
+    @property
+    def operation(self) -> str:
+        return self.operations[-1] if self.operations else ""
+
+    def add_request(self, network_time: float, response_bytes: int) -> None:
+        with self.lock:
+            self.requests += 1
+            self.network_time += network_time
+            self.response_bytes += response_bytes
+
+    def add_backoff(self, backoff_time: float) -> None:
+        with self.lock:
+            self.backoff_time += backoff_time
+
+
+class FTDMetrics(object):
+    """
+    Collects a FTDCallRecord for every call that goes through FTDAPIWrapper and keeps in-process histograms of them.
+
+    Pass an instance to the client to turn measuring on. Subclass it and override record() to ship the call records
+    somewhere else, like statsd or a log file.
+
+    Sample usage:
+
+    metrics = FTDMetrics()
+    ftd_client = FTDClient("192.168.100.100", "admin", "Admin123", verify=False, metrics=metrics)
+    ftd_client.get_network_object_list()
+    print(metrics.export_prometheus())
+    """
+
+    DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+    def __init__(self):
+        self.lock = Lock()
+        self.series = {}  # (method, operation): aggregated measurements
+        self.errors = {}  # (method, exception class name): count
+
+    def start(self, method: str) -> FTDCallRecord:
+        """Start measuring a call on this thread"""
+        call_record = FTDCallRecord(method)
+        if not hasattr(_active, "records"):
+            _active.records = []
+        _active.records.append(call_record)
+        return call_record
+
+    def finish(self, call_record: FTDCallRecord, exception: Optional[Exception] = None) -> None:
+        """Stop measuring a call and hand it to record()"""
+        call_record.wall_time = perf_counter() - call_record.started
+        call_record.exception = type(exception).__name__ if exception is not None else None
+        records = active_call_records()
+        if records and records[-1] is call_record:
+            records.pop()
+        try:
+            self.record(call_record)
+        except Exception as ex:  # measuring must never break the call that was measured
+            logger.warning(f"Unable to record metrics for {call_record.method}: {ex}")
+
+    def record(self, call_record: FTDCallRecord) -> None:
+        """Add a finished call to the histograms"""
+        key = (call_record.method, call_record.operation)
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = {
+                    "count": 0,
+                    "wall_time": 0.0,
+                    "network_time": 0.0,
+                    "backoff_time": 0.0,
+                    "unmarshal_time": 0.0,
+                    "response_bytes": 0,
+                    "requests": 0,
+                    "retries": 0,
+                    "buckets": [0] * (len(self.DURATION_BUCKETS) + 1),
+                }
+            series["count"] += 1
+            series["wall_time"] += call_record.wall_time
+            series["network_time"] += call_record.network_time
+            series["backoff_time"] += call_record.backoff_time
+            series["unmarshal_time"] += call_record.unmarshal_time
+            series["response_bytes"] += call_record.response_bytes
+            series["requests"] += call_record.requests
+            series["retries"] += call_record.retries
+            series["buckets"][bisect_left(self.DURATION_BUCKETS, call_record.wall_time)] += 1
+            if call_record.exception is not None:
+                error_key = (call_record.method, call_record.exception)
+                self.errors[error_key] = self.errors.get(error_key, 0) + 1
+
+    def summary(self) -> list:
+        """
+        :return: list of dicts, one per method and swagger operation, slowest total wall time first
+        """
+        with self.lock:
+            rows = [
+                dict(method=method, operation=operation, **{k: v for k, v in series.items() if k != "buckets"})
+                for (method, operation), series in self.series.items()
+            ]
+        return sorted(rows, key=lambda row: row["wall_time"], reverse=True)
+
+    def export_prometheus(self) -> str:
+        """:return: str the histograms and counters in the Prometheus text exposition format"""
+        lines = [
+            "# HELP pyftd_call_duration_seconds Wall time of pyftd client calls",
+            "# TYPE pyftd_call_duration_seconds histogram",
+        ]
+        counters = {
+            "pyftd_call_network_seconds_total": "network_time",
+            "pyftd_call_backoff_seconds_total": "backoff_time",
+            "pyftd_call_unmarshal_seconds_total": "unmarshal_time",
+            "pyftd_call_response_bytes_total": "response_bytes",
+            "pyftd_call_requests_total": "requests",
+            "pyftd_call_retries_total": "retries",
+        }
+        with self.lock:
+            series_items = sorted(self.series.items())
+            error_items = sorted(self.errors.items())
+        for (method, operation), series in series_items:
+            labels = f'method="{method}",operation="{operation}"'
+            cumulative = 0
+            for bound, count in zip(self.DURATION_BUCKETS, series["buckets"]):
+                cumulative += count
+                lines.append(f'pyftd_call_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'pyftd_call_duration_seconds_bucket{{{labels},le="+Inf"}} {series["count"]}')
+            lines.append(f"pyftd_call_duration_seconds_sum{{{labels}}} {series['wall_time']}")
+            lines.append(f"pyftd_call_duration_seconds_count{{{labels}}} {series['count']}")
+        for name, field in counters.items():
+            lines.append(f"# TYPE {name} counter")
+            for (method, operation), series in series_items:
+                lines.append(f'{name}{{method="{method}",operation="{operation}"}} {series[field]}')
+        lines.append("# TYPE pyftd_call_errors_total counter")
+        for (method, exception), count in error_items:
+            lines.append(f'pyftd_call_errors_total{{method="{method}",exception="{exception}"}} {count}')
+        return "\n".join(lines) + "\n"
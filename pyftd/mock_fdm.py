@@ -0,0 +1,735 @@
+import json
+import logging
+import re
+import ssl
+import subprocess
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import path
+from secrets import token_hex
+from shutil import which
+from tempfile import TemporaryDirectory
+from threading import Lock, Thread
+from time import monotonic, sleep
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+from uuid import uuid4
+
+log = logging.getLogger(__name__)
+
+# The collections the mock serves: swagger resource, model, path (below /api/fdm/<version>), object type. Every
+# collection gets the list, get, add, edit and delete operations of its model, like getNetworkObjectList. The objects of
+# a path with a {parentId} belong to an object of another collection, like the NAT rules of a NAT container.
+MOCK_COLLECTIONS = (
+    ("NetworkObject", "NetworkObject", "/object/networks", "networkobject"),
+    ("NetworkObject", "NetworkObjectGroup", "/object/networkgroups", "networkobjectgroup"),
+    ("PortObject", "TCPPortObject", "/object/tcpports", "tcpportobject"),
+    ("PortObject", "UDPPortObject", "/object/udpports", "udpportobject"),
+    ("PortObject", "ICMPv4PortObject", "/object/icmpv4ports", "icmpv4portobject"),
+    ("PortObject", "PortObjectGroup", "/object/portgroups", "portobjectgroup"),
+    ("URLObject", "URLObject", "/object/urls", "urlobject"),
+    ("URLObject", "URLObjectGroup", "/object/urlgroups", "urlobjectgroup"),
+    ("Secret", "Secret", "/object/secrets", "secret"),
+    ("SyslogServer", "SyslogServer", "/object/syslogalerts", "syslogserver"),
+    ("DNS", "DNSServerGroup", "/object/dnsservergroups", "dnsservergroup"),
+    ("RadiusIdentitySource", "RadiusIdentitySource", "/object/radiusidentitysources", "radiusidentitysource"),
+    (
+        "RadiusIdentitySourceGroup",
+        "RadiusIdentitySourceGroup",
+        "/object/radiusidentitysourcegroups",
+        "radiusidentitysourcegroup",
+    ),
+    ("SLAMonitor", "SLAMonitor", "/object/slamonitors", "slamonitor"),
+    ("Certificate", "InternalCertificate", "/object/internalcertificates", "internalcertificate"),
+    ("Certificate", "InternalCACertificate", "/object/internalcacertificates", "internalcacertificate"),
+    ("Certificate", "ExternalCertificate", "/object/externalcertificates", "externalcertificate"),
+    ("Certificate", "ExternalCACertificate", "/object/externalcacertificates", "externalcacertificate"),
+    ("Interface", "PhysicalInterface", "/devices/default/interfaces", "physicalinterface"),
+    ("Interface", "SubInterface", "/devices/default/interfaces/{parentId}/subinterfaces", "subinterface"),
+    ("Interface", "VlanInterface", "/devices/default/vlaninterfaces", "vlaninterface"),
+    ("Interface", "EtherChannelInterface", "/devices/default/etherchannelinterfaces", "etherchannelinterface"),
+    (
+        "Interface",
+        "EtherChannelSubInterface",
+        "/devices/default/etherchannelinterfaces/{parentId}/subinterfaces",
+        "subinterface",
+    ),
+    ("Interface", "InterfaceData", "/operational/interfaces", "interfacedata"),
+    ("NAT", "ObjectNatRuleContainer", "/policy/objectnatpolicies", "objectnatrulecontainer"),
+    ("NAT", "ObjectNatRule", "/policy/objectnatpolicies/{parentId}/objectnatrules", "objectnatrule"),
+    ("NAT", "ManualNatRuleContainer", "/policy/manualnatpolicies", "manualnatrulecontainer"),
+    ("NAT", "ManualNatRule", "/policy/manualnatpolicies/{parentId}/manualnatrules", "manualnatrule"),
+    ("Routing", "VirtualRouter", "/devices/default/routing/virtualrouters", "virtualrouter"),
+    (
+        "Routing",
+        "StaticRouteEntry",
+        "/devices/default/routing/virtualrouters/{parentId}/staticrouteentries",
+        "staticrouteentry",
+    ),
+    ("NTP", "NTP", "/devicesettings/default/ntp", "ntp"),
+    ("DeviceHostname", "DeviceHostname", "/devicesettings/default/devicehostnames", "devicehostname"),
+    ("DNS", "DeviceDNSSettings", "/devicesettings/default/mgmtdnssettings", "devicednssettings"),
+    ("DNS", "DataDNSSettings", "/devicesettings/default/datadnssettings", "datadnssettings"),
+    ("DeviceLogSettings", "DeviceLogSettings", "/syslog/devicelogsettings", "devicelogsettings"),
+    ("DHCPRelayService", "DHCPRelayService", "/devicesettings/default/dhcprelayservices", "dhcprelayservice"),
+    ("AAASetting", "AAASetting", "/devicesettings/default/aaasettings", "aaasetting"),
+)
+
+# The add and edit operations of these models take the position of the rule or route in the query parameter "at"
+MOCK_ORDERED = ("ObjectNatRule", "ManualNatRule", "StaticRouteEntry")
+
+# What a freshly installed device has, by model: the global VRF, the NAT containers and the platform settings
+MOCK_DEFAULTS = {
+    "VirtualRouter": [{"id": "default", "name": "Global"}],
+    "ObjectNatRuleContainer": [{"name": "NGFW-Object-NAT-Policy"}],
+    "ManualNatRuleContainer": [{"name": "NGFW-After-Auto-NAT-Policy"}, {"name": "NGFW-Before-Auto-NAT-Policy"}],
+    "NTP": [{"name": None, "enabled": True, "ntpServers": ["0.sourcefire.pool.ntp.org"]}],
+    "DeviceHostname": [{"name": None, "hostname": "firepower"}],
+    "DeviceDNSSettings": [{"name": None}],
+    "DataDNSSettings": [{"name": None}],
+}
+
+
+class FTDMockCollection(object):
+    """
+    The objects of one collection (and one parent), in the order they were added. Names are unique within a collection
+    like they are on a device. The list of the objects is built once after a change and then shared by every page
+    request, so paging through tens of thousands of objects does not copy them for every page.
+    """
+
+    def __init__(self):
+        self.objects = {}  # id: object
+        self.names = {}  # name: id
+        self._values = None
+
+    def values(self) -> list:
+        """:return: list of the objects in the order they were added"""
+        if self._values is None:
+            self._values = list(self.objects.values())
+        return self._values
+
+    def put(self, obj: dict) -> None:
+        """Add or replace an object"""
+        previous = self.objects.get(obj["id"])
+        if previous is not None and previous.get("name") is not None:
+            self.names.pop(previous["name"], None)
+        self.objects[obj["id"]] = obj
+        if obj.get("name") is not None:
+            self.names[obj["name"]] = obj["id"]
+        self._values = None
+
+    def remove(self, obj_id: str) -> Optional[dict]:
+        """:return: dict the removed object or None if there is no object with this id"""
+        obj = self.objects.pop(obj_id, None)
+        if obj is not None and obj.get("name") is not None:
+            self.names.pop(obj["name"], None)
+        self._values = None
+        return obj
+
+
+class FTDMockServer(object):
+    """
+    A local stand-in for the FDM REST API of an FTD, for tests and benchmarks that cannot reach a device.
+
+    It serves a generated ngfw.json swagger spec, /api/versions and /fdm/token, the system information of the device
+    and in-memory CRUD with paging and filters for the collections in MOCK_COLLECTIONS, over HTTPS with a self-signed
+    certificate. Unless a certfile is given, the certificate is generated with the openssl command line tool, which
+    then has to be on the PATH. The objects are kept in memory per collection, so tens of thousands of objects are
+    listed and paged like on a device.
+
+    Faults are injected with latency (seconds added to every request), fail_next() (the next requests fail with a
+    status like 423 Locked) and expire_tokens() (every issued token becomes invalid, the next call gets a 401 and has to
+    log in again). stats() counts the requests per operation and per status.
+
+    Sample usage:
+
+    with FTDMockServer(latency=0.005) as mock_fdm:
+        mock_fdm.seed("NetworkObject", 10000)
+        ftd_client = FTDClient("127.0.0.1", "admin", "Admin123", verify=False, fdm_port=mock_fdm.port)
+        net_objs = ftd_client.get_list_parallel(ftd_client.get_network_object_list)
+        print(len(net_objs), mock_fdm.stats())
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        username: str = "admin",
+        password: str = "Admin123",
+        latency: float = 0.0,
+        token_lifetime: int = 1800,
+        api_versions: tuple = ("v5", "v6", "latest"),
+        software_version: str = "7.0.1-84",
+        bulk: bool = True,
+        certfile: Optional[str] = None,
+    ):
+        """
+        :param host: str the address to listen on
+        :param port: int the port to listen on, 0 picks a free port (see the port attribute)
+        :param username: str the user that may log in
+        :param password: str the password of the user
+        :param latency: float seconds every request takes, on top of the time it takes to serve it
+        :param token_lifetime: int seconds an access token is valid, sent to the client as expires_in
+        :param api_versions: tuple the supportedVersions of /api/versions
+        :param software_version: str the softwareVersion of the system information
+        :param bulk: bool declare the bulk query parameter on the add, edit and delete operations (FDM API v6)
+        :param certfile: str (Optional) a PEM file with the certificate and the private key of the server, by default
+                         start() generates a self-signed certificate with the openssl command line tool
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.token_lifetime = token_lifetime
+        self.api_versions = list(api_versions)
+        self.software_version = software_version
+        self.bulk = bulk
+        self.certfile = certfile
+        self.cert_dir = None  # TemporaryDirectory of the generated certificate
+        self.collections = {}  # (model, parent id): FTDMockCollection
+        self.tokens = {}  # access token: monotonic time it expires
+        self.refresh_tokens = set()
+        self.faults = []  # the statuses the next requests fail with
+        self.operations = Counter()
+        self.statuses = Counter()
+        self.lock = Lock()
+        self.routes = []  # (collection path regex, object path regex, model, object type)
+        self.models = {}  # model: (resource, path, object type)
+        for resource, model, collection_path, obj_type in MOCK_COLLECTIONS:
+            pattern = "^/api/fdm/[^/]+" + collection_path.replace("{parentId}", "(?P<parentId>[^/]+)")
+            self.routes.append((re.compile(pattern + "$"), re.compile(pattern + "/(?P<objId>[^/]+)$"), model, obj_type))
+            self.models[model] = (resource, collection_path, obj_type)
+        self.spec = json.dumps(self.swagger_spec()).encode()
+        self.http_server = None
+        self.thread = None
+        for model, objs in MOCK_DEFAULTS.items():
+            for obj in objs:
+                self.add(model, obj)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """
+        Listen on host and port and serve requests on a background thread
+        :return: FTDMockServer self, with the port it listens on
+        """
+        self.http_server = ThreadingHTTPServer((self.host, self.port), FTDMockHandler)
+        self.http_server.daemon_threads = True
+        self.http_server.mock = self
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        ssl_context.load_cert_chain(self.certfile or self.generate_cert())
+        # The handshake runs on the thread of the connection instead of holding up the accept loop
+        self.http_server.socket = ssl_context.wrap_socket(
+            self.http_server.socket, server_side=True, do_handshake_on_connect=False
+        )
+        self.port = self.http_server.server_address[1]
+        self.thread = Thread(target=self.http_server.serve_forever, name="pyftd-mock-fdm", daemon=True)
+        self.thread.start()
+        log.info(f"Mock FDM API listening on https://{self.host}:{self.port}")
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the listening socket"""
+        if self.http_server is not None:
+            self.http_server.shutdown()
+            self.http_server.server_close()
+            self.http_server = None
+        if self.cert_dir is not None:
+            self.cert_dir.cleanup()
+            self.cert_dir = None
+
+    def generate_cert(self) -> str:
+        """
+        Generate a self-signed certificate for the host in a temporary directory, removed again by stop()
+        :return: str the PEM file with the certificate and the private key
+        """
+        if which("openssl") is None:
+            raise RuntimeError("The mock FDM generates its certificate with openssl, install it or pass a certfile")
+        self.cert_dir = TemporaryDirectory(prefix="pyftd-mock-fdm-")
+        certfile = path.join(self.cert_dir.name, "mock_fdm.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-sha256", "-days", "1"]
+            + ["-subj", f"/CN={self.host}", "-keyout", certfile, "-out", certfile],
+            check=True,
+            capture_output=True,
+        )
+        return certfile
+
+    def swagger_spec(self) -> dict:
+        """:return: dict the ngfw.json swagger spec of the collections in MOCK_COLLECTIONS"""
+        error = {"default": {"description": "Error", "schema": {"$ref": "#/definitions/ErrorWrapper"}}}
+        obj_id = {"name": "objId", "in": "path", "required": True, "type": "string"}
+        parent_id = {"name": "parentId", "in": "path", "required": True, "type": "string"}
+        bulk = [{"name": "bulk", "in": "query", "required": False, "type": "boolean"}] if self.bulk else []
+        at = {"name": "at", "in": "query", "required": False, "type": "integer"}
+        paths = {
+            "/operational/systeminfo/{objId}": {
+                "get": {
+                    "tags": ["SystemInformation"],
+                    "operationId": "getSystemInformation",
+                    "parameters": [obj_id],
+                    "responses": dict(error, **{"200": {"description": "OK", "schema": {"type": "object"}}}),
+                }
+            }
+        }
+        definitions = {
+            "Paging": {
+                "type": "object",
+                "properties": {
+                    "prev": {"type": "array", "items": {"type": "string"}},
+                    "next": {"type": "array", "items": {"type": "string"}},
+                    "limit": {"type": "integer"},
+                    "offset": {"type": "integer"},
+                    "count": {"type": "integer"},
+                },
+            },
+            "ErrorWrapper": {"type": "object", "properties": {"error": {"$ref": "#/definitions/Error"}}},
+            "Error": {
+                "type": "object",
+                "properties": {
+                    "severity": {"type": "string"},
+                    "key": {"type": "string"},
+                    "messages": {"type": "array", "items": {"$ref": "#/definitions/ErrorMessage"}},
+                },
+            },
+            "ErrorMessage": {
+                "type": "object",
+                "properties": {
+                    "description": {"type": "string"},
+                    "code": {"type": "string"},
+                    "location": {"type": "string"},
+                },
+            },
+        }
+        for resource, model, collection_path, obj_type in MOCK_COLLECTIONS:
+            parents = [parent_id] if "{parentId}" in collection_path else []
+            extra = [at] if model in MOCK_ORDERED else []
+            body = {"name": "body", "in": "body", "required": True, "schema": {"$ref": f"#/definitions/{model}"}}
+            result = dict(error, **{"200": {"description": "OK", "schema": {"$ref": f"#/definitions/{model}"}}})
+            paths[collection_path] = {
+                "get": {
+                    "tags": [resource],
+                    "operationId": f"get{model}List",
+                    "parameters": parents
+                    + [
+                        {"name": "offset", "in": "query", "required": False, "type": "integer"},
+                        {"name": "limit", "in": "query", "required": False, "type": "integer"},
+                        {"name": "filter", "in": "query", "required": False, "type": "string"},
+                    ],
+                    "responses": dict(
+                        error, **{"200": {"description": "OK", "schema": {"$ref": f"#/definitions/{model}List"}}}
+                    ),
+                },
+                "post": {
+                    "tags": [resource],
+                    "operationId": f"add{model}",
+                    "parameters": parents + [body] + extra + bulk,
+                    "responses": result,
+                },
+            }
+            paths[collection_path + "/{objId}"] = {
+                "get": {
+                    "tags": [resource],
+                    "operationId": f"get{model}",
+                    "parameters": parents + [obj_id],
+                    "responses": result,
+                },
+                "put": {
+                    "tags": [resource],
+                    "operationId": f"edit{model}",
+                    "parameters": parents + [obj_id, body] + extra + bulk,
+                    "responses": result,
+                },
+                "delete": {
+                    "tags": [resource],
+                    "operationId": f"delete{model}",
+                    "parameters": parents + [obj_id] + bulk,
+                    "responses": dict(error, **{"204": {"description": "No Content"}}),
+                },
+            }
+            definitions[model] = {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string", "x-nullable": True},
+                    "version": {"type": "string", "x-nullable": True},
+                    "name": {"type": "string", "x-nullable": True},
+                    "type": {"type": "string", "x-nullable": True},
+                },
+            }
+            definitions[model + "List"] = {
+                "type": "object",
+                "properties": {
+                    "items": {"type": "array", "items": {"$ref": f"#/definitions/{model}"}},
+                    "paging": {"$ref": "#/definitions/Paging"},
+                },
+            }
+        return {
+            "swagger": "2.0",
+            "info": {"title": "Mock FDM API", "version": self.api_versions[-1]},
+            "basePath": "/api/fdm/latest",
+            "schemes": ["https"],
+            "consumes": ["application/json"],
+            "produces": ["application/json"],
+            "paths": paths,
+            "definitions": definitions,
+        }
+
+    def collection(self, model: str, parent_id: Optional[str] = None) -> FTDMockCollection:
+        """:return: FTDMockCollection the objects of the model (that belong to parent_id)"""
+        key = (model, parent_id)
+        if key not in self.collections:
+            self.collections[key] = FTDMockCollection()
+        return self.collections[key]
+
+    def add(self, model: str, obj: dict, parent_id: Optional[str] = None) -> dict:
+        """
+        Add an object without going through the API, like the configuration a test expects on the device
+        :param model: str the model of the collection like "NetworkObject", see MOCK_COLLECTIONS
+        :param obj: dict the object, the id, version and type are filled in where missing
+        :param parent_id: str (Optional) the id of the parent, like the NAT container of a NAT rule
+        :return: dict the stored object
+        """
+        obj = dict(obj, version=token_hex(6))
+        obj.setdefault("id", str(uuid4()))
+        obj.setdefault("type", self.models[model][2])
+        with self.lock:
+            self.collection(model, parent_id).put(obj)
+        return obj
+
+    def seed(
+        self, model: str, count: int, parent_id: Optional[str] = None, make: Optional[Callable[[int], dict]] = None
+    ) -> None:
+        """
+        Add count objects to a collection
+        :param model: str the model of the collection like "NetworkObject", see MOCK_COLLECTIONS
+        :param count: int the number of objects to add
+        :param parent_id: str (Optional) the id of the parent, like the NAT container of a NAT rule
+        :param make: (Optional) callable that returns the i-th object, by default {"name": "<type>-<i>"}
+        """
+        obj_type = self.models[model][2]
+        make = make or (lambda i: {"name": f"{obj_type}-{i}"})
+        with self.lock:
+            collection = self.collection(model, parent_id)
+            start = len(collection.objects)
+            for i in range(start, start + count):
+                obj = dict(make(i), id=str(uuid4()), version=token_hex(6))
+                obj.setdefault("type", obj_type)
+                collection.put(obj)
+
+    def objects(self, model: str, parent_id: Optional[str] = None) -> list:
+        """:return: list of the objects of a collection, in the order they were added"""
+        with self.lock:
+            return list(self.collection(model, parent_id).values())
+
+    def fail_next(self, status: int, count: int = 1) -> None:
+        """
+        Fail the next API calls with an error status, like 423 for a database locked by an SRU update, 503 for an API
+        that is not up yet or 401 for a token the device no longer accepts. Token, version and spec requests do not fail.
+        :param status: int the HTTP status to answer with
+        :param count: int the number of calls to fail
+        """
+        with self.lock:
+            self.faults.extend([status] * count)
+
+    def expire_tokens(self) -> None:
+        """Invalidate every access token issued so far, like a device that restarted its API"""
+        with self.lock:
+            self.tokens.clear()
+
+    def stats(self) -> dict:
+        """:return: dict {"requests": total, "operations": {operation: count}, "statuses": {status: count}}"""
+        with self.lock:
+            return {
+                "requests": sum(self.operations.values()),
+                "operations": dict(self.operations),
+                "statuses": dict(self.statuses),
+            }
+
+    def reset_stats(self) -> None:
+        """Start counting requests from zero"""
+        with self.lock:
+            self.operations.clear()
+            self.statuses.clear()
+
+    def handle(self, method: str, url: str, headers: dict, body) -> tuple:
+        """
+        Serve one request
+        :param method: str the HTTP method
+        :param url: str the path and query of the request
+        :param headers: the request headers
+        :param body: the parsed json body or None
+        :return: tuple (status, json serializable response body or None)
+        """
+        if self.latency:
+            sleep(self.latency)
+        request_url = urlparse(url)
+        query = {key: values[-1] for key, values in parse_qs(request_url.query).items()}
+        status, response = self.route(method, request_url.path, query, headers, body)
+        with self.lock:
+            self.statuses[status] += 1
+        return status, response
+
+    def count(self, operation: str) -> None:
+        with self.lock:
+            self.operations[operation] += 1
+
+    def route(self, method: str, url_path: str, query: dict, headers: dict, body) -> tuple:
+        """:return: tuple (status, response body), see handle()"""
+        if url_path == "/api/versions":
+            self.count("getVersions")
+            return 200, {"supportedVersions": self.api_versions}
+        if url_path == "/apispec/ngfw.json":
+            self.count("getSpec")
+            return 200, self.spec
+        if url_path.endswith("/fdm/token") and method == "POST":
+            self.count("token")
+            return self.token(body or {})
+
+        authorization = (headers.get("Authorization") or "").split(" ")[-1]
+        with self.lock:
+            expires_at = self.tokens.get(authorization)
+            fault = self.faults.pop(0) if self.faults and expires_at is not None else None
+        if expires_at is None or expires_at < monotonic():
+            self.count("unauthorized")
+            return 401, FTDMockServer.error("Unauthorized", "Access token invalid or expired", "invalidToken")
+        if fault is not None:
+            self.count(f"fault{fault}")
+            return fault, FTDMockServer.error(f"HTTP {fault}", "Injected fault", "mockFault")
+
+        if url_path.endswith("/operational/systeminfo/default"):
+            self.count("getSystemInformation")
+            return 200, {"softwareVersion": self.software_version, "type": "systeminformation"}
+        if url_path.endswith("/easysetup/easysetupstatus"):
+            self.count("easySetupStatus")
+            return 200, {"taskComplete": True, "type": "easysetupstatus"}
+
+        for collection_re, object_re, model, obj_type in self.routes:
+            match = object_re.match(url_path)
+            if match is not None:
+                return self.object_request(method, model, match.group("objId"), match.groupdict().get("parentId"), body)
+            match = collection_re.match(url_path)
+            if match is not None:
+                return self.collection_request(method, model, match.groupdict().get("parentId"), query, body)
+        self.count("notFound")
+        return 404, FTDMockServer.error("Not Found", f"No resource at {url_path}", "notFound")
+
+    def token(self, grant: dict) -> tuple:
+        """:return: tuple (status, response body) of a POST to /fdm/token"""
+        grant_type = grant.get("grant_type")
+        with self.lock:
+            if grant_type == "revoke_token":
+                self.tokens.pop(grant.get("token_to_revoke"), None)
+                return 200, {}
+            if grant_type == "password":
+                valid = grant.get("username") == self.username and grant.get("password") == self.password
+            elif grant_type == "refresh_token":
+                valid = grant.get("refresh_token") in self.refresh_tokens
+            else:
+                valid = False
+            if not valid:
+                return 400, FTDMockServer.error("Bad Request", "Invalid credentials", "invalidGrant")
+            access_token, refresh_token = token_hex(16), token_hex(16)
+            self.tokens[access_token] = monotonic() + self.token_lifetime
+            self.refresh_tokens.add(refresh_token)
+        return 200, {
+            "access_token": access_token,
+            "expires_in": self.token_lifetime,
+            "token_type": "Bearer",
+            "refresh_token": refresh_token,
+            "refresh_expires_in": self.token_lifetime + 600,
+        }
+
+    def collection_request(self, method: str, model: str, parent_id: Optional[str], query: dict, body) -> tuple:
+        """:return: tuple (status, response body) of a request to the path of a collection"""
+        if method == "GET":
+            self.count(f"get{model}List")
+            return 200, self.list_page(model, parent_id, query)
+        if query.get("bulk") != "true" and method == "POST":
+            self.count(f"add{model}")
+            return self.create(model, parent_id, [body])
+        if query.get("bulk") == "true" and method in ("POST", "PUT") and isinstance(body, list):
+            if method == "POST":
+                self.count(f"add{model}Bulk")
+                return self.create(model, parent_id, body, bulk=True)
+            self.count(f"edit{model}Bulk")
+            return self.edit(model, parent_id, body, bulk=True)
+        # A bulk delete names the objects in a filter like ids:<id1>,<id2> and has no body
+        ids_filter = query.get("filter") or ""
+        if query.get("bulk") == "true" and method == "DELETE" and body is None and ids_filter.startswith("ids:"):
+            self.count(f"delete{model}Bulk")
+            return self.delete(model, parent_id, ids_filter[len("ids:") :].split(","), bulk=True)
+        self.count("badRequest")
+        return 400, FTDMockServer.error("Bad Request", f"{method} is not supported here", "badRequest")
+
+    def object_request(self, method: str, model: str, obj_id: str, parent_id: Optional[str], body) -> tuple:
+        """:return: tuple (status, response body) of a request to the path of one object"""
+        if method == "GET":
+            self.count(f"get{model}")
+            with self.lock:
+                obj = self.collection(model, parent_id).objects.get(obj_id)
+            if obj is None:
+                return 404, FTDMockServer.error("Not Found", f"No {model} with id {obj_id}", "objectNotFound")
+            return 200, obj
+        if method == "PUT":
+            self.count(f"edit{model}")
+            return self.edit(model, parent_id, [dict(body or {}, id=obj_id)])
+        if method == "DELETE":
+            self.count(f"delete{model}")
+            return self.delete(model, parent_id, [obj_id])
+        self.count("badRequest")
+        return 400, FTDMockServer.error("Bad Request", f"{method} is not supported here", "badRequest")
+
+    def list_page(self, model: str, parent_id: Optional[str], query: dict) -> dict:
+        """:return: dict one page of a list operation, filtered like the device filters (see matches())"""
+        offset, limit = int(query.get("offset") or 0), int(query.get("limit") or 10)
+        filter = query.get("filter")
+        with self.lock:
+            collection = self.collection(model, parent_id)
+            if filter and filter.startswith("name:") and ";" not in filter:
+                obj_id = collection.names.get(filter[len("name:") :])
+                objs = [collection.objects[obj_id]] if obj_id is not None else []
+            else:
+                objs = collection.values()
+        if filter and not filter.startswith("name:"):
+            objs = [obj for obj in objs if FTDMockServer.matches(obj, filter)]
+        page = objs[offset : offset + limit]
+        paging = {"prev": [], "next": [], "limit": limit, "offset": offset, "count": len(objs)}
+        if offset + len(page) < len(objs):
+            paging["next"] = ["?" + urlencode(dict(query, offset=offset + len(page)))]
+        return {"items": page, "paging": paging}
+
+    @staticmethod
+    def matches(obj: dict, filter: str) -> bool:
+        """
+        :param obj: dict an object of a collection
+        :param filter: str FDM filters separated by ";": "name:WEB" (equal), "fts~10.1" (any of name, value and
+                       description contains it) or "<field>:<value>" (equal)
+        :return: True if the object matches every filter
+        """
+        for condition in filter.split(";"):
+            if condition.startswith("fts~"):
+                text = condition[len("fts~") :].lower()
+                if not any(text in str(obj.get(field) or "").lower() for field in ("name", "value", "description")):
+                    return False
+            elif ":" in condition:
+                field, value = condition.split(":", 1)
+                if str(obj.get(field)) != value:
+                    return False
+        return True
+
+    def create(self, model: str, parent_id: Optional[str], objs: list, bulk: bool = False) -> tuple:
+        """:return: tuple (status, created object or list of objects). A bulk create adds all objects or none."""
+        obj_type = self.models[model][2]
+        with self.lock:
+            collection = self.collection(model, parent_id)
+            names = set()
+            for obj in objs:
+                name = (obj or {}).get("name")
+                if name is not None and (name in collection.names or name in names):
+                    return 422, FTDMockServer.error(
+                        "Validation",
+                        f"The name {name} already exists. Please choose a different name.",
+                        "duplicateName",
+                    )
+                names.add(name)
+            created = []
+            for obj in objs:
+                obj = dict(obj, id=str(uuid4()), version=token_hex(6))
+                obj["type"] = obj.get("type") or obj_type
+                collection.put(obj)
+                created.append(obj)
+        return 200, created if bulk else created[0]
+
+    def edit(self, model: str, parent_id: Optional[str], objs: list, bulk: bool = False) -> tuple:
+        """:return: tuple (status, edited object or list of objects). A bulk edit changes all objects or none."""
+        with self.lock:
+            collection = self.collection(model, parent_id)
+            for obj in objs:
+                if obj.get("id") not in collection.objects:
+                    return 404, FTDMockServer.error(
+                        "Not Found", f"No {model} with id {obj.get('id')}", "objectNotFound"
+                    )
+                owner = collection.names.get(obj.get("name"))
+                if owner is not None and owner != obj["id"]:
+                    return 422, FTDMockServer.error(
+                        "Validation",
+                        f"The name {obj['name']} already exists. Please choose a different name.",
+                        "duplicateName",
+                    )
+            edited = []
+            for obj in objs:
+                obj = dict(obj, version=token_hex(6))  # a PUT replaces the object
+                obj["type"] = obj.get("type") or self.models[model][2]
+                collection.put(obj)
+                edited.append(obj)
+        return 200, edited if bulk else edited[0]
+
+    def delete(self, model: str, parent_id: Optional[str], obj_ids: list, bulk: bool = False) -> tuple:
+        """:return: tuple (status, None). A bulk delete removes all objects or none."""
+        with self.lock:
+            collection = self.collection(model, parent_id)
+            for obj_id in obj_ids:
+                if obj_id not in collection.objects:
+                    return 404, FTDMockServer.error("Not Found", f"No {model} with id {obj_id}", "objectNotFound")
+            for obj_id in obj_ids:
+                collection.remove(obj_id)
+        return 204, None
+
+    @staticmethod
+    def error(key: str, description: str, code: str) -> dict:
+        """:return: dict an FDM error body, the ErrorWrapper of the spec"""
+        return {
+            "error": {
+                "severity": "ERROR",
+                "key": key,
+                "messages": [{"description": description, "code": code, "location": ""}],
+            }
+        }
+
+
+class FTDMockHandler(BaseHTTPRequestHandler):
+    """Hands the requests of one connection to the FTDMockServer of the http server and writes its responses"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, like the device, so the connection pool of the client is used
+    disable_nagle_algorithm = True  # headers and body are written separately, don't hold the body for a delayed ACK
+
+    def log_message(self, format, *args):
+        log.debug(f"{self.address_string()} {format % args}")
+
+    def dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        content = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(content) if content else None
+        except ValueError:
+            body = None
+        status, response = self.server.mock.handle(method, self.path, self.headers, body)
+        if response is None:
+            payload = b""
+        elif isinstance(response, bytes):
+            payload = response
+        else:
+            payload = json.dumps(response).encode()
+        self.send_response(status)
+        if payload:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
@@ -1,6 +1,8 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterator, Optional
 
 log = logging.getLogger(__name__)
 
@@ -8,6 +10,7 @@ log = logging.getLogger(__name__)
 class FTDNatPolicy:
     ################################
     # Autonat
+    @list_operation("NAT", "getObjectNatRuleContainerList", obj_type="objectnatrulecontainer")
     @FTDAPIWrapper()
     def get_autonat_container_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -21,6 +24,18 @@ class FTDNatPolicy:
             .items
         )
 
+    @api_operation("NAT", "getObjectNatRuleContainerList", pages=True, filter="filter")
+    def iter_autonat_containers(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the autonat containers one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of ObjectNatRuleContainer objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("NAT", "getObjectNatRuleContainerList", page_size, filter=filter)
+
+    @api_operation("NAT", "getObjectNatRuleContainer", objId="autonat_container_id")
     @FTDAPIWrapper()
     def get_autonat_container(self, autonat_container_id) -> dict:
         """
@@ -31,6 +46,7 @@ class FTDNatPolicy:
         """
         return self.swagger_client.NAT.getObjectNatRuleContainer(objId=autonat_container_id).result()
 
+    @list_operation("NAT", "getObjectNatRuleList", parentId="autonat_parent_id")
     @FTDAPIWrapper()
     def get_autonat_policy_list(
         self, autonat_parent_id, limit: int = 9999, offset: int = 0, filter: Optional[str] = None
@@ -43,6 +59,21 @@ class FTDNatPolicy:
             .items
         )
 
+    @api_operation("NAT", "getObjectNatRuleList", pages=True, parentId="autonat_parent_id", filter="filter")
+    def iter_autonat_policies(
+        self, autonat_parent_id: str, page_size: int = 100, filter: Optional[str] = None
+    ) -> Iterator:
+        """
+        Yield the autonat rules of a container one page at a time until the device has returned all of them
+        :param autonat_parent_id: str the autonat container (parentId)
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of ObjectNatRule objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("NAT", "getObjectNatRuleList", page_size, parentId=autonat_parent_id, filter=filter)
+
+    @api_operation("NAT", "getObjectNatRule", parentId="autonat_parent_id", objId="nat_obj_id")
     @FTDAPIWrapper()
     def get_autonat_policy(self, autonat_parent_id: str, nat_obj_id: str) -> dict:
         """
@@ -54,6 +85,8 @@ class FTDNatPolicy:
         """
         return self.swagger_client.NAT.getObjectNatRule(parentId=autonat_parent_id, objId=nat_obj_id).result()
 
+    @cache_put
+    @api_operation("NAT", "addObjectNatRule", parentId="autonat_parent_id", body="nat_policy")
     @FTDAPIWrapper()
     def add_autonat_policy(self, autonat_parent_id: str, nat_policy: dict) -> dict:
         """
@@ -80,6 +113,8 @@ class FTDNatPolicy:
         """
         return self.swagger_client.NAT.addObjectNatRule(parentId=autonat_parent_id, body=nat_policy).result()
 
+    @cache_put
+    @edit_operation("NAT", "editObjectNatRule", body="nat_policy", parentId="autonat_parent_id")
     @FTDAPIWrapper()
     def edit_autonat_policy(self, autonat_parent_id: str, nat_policy: dict) -> dict:
         """
@@ -93,6 +128,8 @@ class FTDNatPolicy:
             parentId=autonat_parent_id, objId=nat_policy.id, body=nat_policy
         ).result()
 
+    @cache_evict("nat_obj_id")
+    @api_operation("NAT", "deleteObjectNatRule", parentId="autonat_parent_id", objId="nat_obj_id")
     @FTDAPIWrapper()
     def delete_autonat_policy(self, autonat_parent_id: str, nat_obj_id: str) -> None:
         """
@@ -105,6 +142,7 @@ class FTDNatPolicy:
 
     ################################
     # Manual Nat
+    @list_operation("NAT", "getManualNatRuleContainerList", obj_type="manualnatrulecontainer")
     @FTDAPIWrapper()
     def get_manual_nat_container_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -121,6 +159,18 @@ class FTDNatPolicy:
             .items
         )
 
+    @api_operation("NAT", "getManualNatRuleContainerList", pages=True, filter="filter")
+    def iter_manual_nat_containers(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the manual nat containers one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of ManualNatRuleContainer objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("NAT", "getManualNatRuleContainerList", page_size, filter=filter)
+
+    @api_operation("NAT", "getManualNatRuleContainer", objId="manual_nat_container_id")
     @FTDAPIWrapper()
     def get_manual_nat_container(self, manual_nat_container_id: str) -> dict:
         """
@@ -130,6 +180,7 @@ class FTDNatPolicy:
         """
         return self.swagger_client.NAT.getManualNatRuleContainer(objId=manual_nat_container_id).result()
 
+    @list_operation("NAT", "getManualNatRuleList", parentId="manual_nat_parent_id")
     @FTDAPIWrapper()
     def get_manual_nat_policy_list(
         self, manual_nat_parent_id, limit: int = 9999, offset: int = 0, filter: Optional[str] = None
@@ -147,6 +198,21 @@ class FTDNatPolicy:
             .items
         )
 
+    @api_operation("NAT", "getManualNatRuleList", pages=True, parentId="manual_nat_parent_id", filter="filter")
+    def iter_manual_nat_policies(
+        self, manual_nat_parent_id: str, page_size: int = 100, filter: Optional[str] = None
+    ) -> Iterator:
+        """
+        Yield the manual nat rules of a container one page at a time until the device has returned all of them
+        :param manual_nat_parent_id: str the object id of the manual nat container (beforenat or afternat container)
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of ManualNatRule objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("NAT", "getManualNatRuleList", page_size, parentId=manual_nat_parent_id, filter=filter)
+
+    @api_operation("NAT", "getManualNatRule", parentId="manual_nat_parent_id", objId="nat_obj_id")
     @FTDAPIWrapper()
     def get_manual_nat_policy(self, manual_nat_parent_id: str, nat_obj_id) -> dict:
         """
@@ -158,6 +224,8 @@ class FTDNatPolicy:
         """
         return self.swagger_client.NAT.getManualNatRule(parentId=manual_nat_parent_id, objId=nat_obj_id).result()
 
+    @cache_put
+    @api_operation("NAT", "addManualNatRule", parentId="manual_nat_parent_id", body="nat_policy_obj")
     @FTDAPIWrapper()
     def add_manual_nat_policy(self, manual_nat_parent_id: str, nat_policy_obj: dict) -> dict:
         """
@@ -186,6 +254,8 @@ class FTDNatPolicy:
         """
         return self.swagger_client.NAT.addManualNatRule(parentId=manual_nat_parent_id, body=nat_policy_obj).result()
 
+    @cache_put
+    @edit_operation("NAT", "editManualNatRule", body="nat_policy_obj", parentId="manual_nat_parent_id")
     @FTDAPIWrapper()
     def edit_manual_nat_policy(self, manual_nat_parent_id: str, nat_policy_obj: dict) -> dict:
         """
@@ -198,6 +268,8 @@ class FTDNatPolicy:
             parentId=manual_nat_parent_id, objId=nat_policy_obj.id, body=nat_policy_obj
         ).result()
 
+    @cache_evict("nat_obj_id")
+    @api_operation("NAT", "deleteManualNatRule", parentId="manual_nat_parent_id", objId="nat_obj_id")
     @FTDAPIWrapper()
     def delete_manual_nat_policy(self, manual_nat_parent_id: str, nat_obj_id: str) -> None:
         """
@@ -1,11 +1,14 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterable, Iterator, Optional
 
 log = logging.getLogger(__name__)
 
 
 class FTDNetworkObjects:
+    @list_operation("NetworkObject", "getNetworkObjectList", obj_type="networkobject")
     @FTDAPIWrapper()
     def get_network_object_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -23,6 +26,18 @@ class FTDNetworkObjects:
             .items
         )
 
+    @api_operation("NetworkObject", "getNetworkObjectList", pages=True, filter="filter")
+    def iter_network_objects(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the network objects one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of NetworkObject objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("NetworkObject", "getNetworkObjectList", page_size, filter=filter)
+
+    @api_operation("NetworkObject", "getNetworkObject", objId="obj_id")
     @FTDAPIWrapper()
     def get_network_object(self, obj_id: str) -> dict:
         """
@@ -33,6 +48,8 @@ class FTDNetworkObjects:
         """
         return self.swagger_client.NetworkObject.getNetworkObject(objId=obj_id).result()
 
+    @cache_put
+    @api_operation("NetworkObject", "addNetworkObject", body="network_obj")
     @FTDAPIWrapper()
     def create_network_object(self, network_obj: dict) -> dict:
         """
@@ -50,6 +67,8 @@ class FTDNetworkObjects:
         """
         return self.swagger_client.NetworkObject.addNetworkObject(body=network_obj).result()
 
+    @cache_put
+    @edit_operation("NetworkObject", "editNetworkObject", body="network_obj")
     @FTDAPIWrapper()
     def edit_network_object(self, network_obj):
         """
@@ -61,6 +80,8 @@ class FTDNetworkObjects:
         """
         return self.swagger_client.NetworkObject.editNetworkObject(body=network_obj, objId=network_obj.id).result()
 
+    @cache_evict("network_obj_id")
+    @api_operation("NetworkObject", "deleteNetworkObject", objId="network_obj_id")
     @FTDAPIWrapper()
     def delete_network_object(self, network_obj_id: str) -> None:
         """
@@ -70,6 +91,97 @@ class FTDNetworkObjects:
         """
         return self.swagger_client.NetworkObject.deleteNetworkObject(objId=network_obj_id).result()
 
+    def bulk_create_network_objects(self, network_objs: Iterable, chunk_size: int = 500) -> list:
+        """
+        Create many network objects. Uses the bulk endpoint when the device API supports it, otherwise creates the
+        objects one call at a time, at most max_in_flight at the same time.
+        :param network_objs: iterable of network object dicts (see create_network_object)
+        :param chunk_size: int the number of objects sent per bulk request
+        :return: list of FTDBulkResult, one per object and in the same order. Objects whose name already exists on the
+                 device are reported with status "duplicate"
+        :rtype: list
+        """
+        bulk_call = None
+        if self.supports_bulk("NetworkObject", "addNetworkObject"):
+
+            def bulk_call(chunk):
+                return self.to_models("NetworkObject", self.bulk_request("NetworkObject", "addNetworkObject", chunk))
+
+        return self.run_bulk(network_objs, "created", self.create_network_object, bulk_call, chunk_size)
+
+    def bulk_edit_network_objects(
+        self, network_objs: Iterable, chunk_size: int = 500, skip_unchanged: Optional[bool] = None
+    ) -> list:
+        """
+        Edit many existing network objects
+        :param network_objs: iterable of NetworkObjectWrapper objects (see edit_network_object)
+        :param chunk_size: int the number of objects sent per bulk request
+        :param skip_unchanged: bool (Optional) only send the objects that differ on the device, the others are reported
+                               with the status "unchanged". By default the skip_unchanged_edits of the client.
+        :return: list of FTDBulkResult, one per object and in the same order
+        :rtype: list
+        """
+        bulk_call = None
+        if self.supports_bulk("NetworkObject", "editNetworkObject"):
+
+            def bulk_call(chunk):
+                return self.to_models("NetworkObject", self.bulk_request("NetworkObject", "editNetworkObject", chunk))
+
+        return self.run_bulk_edit(network_objs, self.edit_network_object, bulk_call, chunk_size, skip_unchanged)
+
+    def bulk_delete_network_objects(self, network_obj_ids: Iterable, chunk_size: int = 100) -> list:
+        """
+        Delete many existing network objects. A bulk delete names the objects in an ids filter of the url, hence the
+        smaller chunks.
+        :param network_obj_ids: iterable of network object uuids
+        :param chunk_size: int the number of objects sent per bulk request
+        :return: list of FTDBulkResult, one per object id and in the same order
+        :rtype: list
+        """
+        bulk_call = None
+        if self.supports_bulk("NetworkObject", "deleteNetworkObject"):
+
+            def bulk_call(chunk):
+                self.bulk_request("NetworkObject", "deleteNetworkObject", None, filter=f"ids:{','.join(chunk)}")
+                return [None] * len(chunk)
+
+        return self.run_bulk(network_obj_ids, "deleted", self.delete_network_object, bulk_call, chunk_size)
+
+    def upsert_network_object(self, network_obj: dict) -> dict:
+        """
+        Create a network object, or bring the existing network object of the same name up to date. The object is only
+        edited if one of the fields of network_obj differs on the device (see FTDBulkOperations.upsert)
+        :param network_obj: dict (see create_network_object)
+        :return: the created, edited or unchanged network object
+        :rtype: NetworkObjectWrapper
+        """
+        return self.upsert(network_obj, self.create_network_object, self.edit_network_object)
+
+    def bulk_upsert_network_objects(self, network_objs: Iterable, chunk_size: int = 500) -> list:
+        """
+        Upsert many network objects, using the bulk endpoints when the device API supports them
+        :param network_objs: iterable of network object dicts (see create_network_object)
+        :param chunk_size: int the number of objects sent per bulk request
+        :return: list of FTDBulkResult, one per object and in the same order, with the status created, edited,
+                 unchanged or failed
+        :rtype: list
+        """
+        bulk_create = bulk_edit = None
+        if self.supports_bulk("NetworkObject", "addNetworkObject"):
+
+            def bulk_create(chunk):
+                return self.to_models("NetworkObject", self.bulk_request("NetworkObject", "addNetworkObject", chunk))
+
+        if self.supports_bulk("NetworkObject", "editNetworkObject"):
+
+            def bulk_edit(chunk):
+                return self.to_models("NetworkObject", self.bulk_request("NetworkObject", "editNetworkObject", chunk))
+
+        return self.bulk_upsert(
+            network_objs, self.create_network_object, self.edit_network_object, bulk_create, bulk_edit, chunk_size
+        )
+
+    @list_operation("NetworkObject", "getNetworkObjectGroupList", obj_type="networkobjectgroup")
     @FTDAPIWrapper()
     def get_network_object_group_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -86,6 +198,18 @@ class FTDNetworkObjects:
             .items
         )
 
+    @api_operation("NetworkObject", "getNetworkObjectGroupList", pages=True, filter="filter")
+    def iter_network_object_groups(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the network object groups one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of NetworkObjectGroup objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("NetworkObject", "getNetworkObjectGroupList", page_size, filter=filter)
+
+    @api_operation("NetworkObject", "getNetworkObjectGroup", objId="obj_id")
     @FTDAPIWrapper()
     def get_network_object_group(self, obj_id: str) -> dict:
         """
@@ -96,6 +220,8 @@ class FTDNetworkObjects:
         """
         return self.swagger_client.NetworkObject.getNetworkObjectGroup(objId=obj_id).result()
 
+    @cache_put
+    @api_operation("NetworkObject", "addNetworkObjectGroup", body="net_obj_grp")
     @FTDAPIWrapper()
     def create_network_object_group(self, net_obj_grp: dict) -> dict:
         """
@@ -111,6 +237,8 @@ class FTDNetworkObjects:
         """
         return self.swagger_client.NetworkObject.addNetworkObjectGroup(body=net_obj_grp).result()
 
+    @cache_evict("obj_group_id")
+    @api_operation("NetworkObject", "deleteNetworkObjectGroup", objId="obj_group_id")
     @FTDAPIWrapper()
     def delete_network_object_group(self, obj_group_id: str) -> None:
         """
@@ -120,6 +248,8 @@ class FTDNetworkObjects:
         """
         return self.swagger_client.NetworkObject.deleteNetworkObjectGroup(objId=obj_group_id).result()
 
+    @cache_put
+    @edit_operation("NetworkObject", "editNetworkObjectGroup", body="obj_group")
     @FTDAPIWrapper()
     def edit_network_object_group(self, obj_group: dict) -> dict:
         """
@@ -129,3 +259,13 @@ class FTDNetworkObjects:
         :rtype: NetworkObjectGroupWrapper
         """
         return self.swagger_client.NetworkObject.editNetworkObjectGroup(body=obj_group, objId=obj_group.id).result()
+
+    def upsert_network_object_group(self, net_obj_grp: dict) -> dict:
+        """
+        Create a network object group, or bring the existing group of the same name up to date (see
+        upsert_network_object). The order of the members does not matter.
+        :param net_obj_grp: dict (see create_network_object_group)
+        :return: the created, edited or unchanged NetworkObjectGroup object
+        :rtype: NetworkObjectGroupWrapper
+        """
+        return self.upsert(net_obj_grp, self.create_network_object_group, self.edit_network_object_group)
@@ -0,0 +1,281 @@
+import logging
+from functools import wraps
+from inspect import signature
+from threading import Lock, RLock
+from time import monotonic
+from typing import Optional
+from bravado.exception import HTTPNotFound
+
+log = logging.getLogger(__name__)
+
+
+def cache_put(fn):
+    """Decorate a create/edit method so that the object the device returns is written to the client's object_cache"""
+
+    @wraps(fn)
+    def new_func(self, *args, **kwargs):
+        result = fn(self, *args, **kwargs)
+        if self.object_cache is not None and result is not None:
+            self.object_cache.put(result)
+        return result
+
+    return new_func
+
+
+def cache_evict(id_arg: str):
+    """
+    Decorate a delete method so that the deleted object is removed from the client's object_cache
+    :param id_arg: str the name of the argument that holds the id of the deleted object
+    """
+
+    def decorator(fn):
+        @wraps(fn)
+        def new_func(self, *args, **kwargs):
+            result = fn(self, *args, **kwargs)
+            if self.object_cache is not None:
+                obj_id = signature(fn).bind(self, *args, **kwargs).arguments.get(id_arg)
+                self.object_cache.remove(getattr(obj_id, "id", obj_id))
+            return result
+
+        return new_func
+
+    return decorator
+
+
+class FTDObjectIndex(object):
+    """The cached objects of one object type, indexed by id and by name"""
+
+    def __init__(self):
+        self.by_id = {}  # id: (object, expires_at)
+        self.by_name = {}  # name: id
+        self.complete_until = 0.0  # until then, the index holds every object of its type on the device
+
+
+class FTDInterfaceIndex(object):
+    """
+    The physical, etherchannel, VLAN and sub-interfaces of a device indexed by their nameif (the "name" of the
+    interface, like "inside") and by their hardwareName (like "GigabitEthernet0/1" or "Vlan100"). Filled by
+    FTDInterfaces.refresh_interface_index().
+    """
+
+    def __init__(self):
+        self.by_name = {}  # nameif: interface
+        self.by_hardware_name = {}  # hardwareName: interface
+        self.loaded = False
+        self.lock = Lock()  # one thread loads the index, the others wait for it
+
+    def load(self, interfaces: list) -> None:
+        """Replace the indexed interfaces"""
+        by_name, by_hardware_name = {}, {}
+        for interface in interfaces:
+            if getattr(interface, "name", None):  # unnamed interfaces have no nameif
+                by_name[interface.name] = interface
+            if getattr(interface, "hardwareName", None):
+                by_hardware_name[interface.hardwareName] = interface
+        self.by_name, self.by_hardware_name = by_name, by_hardware_name
+        self.loaded = True
+
+    def get(self, name: str):
+        """:return: the interface with this nameif or hardwareName, or None"""
+        interface = self.by_name.get(name)
+        return interface if interface is not None else self.by_hardware_name.get(name)
+
+
+class FTDObjectCache(object):
+    """
+    An opt-in, in-memory cache of device objects per object type (the "type" of the objects, like "networkobject"),
+    indexed by id and by name.
+
+    Objects expire ttl seconds after they were cached. The create, edit and delete methods of the client keep the cache
+    up to date (see cache_put and cache_evict), and find_object() loads a whole object type in one go the first time it
+    is asked for one of its objects. Until that load expires, looking up a name that is not there does not go to the
+    device either. Changes made to the device by anybody else are only seen after the ttl, or after invalidate().
+
+    Sample usage:
+
+    ftd_client = FTDClient("192.168.100.100", "admin", "Admin123", verify=False, object_cache=FTDObjectCache(ttl=600))
+    dhcp_server = ftd_client.find_object("networkobject", "DHCP-SERVER")  # loads all network objects once
+    ntp_server = ftd_client.find_object("networkobject", "NTP-SERVER")  # served from the cache
+    """
+
+    def __init__(self, ttl: float = 300.0):
+        """
+        :param ttl: float seconds an object stays in the cache
+        """
+        self.ttl = ttl
+        self.indexes = {}  # object type: FTDObjectIndex
+        self.lock = RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fields(obj) -> tuple:
+        """:return: tuple (type, id, name) of a swagger model object or a dict"""
+        if isinstance(obj, dict):
+            return obj.get("type"), obj.get("id"), obj.get("name")
+        return getattr(obj, "type", None), getattr(obj, "id", None), getattr(obj, "name", None)
+
+    def put(self, obj) -> None:
+        """Cache an object, replacing any older version of it"""
+        obj_type, obj_id, name = FTDObjectCache.fields(obj)
+        if obj_type is None or obj_id is None:
+            return  # not an object we can index, like a list or a status message
+        with self.lock:
+            index = self.indexes.setdefault(obj_type, FTDObjectIndex())
+            self.unindex(index, obj_id)
+            index.by_id[obj_id] = (obj, monotonic() + self.ttl)
+            if name is not None:
+                index.by_name[name] = obj_id
+
+    def load(self, obj_type: str, objs: list) -> None:
+        """Replace the cached objects of a type with every object of that type on the device"""
+        index = FTDObjectIndex()
+        expires_at = monotonic() + self.ttl
+        for obj in objs:
+            _, obj_id, name = FTDObjectCache.fields(obj)
+            index.by_id[obj_id] = (obj, expires_at)
+            if name is not None:
+                index.by_name[name] = obj_id
+        index.complete_until = expires_at
+        with self.lock:
+            self.indexes[obj_type] = index
+
+    def remove(self, obj_id: str) -> None:
+        """Forget an object. Ids are unique across object types, so we do not need to know its type."""
+        with self.lock:
+            for index in self.indexes.values():
+                self.unindex(index, obj_id)
+
+    @staticmethod
+    def unindex(index: FTDObjectIndex, obj_id: str) -> None:
+        obj, _ = index.by_id.pop(obj_id, (None, None))
+        if obj is not None:
+            name = FTDObjectCache.fields(obj)[2]
+            if index.by_name.get(name) == obj_id:
+                del index.by_name[name]
+
+    def get(self, obj_type: str, name: Optional[str] = None, obj_id: Optional[str] = None):
+        """
+        :param obj_type: str the type of the object like "networkobject"
+        :param name: str (Optional) the name of the object
+        :param obj_id: str (Optional) the id of the object
+        :return: the cached object or None
+        """
+        with self.lock:
+            index = self.indexes.get(obj_type)
+            if index is not None:
+                if obj_id is None:
+                    obj_id = index.by_name.get(name)
+                obj, expires_at = index.by_id.get(obj_id, (None, None))
+                if obj is not None and monotonic() < expires_at:
+                    self.hits += 1
+                    return obj
+                if obj is not None:
+                    self.unindex(index, obj_id)
+            self.misses += 1
+            return None
+
+    def is_complete(self, obj_type: str) -> bool:
+        """:return: True if the cache holds every object of this type, so a miss means the object does not exist"""
+        with self.lock:
+            index = self.indexes.get(obj_type)
+            return index is not None and monotonic() < index.complete_until
+
+    def invalidate(self, obj_type: Optional[str] = None) -> None:
+        """Forget the objects of one type, or of all types"""
+        with self.lock:
+            if obj_type is None:
+                self.indexes.clear()
+            else:
+                self.indexes.pop(obj_type, None)
+
+    def stats(self) -> dict:
+        """:return: dict the number of hits, misses and cached objects per type"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "objects": {obj_type: len(index.by_id) for obj_type, index in self.indexes.items()},
+            }
+
+
+class FTDObjectLookups:
+    """
+    Look up objects by name or id through the object_cache of the client. Every get_*_list method tagged with the
+    obj_type of its objects (see list_operation) can be used to fill the cache.
+    """
+
+    _list_method_names = {}  # client class: {object type: name of its get_*_list method}
+
+    def object_list_methods(self) -> dict:
+        """:return: dict object type: the get_*_list method that lists the objects of that type"""
+        names = FTDObjectLookups._list_method_names.get(type(self))
+        if names is None:  # the methods of a class do not change, so the class is scanned once
+            names = {}
+            for name in dir(type(self)):
+                obj_type = getattr(getattr(type(self), name, None), "swagger_obj_type", None)
+                if obj_type is not None:
+                    names[obj_type] = name
+            FTDObjectLookups._list_method_names[type(self)] = names
+        return {obj_type: getattr(self, name) for obj_type, name in names.items()}
+
+    def object_list_method(self, obj_type: str):
+        """:return: the get_*_list method that lists the objects of a type"""
+        list_method = self.object_list_methods().get(obj_type)
+        if list_method is None:
+            raise ValueError(f"There is no list method for objects of type {obj_type}")
+        return list_method
+
+    def load_object_index(self, obj_type: str) -> list:
+        """
+        Load every object of a type into the object_cache
+        :param obj_type: str the type of the objects like "networkobject"
+        :return: list of all objects of the type
+        """
+        objs = self.get_list_parallel(self.object_list_method(obj_type))
+        if self.object_cache is not None:
+            self.object_cache.load(obj_type, objs)
+        return objs
+
+    def find_object(self, obj_type: str, name: str):
+        """
+        Find an object by its exact name. With an object_cache the first lookup of a type loads all objects of that type
+        and later lookups are served from memory. Without one, the device is asked for this name only.
+        :param obj_type: str the type of the object like "networkobject" or "tcpportobject"
+        :param name: str the name of the object
+        :return: the object or None if there is no object of that type with that name
+        """
+        if self.object_cache is None:
+            list_method = self.object_list_method(obj_type)
+            return next((obj for obj in list_method(filter=f"name:{name}") or [] if obj.name == name), None)
+        obj = self.object_cache.get(obj_type, name=name)
+        if obj is None and not self.object_cache.is_complete(obj_type):
+            self.load_object_index(obj_type)
+            obj = self.object_cache.get(obj_type, name=name)
+        return obj
+
+    def find_object_by_id(self, obj_type: str, obj_id: str):
+        """
+        Find an object by its id. The object_cache is asked first, if there is one. Otherwise, or if it does not hold the
+        object, the device is asked for this id only, with the read operation of the type.
+        :param obj_type: str the type of the object like "networkobject" or "tcpportobject"
+        :param obj_id: str the id of the object
+        :return: the object or None if there is no object of that type with that id
+        """
+        if self.object_cache is not None:
+            obj = self.object_cache.get(obj_type, obj_id=obj_id)
+            if obj is not None or self.object_cache.is_complete(obj_type):
+                return obj
+        list_method = self.object_list_method(obj_type)
+        operation = self.object_operation(
+            self.swagger_client, list_method.swagger_resource, list_method.swagger_operation
+        )
+        if operation is None:
+            return next((obj for obj in self.load_object_index(obj_type) if obj.id == obj_id), None)
+        try:
+            obj = self.get_object(list_method.swagger_resource, operation, objId=obj_id)
+        except HTTPNotFound:
+            return None
+        if self.object_cache is not None:
+            self.object_cache.put(obj)
+        return obj
@@ -1,6 +1,7 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from typing import Iterator, Optional
 
 log = logging.getLogger(__name__)
 
@@ -13,10 +14,12 @@ class FTDPlatform:
     ################################
     # NTP Settings
     #
+    @api_operation("NTP", "getNTPList", result="items")
     @FTDAPIWrapper()
     def get_ntp_servers_list(self):
         return self.swagger_client.NTP.getNTPList().result().items
 
+    @edit_operation("NTP", "editNTP", body="ntp_servers_obj")
     @FTDAPIWrapper()
     def edit_ntp_servers(self, ntp_servers_obj: dict) -> dict:
         return self.swagger_client.NTP.editNTP(objId=ntp_servers_obj.id, body=ntp_servers_obj).result()
@@ -24,6 +27,7 @@ class FTDPlatform:
     ################################
     # Syslog Settings
     #
+    @api_operation("DeviceHostname", "getDeviceHostnameList", result="items")
     @FTDAPIWrapper()
     def get_hostname_list(self) -> list:
         """
@@ -33,6 +37,7 @@ class FTDPlatform:
         """
         return self.swagger_client.DeviceHostname.getDeviceHostnameList().result().items
 
+    @api_operation("DeviceHostname", "getDeviceHostname", objId="hostname_id")
     @FTDAPIWrapper()
     def get_hostname(self, hostname_id: str) -> dict:
         """
@@ -43,6 +48,7 @@ class FTDPlatform:
         """
         return self.swagger_client.DeviceHostname.getDeviceHostname(objId=hostname_id).result()
 
+    @edit_operation("DeviceHostname", "editDeviceHostname", body="hostname_obj")
     @FTDAPIWrapper()
     def edit_hostname(self, hostname_obj: dict) -> dict:
         """Set the platform hostname.
@@ -55,6 +61,7 @@ class FTDPlatform:
     ################################
     # Syslog Settings buffered, console, and remote
     #
+    @list_operation("DeviceLogSettings", "getDeviceLogSettingsList")
     @FTDAPIWrapper()
     def get_device_log_settings_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         return (
@@ -63,6 +70,17 @@ class FTDPlatform:
             .items
         )
 
+    @api_operation("DeviceLogSettings", "getDeviceLogSettingsList", pages=True, filter="filter")
+    def iter_device_log_settings(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the device log settings one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of DeviceLogSettings objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("DeviceLogSettings", "getDeviceLogSettingsList", page_size, filter=filter)
+
     @FTDAPIWrapper()
     def get_device_log_setting(self):
         pass
@@ -71,6 +89,7 @@ class FTDPlatform:
     def add_device_log_settings(self):
         pass
 
+    @edit_operation("DeviceLogSettings", "editDeviceLogSettings", body="log_settings_obj")
     @FTDAPIWrapper()
     def edit_device_log_settings(self, log_settings_obj):
         return self.swagger_client.DeviceLogSettings.editDeviceLogSettings(
@@ -84,14 +103,17 @@ class FTDPlatform:
     ################################
     # Management DNS Settings
     #
+    @api_operation("DNS", "getDeviceDNSSettingsList", result="items")
     @FTDAPIWrapper()
     def get_mgmt_dns_settings_list(self):
         return self.swagger_client.DNS.getDeviceDNSSettingsList().result().items
 
+    @api_operation("DNS", "getDeviceDNSSettings", objId="dns_settings_obj_id")
     @FTDAPIWrapper()
     def get_mgmt_dns_settings(self, dns_settings_obj_id):
         return self.swagger_client.DNS.getDeviceDNSSettings(objId=dns_settings_obj_id).result()
 
+    @edit_operation("DNS", "editDeviceDNSSettings", body="dns_settings")
     @FTDAPIWrapper()
     def edit_mgmt_dns_settings(self, dns_settings):
         return self.swagger_client.DNS.editDeviceDNSSettings(objId=dns_settings.id, body=dns_settings).result()
@@ -99,14 +121,17 @@ class FTDPlatform:
     ################################
     # Data Interface DNS Settings
     #
+    @api_operation("DNS", "getDataDNSSettingsList", result="items")
     @FTDAPIWrapper()
     def get_data_dns_settings_list(self):
         return self.swagger_client.DNS.getDataDNSSettingsList().result().items
 
+    @api_operation("DNS", "getDataDNSSettings", objId="dns_settings_obj_id")
     @FTDAPIWrapper()
     def get_data_dns_settings(self, dns_settings_obj_id):
         return self.swagger_client.DNS.getDataDNSSettings(objId=dns_settings_obj_id).result()
 
+    @edit_operation("DNS", "editDataDNSSettings", body="dns_settings")
     @FTDAPIWrapper()
     def edit_data_dns_settings(self, dns_settings):
         return self.swagger_client.DNS.editDataDNSSettings(objId=dns_settings.id, body=dns_settings).result()
@@ -122,20 +147,35 @@ class FTDPlatform:
     ################################
     # Platform AAA Servers
     #
+    @list_operation("AAASetting", "getAAASettingList")
     @FTDAPIWrapper()
     def get_aaa_settings_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         return (
             self.swagger_client.AAASetting.getAAASettingList(limit=limit, offset=offset, filter=filter).result().items
         )
 
+    @api_operation("AAASetting", "getAAASettingList", pages=True, filter="filter")
+    def iter_aaa_settings(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the platform AAA settings one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of AAASetting objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("AAASetting", "getAAASettingList", page_size, filter=filter)
+
+    @api_operation("AAASetting", "getAAASetting", objId="aaa_obj_id")
     @FTDAPIWrapper()
     def get_aaa_settings(self, aaa_obj_id: str) -> dict:
         return self.swagger_client.AAASetting.getAAASetting(objId=aaa_obj_id).result()
 
+    @edit_operation("AAASetting", "editAAASetting", body="aaa_obj")
     @FTDAPIWrapper()
     def edit_aaa_settings(self, aaa_obj: dict) -> dict:
         return self.swagger_client.AAASetting.editAAASetting(objId=aaa_obj.id, body=aaa_obj).result()
 
+    @api_operation("AAASetting", "deleteAAASetting", objId="aaa_obj_id")
     @FTDAPIWrapper()
     def delete_aaa_settings(self, aaa_obj_id: str) -> None:
         return self.swagger_client.AAASetting.deleteAAASetting(objId=aaa_obj_id).result()
@@ -143,6 +183,7 @@ class FTDPlatform:
     ################################
     # Misc read-only platform data
     #
+    @api_operation("SystemInformation", "getSystemInformation", objId="obj_id")
     @FTDAPIWrapper()
     def get_system_information(self, obj_id="default") -> dict:
         """Get system information like hardware info, software version, vbd version, model, etc
@@ -1,13 +1,18 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterable, Iterator, Optional
 
 log = logging.getLogger(__name__)
 
 
 class FTDPortObjects:
+    PORT_OBJECT_TYPES = ("tcpportobject", "udpportobject", "icmpv4portobject")
+
     ################################
     # TCP Port Objects
+    @list_operation("PortObject", "getTCPPortObjectList", obj_type="tcpportobject")
     @FTDAPIWrapper()
     def get_tcp_port_object_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -26,6 +31,18 @@ class FTDPortObjects:
             .items
         )
 
+    @api_operation("PortObject", "getTCPPortObjectList", pages=True, filter="filter")
+    def iter_tcp_port_objects(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the tcp port objects one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of TCPPortObject objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("PortObject", "getTCPPortObjectList", page_size, filter=filter)
+
+    @api_operation("PortObject", "getTCPPortObject", objId="tcp_port_obj_id")
     @FTDAPIWrapper()
     def get_tcp_port_object(self, tcp_port_obj_id: str) -> dict:
         """
@@ -34,6 +51,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.getTCPPortObject(objId=tcp_port_obj_id).result()
 
+    @cache_put
+    @api_operation("PortObject", "addTCPPortObject", body="tcp_port_obj")
     @FTDAPIWrapper()
     def create_tcp_port_object(self, tcp_port_obj: dict) -> dict:
         """
@@ -48,6 +67,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.addTCPPortObject(body=tcp_port_obj).result()
 
+    @cache_put
+    @edit_operation("PortObject", "editTCPPortObject", body="tcp_port_obj")
     @FTDAPIWrapper()
     def edit_tcp_port_object(self, tcp_port_obj: dict) -> dict:
         """
@@ -56,6 +77,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.editTCPPortObject(body=tcp_port_obj, objId=tcp_port_obj.id).result()
 
+    @cache_evict("port_obj_id")
+    @api_operation("PortObject", "deleteTCPPortObject", objId="port_obj_id")
     @FTDAPIWrapper()
     def delete_tcp_port_object(self, port_obj_id: str) -> None:
         """
@@ -67,6 +90,7 @@ class FTDPortObjects:
 
     ################################
     # UDP Port Objects
+    @list_operation("PortObject", "getUDPPortObjectList", obj_type="udpportobject")
     @FTDAPIWrapper()
     def get_udp_port_object_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -85,6 +109,18 @@ class FTDPortObjects:
             .items
         )
 
+    @api_operation("PortObject", "getUDPPortObjectList", pages=True, filter="filter")
+    def iter_udp_port_objects(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the udp port objects one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of UDPPortObject objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("PortObject", "getUDPPortObjectList", page_size, filter=filter)
+
+    @api_operation("PortObject", "getUDPPortObject", objId="udp_port_obj_id")
     @FTDAPIWrapper()
     def get_udp_port_object(self, udp_port_obj_id: str) -> None:
         """
@@ -94,6 +130,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.getUDPPortObject(objId=udp_port_obj_id).result()
 
+    @cache_put
+    @api_operation("PortObject", "addUDPPortObject", body="udp_port_obj")
     @FTDAPIWrapper()
     def create_udp_port_object(self, udp_port_obj: dict) -> dict:
         """
@@ -109,6 +147,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.addUDPPortObject(body=udp_port_obj).result()
 
+    @cache_put
+    @edit_operation("PortObject", "editUDPPortObject", body="udp_port_obj")
     @FTDAPIWrapper()
     def edit_udp_port_object(self, udp_port_obj: dict) -> dict:
         """
@@ -119,6 +159,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.editUDPPortObject(body=udp_port_obj, objId=udp_port_obj.id).result()
 
+    @cache_evict("udp_port_obj_id")
+    @api_operation("PortObject", "deleteUDPPortObject", objId="udp_port_obj_id")
     @FTDAPIWrapper()
     def delete_udp_port_object(self, udp_port_obj_id: str) -> None:
         """
@@ -130,6 +172,7 @@ class FTDPortObjects:
 
     ################################
     # ICMP (IPV4) Port Objects
+    @list_operation("PortObject", "getICMPv4PortObjectList", obj_type="icmpv4portobject")
     @FTDAPIWrapper()
     def get_ipv4_icmp_port_object_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -148,6 +191,18 @@ class FTDPortObjects:
             .items
         )
 
+    @api_operation("PortObject", "getICMPv4PortObjectList", pages=True, filter="filter")
+    def iter_ipv4_icmp_port_objects(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the ipv4 icmp port objects one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of ICMPv4PortObject objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("PortObject", "getICMPv4PortObjectList", page_size, filter=filter)
+
+    @api_operation("PortObject", "getICMPv4PortObject", objId="icmp_port_obj_id")
     @FTDAPIWrapper()
     def get_ipv4_icmp_port_object(self, icmp_port_obj_id):
         """
@@ -158,6 +213,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.getICMPv4PortObject(objId=icmp_port_obj_id).result()
 
+    @cache_put
+    @api_operation("PortObject", "addICMPv4PortObject", body="ipv4_icmp_obj")
     @FTDAPIWrapper()
     def create_ipv4_icmp_port_object(self, ipv4_icmp_obj: dict) -> dict:
         """
@@ -189,6 +246,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.addICMPv4PortObject(body=ipv4_icmp_obj).result()
 
+    @cache_put
+    @edit_operation("PortObject", "editICMPv4PortObject", body="ipv4_icmp_obj")
     @FTDAPIWrapper()
     def edit_ipv4_icmp_port_object(self, ipv4_icmp_obj):
         """
@@ -199,6 +258,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.editICMPv4PortObject(body=ipv4_icmp_obj, objId=ipv4_icmp_obj.id).result()
 
+    @cache_evict("ipv4_icmp_obj_id")
+    @api_operation("PortObject", "deleteICMPv4PortObject", objId="ipv4_icmp_obj_id")
     @FTDAPIWrapper()
     def delete_ipv4_icmp_port_object(self, ipv4_icmp_obj_id):
         """
@@ -210,6 +271,7 @@ class FTDPortObjects:
 
     ################################
     # Port Object Groups
+    @list_operation("PortObject", "getPortObjectGroupList", obj_type="portobjectgroup")
     @FTDAPIWrapper()
     def get_port_object_group_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -226,6 +288,18 @@ class FTDPortObjects:
             .items
         )
 
+    @api_operation("PortObject", "getPortObjectGroupList", pages=True, filter="filter")
+    def iter_port_object_groups(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the port object groups one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of PortObjectGroup objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("PortObject", "getPortObjectGroupList", page_size, filter=filter)
+
+    @api_operation("PortObject", "getPortObjectGroup", objId="port_object_group_id")
     @FTDAPIWrapper()
     def get_port_object_group(self, port_object_group_id: str) -> dict:
         """
@@ -236,6 +310,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.getPortObjectGroup(objId=port_object_group_id).result()
 
+    @cache_put
+    @api_operation("PortObject", "addPortObjectGroup", body="port_grp_obj")
     @FTDAPIWrapper()
     def create_port_object_group(self, port_grp_obj: list) -> list:
         """
@@ -251,6 +327,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.addPortObjectGroup(body=port_grp_obj).result()
 
+    @cache_put
+    @edit_operation("PortObject", "editPortObjectGroup", body="port_grp_obj")
     @FTDAPIWrapper()
     def edit_port_object_group(self, port_grp_obj: list) -> list:
         """
@@ -261,6 +339,8 @@ class FTDPortObjects:
         """
         return self.swagger_client.PortObject.editPortObjectGroup(body=port_grp_obj, objId=port_grp_obj.id).result()
 
+    @cache_evict("port_object_group_id")
+    @api_operation("PortObject", "deletePortObjectGroup", objId="port_object_group_id")
     @FTDAPIWrapper()
     def delete_port_object_group(self, port_object_group_id: str) -> None:
         """
@@ -274,19 +354,119 @@ class FTDPortObjects:
     @FTDAPIWrapper()
     def search_port_objects(self, port_obj_name):
         """
-        Search for a port object by name (icmp, udp, tcp)
+        Search for a port object by its exact name (icmp, udp, tcp). The three protocols are searched at the same time,
+        see find_port_objects().
         :param port_obj_name:
         :return: TCPPortObject or UDPPortObject or ICMPv4Object or None
         """
-        tcp_port_obj_list = self.get_tcp_port_object_list(filter=f"name:{port_obj_name}")
-        if tcp_port_obj_list:
-            return tcp_port_obj_list[0]
-        else:
-            udp_port_obj_list = self.get_udp_port_object_list(filter=f"name:{port_obj_name}")
-            if udp_port_obj_list:
-                return udp_port_obj_list[0]
-            else:
-                icmp_object_list = self.get_ipv4_icmp_port_object_list(filter=f"name:{port_obj_name}")
-                if icmp_object_list:
-                    return icmp_object_list[0]
-        return
+        return next(iter(self.find_port_objects(port_obj_name)), None)
+
+    def find_port_objects(self, port_obj_name: str) -> list:
+        """
+        Find every port object with exactly this name, of any protocol
+        :param port_obj_name: str the name of the port object
+        :return: list of TCPPortObject, UDPPortObject and ICMPv4PortObject objects, in that order
+        """
+        if self.object_cache is not None:
+            return self.resolve_port_objects([port_obj_name])[port_obj_name]
+        port_obj_lists = self.gather(
+            lambda: self.get_tcp_port_object_list(filter=f"name:{port_obj_name}"),
+            lambda: self.get_udp_port_object_list(filter=f"name:{port_obj_name}"),
+            lambda: self.get_ipv4_icmp_port_object_list(filter=f"name:{port_obj_name}"),
+        )
+        return [
+            port_obj
+            for port_obj_list in port_obj_lists
+            for port_obj in port_obj_list or []
+            if port_obj.name == port_obj_name
+        ]
+
+    def resolve_port_objects(self, port_obj_names: Iterable[str]) -> dict:
+        """
+        Find the port objects of a whole batch of names, like the members of a port object group, in one pass. The
+        TCP, UDP and ICMPv4 port objects are loaded at the same time, once, and then looked up in memory. With an
+        object_cache they are loaded only if the cache does not hold them yet.
+
+        Sample usage:
+
+        port_objs = ftd_client.resolve_port_objects(["HTTP", "HTTPS", "DNS"])
+        missing = [name for name, matches in port_objs.items() if not matches]
+        members = [port_obj for matches in port_objs.values() for port_obj in matches]
+
+        :param port_obj_names: iterable of str port object names
+        :return: dict name: list of the port objects of any protocol with that name, an empty list if there is none
+        """
+        if self.object_cache is not None:
+            self.gather(
+                *[
+                    lambda obj_type=obj_type: self.load_object_index(obj_type)
+                    for obj_type in FTDPortObjects.PORT_OBJECT_TYPES
+                    if not self.object_cache.is_complete(obj_type)
+                ]
+            )
+            return {
+                name: [
+                    port_obj
+                    for port_obj in [
+                        self.object_cache.get(obj_type, name=name) for obj_type in FTDPortObjects.PORT_OBJECT_TYPES
+                    ]
+                    if port_obj is not None
+                ]
+                for name in port_obj_names
+            }
+        port_obj_index = {}
+        for port_obj_list in self.gather(
+            lambda: self.get_list_parallel(self.get_tcp_port_object_list),
+            lambda: self.get_list_parallel(self.get_udp_port_object_list),
+            lambda: self.get_list_parallel(self.get_ipv4_icmp_port_object_list),
+        ):
+            for port_obj in port_obj_list:
+                port_obj_index.setdefault(port_obj.name, []).append(port_obj)
+        return {name: port_obj_index.get(name, []) for name in port_obj_names}
+
+    def port_object_methods(self, obj_type: str) -> tuple:
+        """
+        :param obj_type: str "tcpportobject", "udpportobject" or "icmpv4portobject"
+        :return: tuple (create method, edit method) for port objects of this type
+        """
+        port_object_methods = {
+            "tcpportobject": (self.create_tcp_port_object, self.edit_tcp_port_object),
+            "udpportobject": (self.create_udp_port_object, self.edit_udp_port_object),
+            "icmpv4portobject": (self.create_ipv4_icmp_port_object, self.edit_ipv4_icmp_port_object),
+        }
+        if obj_type not in port_object_methods:
+            raise ValueError(f"{obj_type} is not one of {', '.join(FTDPortObjects.PORT_OBJECT_TYPES)}")
+        return port_object_methods[obj_type]
+
+    def upsert_port_object(self, port_obj: dict) -> dict:
+        """
+        Create a TCP, UDP or ICMPv4 port object (depending on its type), or bring the existing port object of the same
+        name and type up to date. The object is only edited if one of the fields of port_obj differs on the device
+        (see FTDBulkOperations.upsert)
+        :param port_obj: dict (see create_tcp_port_object, create_udp_port_object or create_ipv4_icmp_port_object)
+        :return: the created, edited or unchanged port object
+        """
+        return self.upsert(port_obj, *self.port_object_methods(port_obj["type"]))
+
+    def bulk_upsert_port_objects(self, port_objs: Iterable, chunk_size: int = 500) -> list:
+        """
+        Upsert many port objects of any protocol, at most max_in_flight at the same time
+        :param port_objs: iterable of TCP, UDP and ICMPv4 port object dicts
+        :param chunk_size: int the number of objects handled per round
+        :return: list of FTDBulkResult, one per object and in the same order, with the status created, edited,
+                 unchanged or failed
+        """
+        return self.bulk_upsert(
+            port_objs,
+            lambda port_obj: self.port_object_methods(port_obj["type"])[0](port_obj),
+            lambda port_obj: self.port_object_methods(port_obj["type"])[1](port_obj),
+            chunk_size=chunk_size,
+        )
+
+    def upsert_port_object_group(self, port_grp_obj: dict) -> dict:
+        """
+        Create a port object group, or bring the existing group of the same name up to date (see upsert_port_object)
+        :param port_grp_obj: dict (see create_port_object_group)
+        :return: the created, edited or unchanged PortObjectGroup object
+        """
+        return self.upsert(port_grp_obj, self.create_port_object_group, self.edit_port_object_group)
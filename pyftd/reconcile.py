@@ -0,0 +1,439 @@
+import logging
+from .bulk import FTDBulkOperations, FTDBulkResult
+from .compare import changed_fields, to_plain
+from typing import Iterable, Iterator, Optional
+
+log = logging.getLogger(__name__)
+
+# The object types the reconciler manages. Changes of the same wave are listed in this order.
+RECONCILE_TYPES = (
+    "networkobject",
+    "tcpportobject",
+    "udpportobject",
+    "icmpv4portobject",
+    "urlobject",
+    "networkobjectgroup",
+    "portobjectgroup",
+    "urlobjectgroup",
+    "objectnatrule",
+    "manualnatrule",
+    "staticrouteentry",
+)
+
+NAT_RULE_TYPES = ("objectnatrule", "manualnatrule")
+
+
+def references(obj, top: bool = True) -> Iterator[dict]:
+    """
+    :param obj: the json representation of an object
+    :return: generator of the objects obj refers to, the nested dicts with a type and a name like the members of a group
+             or the interfaces of a NAT rule
+    """
+    if isinstance(obj, dict):
+        if not top and "type" in obj and "name" in obj:
+            yield obj
+            return
+        for value in obj.values():
+            yield from references(value, top=False)
+    elif isinstance(obj, list):
+        for value in obj:
+            yield from references(value, top=False)
+
+
+def resolve_references(obj, known: dict):
+    """
+    :param obj: the json representation of an object
+    :param known: dict (type, parent id, name): object on the device
+    :return: a copy of obj where the references without an id have the id and the version of the object they name
+    """
+    if isinstance(obj, list):
+        return [resolve_references(value, known) for value in obj]
+    if not isinstance(obj, dict):
+        return obj
+    resolved = {key: resolve_references(value, known) for key, value in obj.items()}
+    target = known.get((obj.get("type"), None, obj.get("name")))  # what is referred to has no parent
+    if target is not None and "id" not in obj:
+        resolved["id"] = target.id
+        if getattr(target, "version", None) is not None:
+            resolved["version"] = target.version
+    return resolved
+
+
+class FTDChange(object):
+    """
+    One step of a FTDPlan
+
+    action is create, edit or delete. desired is the object as declared (None for deletes), current the object on the
+    device (None for creates), fields the names of the fields an edit changes and parent_id the container of a NAT rule
+    or the VRF of a static route. depends_on holds the changes that have to be made before this one.
+    """
+
+    def __init__(
+        self,
+        action: str,
+        obj_type: str,
+        name: str,
+        desired: Optional[dict] = None,
+        current=None,
+        fields: Optional[list] = None,
+        parent_id: Optional[str] = None,
+    ):
+        self.action = action
+        self.obj_type = obj_type
+        self.name = name
+        self.desired = desired
+        self.current = current
+        self.fields = fields or []
+        self.parent_id = parent_id
+        self.depends_on = []
+
+    def __repr__(self):
+        return f"FTDChange(action={self.action!r}, type={self.obj_type!r}, name={self.name!r}, fields={self.fields!r})"
+
+    @property
+    def key(self) -> tuple:
+        return self.obj_type, self.parent_id, self.name
+
+
+class FTDPlan(object):
+    """
+    The changes that bring a device to a desired state, see FTDReconciler.plan_changes()
+
+    waves is a list of lists of FTDChange. The changes of a wave do not depend on each other and are made at the same
+    time, and a wave starts when the one before it is done. Objects are created before the objects that refer to them
+    and deleted after the objects that referred to them were edited or deleted. known holds the objects on the device
+    the desired state refers to, by (type, parent id, name), and unchanged the (type, parent id, name) of the objects
+    that are up to date. The parent id is the container of a NAT rule or the VRF of a static route, None for the other
+    objects, so rules and routes of the same name in different containers or VRFs are different objects.
+    """
+
+    def __init__(self, waves: list, known: dict, unchanged: list):
+        self.waves = waves
+        self.known = known
+        self.unchanged = unchanged
+
+    def __repr__(self):
+        return f"FTDPlan({', '.join(f'{action}={count}' for action, count in self.summary().items())})"
+
+    def __iter__(self) -> Iterator[FTDChange]:
+        return (change for wave in self.waves for change in wave)
+
+    def __len__(self) -> int:
+        return sum(len(wave) for wave in self.waves)
+
+    def summary(self) -> dict:
+        """:return: dict the number of creates, edits, deletes and unchanged objects"""
+        summary = {"create": 0, "edit": 0, "delete": 0}
+        for change in self:
+            summary[change.action] += 1
+        summary["unchanged"] = len(self.unchanged)
+        return summary
+
+
+class FTDReconciler:
+    """
+    Bring the network objects, network groups, port objects, port groups, URL objects, URL groups, NAT rules and static
+    routes of a device to a declared state with as few changes as possible.
+
+    The desired state is a list of objects like the create_* methods take. Objects refer to each other by type and name
+    only, e.g. {"type": "networkobject", "name": "WEB-SERVER"}, the ids are filled in when the changes are made.
+    Interfaces are referred to by their nameif or hardwareName (see resolve_interface). The device is read once, every
+    object type at the same time, and only the objects that are missing or differ (see compare.changed_fields) are
+    written.
+
+    Sample usage:
+
+    desired = [
+        {"type": "networkobject", "name": "WEB-SERVER", "subType": "HOST", "value": "10.1.1.10"},
+        {"type": "tcpportobject", "name": "TCP-8443", "port": "8443"},
+        {
+            "type": "networkobjectgroup",
+            "name": "WEB-SERVERS",
+            "objects": [{"type": "networkobject", "name": "WEB-SERVER"}],
+        },
+    ]
+    plan = ftd_client.plan_changes(desired)
+    print(plan.summary())
+    results = ftd_client.apply_plan(plan)
+    """
+
+    def plan_changes(
+        self,
+        desired: Iterable,
+        prune: bool = False,
+        manual_nat_container: str = "NGFW-Before-Auto-NAT-Policy",
+        vrf_id: str = "default",
+    ) -> FTDPlan:
+        """
+        Compare the desired state with the device and work out the changes that make them match
+        :param desired: iterable of dicts (or swagger model objects) with at least the type and the name of the object
+        :param prune: bool delete the objects of the types in desired that are on the device but not in desired.
+                      System defined objects are never deleted, nor are object types that do not appear in desired,
+                      nor NAT rules and static routes outside of the container and VRF of this plan.
+        :param manual_nat_container: str the name of the container new manual NAT rules are created in
+        :param vrf_id: str the VRF of the static routes, "default" is the global VRF
+        :return: FTDPlan
+        """
+        desired_objs = [to_plain(obj) for obj in desired]
+        for obj in desired_objs:
+            if obj.get("type") not in RECONCILE_TYPES:
+                raise ValueError(
+                    f"Cannot reconcile objects of type {obj.get('type')}, we can do {', '.join(RECONCILE_TYPES)}"
+                )
+        desired_types = {obj["type"] for obj in desired_objs}
+        referenced_types = {ref["type"] for obj in desired_objs for ref in references(obj)}
+
+        # Pruning needs every object that could still refer to a deleted one
+        load_types = RECONCILE_TYPES if prune else desired_types | referenced_types
+        known, containers = self.load_state(
+            [obj_type for obj_type in RECONCILE_TYPES if obj_type in load_types], vrf_id
+        )
+        # The container or VRF the desired NAT rules and static routes are in, or created in
+        new_parents = {
+            "objectnatrule": containers["objectnatrule"][0].id if containers["objectnatrule"] else None,
+            "manualnatrule": next(
+                (container.id for container in containers["manualnatrule"] if container.name == manual_nat_container),
+                None,
+            ),
+            "staticrouteentry": vrf_id,
+        }
+
+        desired_by_key = {}
+        for obj in desired_objs:
+            key = (obj["type"], new_parents.get(obj["type"]), obj.get("name"))
+            if key[0] in NAT_RULE_TYPES and key[1] is None:
+                raise ValueError(f"There is no NAT container for {key[0]} {key[2]} on the device")
+            if key in desired_by_key:
+                raise ValueError(f"{key[0]} {key[2]} is declared more than once")
+            desired_by_key[key] = obj
+
+        changes, unchanged = {}, []
+        for key, obj in desired_by_key.items():
+            current = known.get(key)
+            if current is None:
+                changes[key] = FTDChange("create", key[0], key[2], desired=obj, parent_id=key[1])
+                continue
+            fields = changed_fields(current, obj)
+            if fields:
+                changes[key] = FTDChange(
+                    "edit", key[0], key[2], desired=obj, current=current, fields=fields, parent_id=key[1]
+                )
+            else:
+                unchanged.append(key)
+        if prune:
+            # Only in the container or VRF the plan manages, the NAT rules of the other containers are left alone
+            managed = {(obj_type, new_parents.get(obj_type)) for obj_type in desired_types}
+            for key, current in known.items():
+                if key[:2] in managed and key not in desired_by_key and not getattr(current, "isSystemDefined", 0):
+                    changes[key] = FTDChange("delete", key[0], key[2], current=current, parent_id=key[1])
+
+        self.resolve_unknown_references(desired_by_key, changes, known)
+        self.order_changes(changes, known)
+        plan = FTDPlan(FTDReconciler.waves(changes), known, unchanged)
+        log.info(f"Reconcile plan: {plan.summary()}")
+        return plan
+
+    def load_state(self, obj_types: list, vrf_id: str = "default") -> tuple:
+        """
+        Read every object of the given types from the device. All types are listed at the same time, each with parallel
+        pages (see get_list_parallel), then the NAT rules of all NAT containers at the same time.
+        :param obj_types: list of object types like "networkobject" or "manualnatrule"
+        :param vrf_id: str the VRF of the static routes
+        :return: tuple (dict (type, parent id, name): object, dict NAT rule type: list of its containers). The parent id
+                 is the container of a NAT rule or the VRF of a static route, None for the other objects.
+        """
+        list_methods = self.object_list_methods()
+        container_types = {"objectnatrule": "objectnatrulecontainer", "manualnatrule": "manualnatrulecontainer"}
+        calls = {}  # (type, parent id): call
+        for obj_type in obj_types:
+            if obj_type in NAT_RULE_TYPES:
+                calls[(container_types[obj_type], None)] = lambda list_method=list_methods[container_types[obj_type]]: (
+                    self.get_list_parallel(list_method)
+                )
+            elif obj_type == "staticrouteentry":
+                calls[(obj_type, vrf_id)] = lambda: self.get_list_parallel(self.get_static_route_list, vrf_id)
+            else:
+                calls[(obj_type, None)] = lambda list_method=list_methods[obj_type]: self.get_list_parallel(list_method)
+        listed = dict(zip(calls, self.gather(*calls.values())))
+
+        containers = {}
+        nat_calls = {}
+        for obj_type in NAT_RULE_TYPES:
+            containers[obj_type] = listed.pop((container_types[obj_type], None), None) or []
+            list_method = (
+                self.get_autonat_policy_list if obj_type == "objectnatrule" else self.get_manual_nat_policy_list
+            )
+            for container in containers[obj_type]:
+                nat_calls[(obj_type, container.id)] = lambda list_method=list_method, parent_id=container.id: (
+                    self.get_list_parallel(list_method, parent_id)
+                )
+        listed.update(zip(nat_calls, self.gather(*nat_calls.values())))
+
+        known = {}
+        for (obj_type, parent_id), objs in listed.items():
+            for obj in objs:
+                known[(obj_type, parent_id, obj.name)] = obj
+        return known, containers
+
+    def resolve_unknown_references(self, desired_objs: dict, changes: dict, known: dict) -> None:
+        """
+        Make sure every object the changes refer to is on the device or created by the plan. Interfaces, and objects of
+        types the reconciler does not manage, are looked up and added to known.
+        """
+        list_methods = self.object_list_methods()
+        for change in changes.values():
+            for ref in references(change.desired):
+                ref_key = (ref["type"], None, ref["name"])
+                if "id" in ref or ref_key in known or ref_key in desired_objs:
+                    continue
+                if ref["type"] in RECONCILE_TYPES:
+                    target = None  # we have listed them all already
+                elif ref["type"].endswith("interface"):
+                    target = self.resolve_interface(ref["name"])
+                elif ref["type"] in list_methods:
+                    target = self.find_object(ref["type"], ref["name"])
+                else:
+                    continue  # nothing to look it up with, the device will tell if it is wrong
+                if target is None:
+                    raise ValueError(
+                        f"{change.obj_type} {change.name} refers to the missing {ref['type']} {ref['name']}"
+                    )
+                known[ref_key] = target
+
+    @staticmethod
+    def order_changes(changes: dict, known: dict) -> None:
+        """
+        Fill in the depends_on of the changes: creates come before the changes that refer to the new object, and a
+        delete comes after the edits and deletes of the objects on the device that refer to the deleted object.
+        """
+        for change in changes.values():
+            for ref in references(change.desired):
+                dependency = changes.get((ref["type"], None, ref["name"]))
+                if dependency is not None and dependency.action == "create":
+                    change.depends_on.append(dependency)
+
+        keys_by_id = {getattr(obj, "id", None): key for key, obj in known.items()}
+        for key, obj in known.items():
+            for ref in references(to_plain(obj)):
+                deleted = changes.get(keys_by_id.get(ref.get("id")))
+                if deleted is None or deleted.action != "delete":
+                    continue
+                referrer = changes.get(key)
+                if referrer is None:
+                    raise ValueError(f"Cannot delete {deleted.obj_type} {deleted.name}, {key[0]} {key[2]} uses it")
+                deleted.depends_on.append(referrer)
+
+    @staticmethod
+    def waves(changes: dict) -> list:
+        """:return: list of lists of the changes, each change in the wave after the last of its dependencies"""
+        waves, done, pending = [], set(), list(changes.values())
+        while pending:
+            wave = [change for change in pending if all(id(dependency) in done for dependency in change.depends_on)]
+            if not wave:
+                raise ValueError(f"The changes depend on each other in a cycle: {pending}")
+            wave.sort(key=lambda change: (RECONCILE_TYPES.index(change.obj_type), change.name))
+            waves.append(wave)
+            done.update(id(change) for change in wave)
+            pending = [change for change in pending if id(change) not in done]
+        return waves
+
+    def apply_plan(self, plan: FTDPlan) -> list:
+        """
+        Make the changes of a plan, wave by wave. The changes of a wave are made at the same time, at most max_in_flight
+        at a time. A change whose dependency failed is not attempted and is reported as "skipped".
+        :param plan: FTDPlan from plan_changes()
+        :return: list of FTDBulkResult, one per change in the order of the plan, the change is in item
+        """
+        known = dict(plan.known)  # the objects we create are added, so later waves can refer to them
+        failed = set()
+        results = []
+        for wave in plan.waves:
+            wave_results = self.gather(
+                *[
+                    lambda change=change: (
+                        FTDBulkResult(change, "skipped")
+                        if any(id(dependency) in failed for dependency in change.depends_on)
+                        else self.apply_change(change, known)
+                    )
+                    for change in wave
+                ]
+            )
+            for change, change_result in zip(wave, wave_results):
+                if change_result.ok:
+                    if change_result.result is not None:
+                        known[change.key] = change_result.result
+                else:
+                    failed.add(id(change))
+                    log.error(
+                        f"{change.action} {change.obj_type} {change.name} {change_result.status}: {change_result.error}"
+                    )
+            results += wave_results
+        return results
+
+    def apply_change(self, change: FTDChange, known: dict) -> FTDBulkResult:
+        """
+        Make one change of a plan
+        :param change: FTDChange
+        :param known: dict (type, parent id, name): object on the device, to fill in the ids of the objects the change
+                      refers to
+        :return: FTDBulkResult
+        """
+        create, edit, delete = self.reconcile_methods(change.obj_type)
+        args, kwargs = (), {}
+        if change.obj_type in NAT_RULE_TYPES:
+            args = (change.parent_id,)
+        elif change.obj_type == "staticrouteentry":
+            kwargs = {"parent_id": change.parent_id}
+        try:
+            if change.action == "delete":
+                delete(*args, change.current.id, **kwargs)
+                return FTDBulkResult(change, "deleted")
+            obj = resolve_references(change.desired, known)
+            if change.action == "create":
+                result = create(*args, obj, **kwargs)
+                return FTDBulkResult(change, "created" if result is not None else "duplicate", result)
+            merged = FTDBulkOperations.merge(change.current, obj)
+            return FTDBulkResult(change, "edited", edit(*args, merged, skip_unchanged=False, **kwargs))
+        except Exception as ex:
+            return FTDBulkResult(change, "failed", error=ex)
+
+    def reconcile_methods(self, obj_type: str) -> tuple:
+        """
+        :param obj_type: str one of RECONCILE_TYPES
+        :return: tuple (create, edit, delete) the client methods for objects of this type
+        """
+        return {
+            "networkobject": (self.create_network_object, self.edit_network_object, self.delete_network_object),
+            "networkobjectgroup": (
+                self.create_network_object_group,
+                self.edit_network_object_group,
+                self.delete_network_object_group,
+            ),
+            "tcpportobject": (self.create_tcp_port_object, self.edit_tcp_port_object, self.delete_tcp_port_object),
+            "udpportobject": (self.create_udp_port_object, self.edit_udp_port_object, self.delete_udp_port_object),
+            "icmpv4portobject": (
+                self.create_ipv4_icmp_port_object,
+                self.edit_ipv4_icmp_port_object,
+                self.delete_ipv4_icmp_port_object,
+            ),
+            "portobjectgroup": (
+                self.create_port_object_group,
+                self.edit_port_object_group,
+                self.delete_port_object_group,
+            ),
+            "urlobject": (self.create_url_object, self.edit_url_object, self.delete_url_object),
+            "urlobjectgroup": (self.create_url_object_group, self.edit_url_object_group, self.delete_url_object_group),
+            "objectnatrule": (self.add_autonat_policy, self.edit_autonat_policy, self.delete_autonat_policy),
+            "manualnatrule": (self.add_manual_nat_policy, self.edit_manual_nat_policy, self.delete_manual_nat_policy),
+            "staticrouteentry": (self.create_static_route, self.edit_static_route, self.delete_static_route),
+        }[obj_type]
+
+    def reconcile(self, desired: Iterable, prune: bool = False, **plan_options) -> list:
+        """
+        plan_changes() and apply_plan() in one go
+        :param desired: iterable of dicts with at least the type and the name of the object
+        :param prune: bool delete the objects of the types in desired that are not in desired, see plan_changes()
+        :param plan_options: manual_nat_container or vrf_id, see plan_changes()
+        :return: list of FTDBulkResult, one per change
+        """
+        return self.apply_plan(self.plan_changes(desired, prune=prune, **plan_options))
@@ -0,0 +1,97 @@
+import logging
+from bravado.exception import HTTPLocked, HTTPServiceUnavailable, HTTPUnprocessableEntity
+from random import random
+from threading import Lock
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FTDRetryPolicy(object):
+    """
+    Decides if, and after how long, FTDAPIWrapper retries a call that failed for a transient reason.
+
+    Delays grow exponentially from base_delay by multiplier per retry, are capped at max_delay and are randomized by
+    jitter (0 = no randomness, 1 = anywhere between 0 and the full delay) so that a fleet of clients does not retry in
+    lock step. A call is given up when its rule runs out of retries or when max_elapsed seconds have passed since the
+    first attempt.
+
+    The rules map a retry reason to the maximum number of retries for that reason (0 disables retries):
+        HTTPLocked: the database is locked by a heavy operation like an SRU/VDB update (423)
+        DeploymentScheduling: "Failed to schedule deployment job" (422)
+        HTTPServiceUnavailable: the API is not available yet, e.g. while the device boots (503)
+
+    retry_counts and giveup_counts count retries and give-ups per reason across all calls using this policy.
+
+    Sample usage:
+
+    retry_policy = FTDRetryPolicy(base_delay=2, max_elapsed=600, rules={"HTTPLocked": 20})
+    ftd_client = FTDClient("192.168.100.100", "admin", "Admin123", verify=False, retry_policy=retry_policy)
+    """
+
+    DEFAULT_RULES = {"HTTPLocked": 10, "DeploymentScheduling": 10, "HTTPServiceUnavailable": 5}
+
+    def __init__(
+        self,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        jitter: float = 0.5,
+        max_elapsed: float = 300.0,
+        rules: Optional[dict] = None,
+    ):
+        """
+        :param base_delay: float seconds to wait before the first retry
+        :param max_delay: float the longest we ever wait between two attempts
+        :param multiplier: float the delay is multiplied by this after every retry
+        :param jitter: float fraction of the delay that is randomized
+        :param max_elapsed: float give up once this many seconds have passed since the first attempt
+        :param rules: dict (Optional) retry reason: max retries. Merged over DEFAULT_RULES
+        """
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self.max_elapsed = max_elapsed
+        self.rules = dict(FTDRetryPolicy.DEFAULT_RULES, **(rules or {}))
+        self.retry_counts = {}
+        self.giveup_counts = {}
+        self.lock = Lock()
+
+    @staticmethod
+    def retry_reason(ex: Exception) -> Optional[str]:
+        """
+        :param ex: the exception a call raised
+        :return: str the retry reason of the exception or None if it is not transient
+        """
+        if isinstance(ex, HTTPLocked):
+            return "HTTPLocked"
+        if isinstance(ex, HTTPServiceUnavailable):
+            return "HTTPServiceUnavailable"
+        if isinstance(ex, HTTPUnprocessableEntity):
+            error = getattr(ex.swagger_result, "error", None)
+            for message in getattr(error, "messages", None) or []:
+                if message.description == "Failed to schedule deployment job":
+                    return "DeploymentScheduling"
+        return None
+
+    def next_delay(self, reason: str, retries: int, elapsed: float) -> Optional[float]:
+        """
+        :param reason: str the retry reason from retry_reason()
+        :param retries: int how many times this call has been retried so far
+        :param elapsed: float seconds since the first attempt of this call
+        :return: float seconds to wait before the next attempt or None if we should give up
+        """
+        delay = min(self.max_delay, self.base_delay * self.multiplier**retries)
+        delay = delay * (1 - self.jitter) + delay * self.jitter * random()
+        with self.lock:
+            if retries >= self.rules.get(reason, 0) or elapsed + delay > self.max_elapsed:
+                self.giveup_counts[reason] = self.giveup_counts.get(reason, 0) + 1
+                return None
+            self.retry_counts[reason] = self.retry_counts.get(reason, 0) + 1
+        return delay
+
+    def stats(self) -> dict:
+        """:return: dict {"retries": {reason: count}, "giveups": {reason: count}}"""
+        with self.lock:
+            return {"retries": dict(self.retry_counts), "giveups": dict(self.giveup_counts)}
@@ -1,6 +1,8 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterator, Optional
 
 log = logging.getLogger(__name__)
 
@@ -9,6 +11,7 @@ class FTDRouting:
     ################################
     # VRFs
     # TODO: Add VFR Create, Update, Delete Operations as of FTD 7.0 VRF is available with Snort 3.x
+    @list_operation("Routing", "getVirtualRouterList", obj_type="virtualrouter")
     @FTDAPIWrapper()
     def get_vrf_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -21,6 +24,18 @@ class FTDRouting:
             self.swagger_client.Routing.getVirtualRouterList(limit=limit, offset=offset, filter=filter).result().items
         )
 
+    @api_operation("Routing", "getVirtualRouterList", pages=True, filter="filter")
+    def iter_vrfs(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the VRFs one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of VirtualRouter objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Routing", "getVirtualRouterList", page_size, filter=filter)
+
+    @api_operation("Routing", "getVirtualRouter", objId="vrf_id")
     @FTDAPIWrapper()
     def get_vrf(self, vrf_id: str) -> dict:
         """
@@ -32,6 +47,7 @@ class FTDRouting:
     ################################
     # Static Routing
 
+    @list_operation("Routing", "getStaticRouteEntryList", parentId="parent_id")
     @FTDAPIWrapper()
     def get_static_route_list(
         self, parent_id: str = "default", limit: int = 9999, offset: int = 0, filter: Optional[str] = None
@@ -50,6 +66,22 @@ class FTDRouting:
             .items
         )
 
+    @api_operation("Routing", "getStaticRouteEntryList", pages=True, parentId="parent_id", filter="filter")
+    def iter_static_routes(
+        self, parent_id: str = "default", page_size: int = 100, filter: Optional[str] = None
+    ) -> Iterator:
+        """
+        Yield the static routes of a VRF one page at a time until the device has returned all of them
+        :param parent_id: str the object id of the VRF (Global vrf parent_id = "default")
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of StaticRouteEntry objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Routing", "getStaticRouteEntryList", page_size, parentId=parent_id, filter=filter)
+
+    @cache_put
+    @api_operation("Routing", "addStaticRouteEntry", parentId="parent_id", body="route_obj", at="at")
     @FTDAPIWrapper()
     def create_static_route(self, route_obj: dict, parent_id: str = "default", at=None) -> dict:
         """
@@ -72,6 +104,8 @@ class FTDRouting:
         """
         return self.swagger_client.Routing.addStaticRouteEntry(parentId=parent_id, body=route_obj, at=at).result()
 
+    @cache_put
+    @edit_operation("Routing", "editStaticRouteEntry", body="route_obj", parentId="parent_id")
     @FTDAPIWrapper()
     def edit_static_route(self, route_obj: dict, parent_id: str = "default", at=None) -> dict:
         """
@@ -86,6 +120,8 @@ class FTDRouting:
             parentId=parent_id, body=route_obj, objId=route_obj.id, at=at
         ).result()
 
+    @cache_evict("route_obj_id")
+    @api_operation("Routing", "deleteStaticRouteEntry", parentId="parent_id", objId="route_obj_id")
     @FTDAPIWrapper()
     def delete_static_route(self, route_obj_id: dict, parent_id: str = "default") -> None:
         """
@@ -114,6 +150,7 @@ class FTDRouting:
         """
         self.swagger_client.SLAMonitor.getSLAMonitor(objId=sla_monitor_id).result()
 
+    @api_operation("SLAMonitor", "getSLAMonitorList", result="items")
     @FTDAPIWrapper()
     def get_sla_monitor_status_list(self) -> list:
         """
@@ -129,6 +166,8 @@ class FTDRouting:
         """
         return self.ftd_client.swagger_client.SLAMonitor.getSLAMonitorStatus(objId=sla_obj_id).result().items
 
+    @cache_put
+    @api_operation("SLAMonitor", "addSLAMonitor", body="sla_monitor")
     @FTDAPIWrapper()
     def add_sla_monitor(self, sla_monitor: dict) -> dict:
         """
@@ -151,6 +190,8 @@ class FTDRouting:
         """
         return self.swagger_client.SLAMonitor.addSLAMonitor(body=sla_monitor).result()
 
+    @cache_put
+    @edit_operation("SLAMonitor", "editSLAMonitor", body="sla_monitor")
     @FTDAPIWrapper()
     def edit_sla_monitor(self, sla_monitor: dict) -> dict:
         """
@@ -158,6 +199,8 @@ class FTDRouting:
         """
         return self.swagger_client.SLAMonitor.editSLAMonitor(body=sla_monitor, objId=sla_monitor.id).result()
 
+    @cache_evict("sla_monitor_id")
+    @api_operation("SLAMonitor", "deleteSLAMonitor", objId="sla_monitor_id")
     @FTDAPIWrapper()
     def delete_sla_monitor(self, sla_monitor_id: str) -> None:
         """
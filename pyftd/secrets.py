@@ -1,11 +1,14 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterable, Iterator, Optional
 
 log = logging.getLogger(__name__)
 
 
 class FTDSecretObjects:
+    @list_operation("Secret", "getSecretList", obj_type="secret")
     @FTDAPIWrapper()
     def get_secret_object_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -17,6 +20,18 @@ class FTDSecretObjects:
         """
         return self.swagger_client.Secret.getSecretList(limit=limit, offset=offset, filter=filter).result().items
 
+    @api_operation("Secret", "getSecretList", pages=True, filter="filter")
+    def iter_secret_objects(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the secret objects one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of Secret objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("Secret", "getSecretList", page_size, filter=filter)
+
+    @api_operation("Secret", "getSecret", objId="secret_obj_id")
     @FTDAPIWrapper()
     def get_secret_object(self, secret_obj_id: str) -> dict:
         """
@@ -26,6 +41,8 @@ class FTDSecretObjects:
         """
         return self.swagger_client.Secret.getSecret(objId=secret_obj_id).result()
 
+    @cache_put
+    @api_operation("Secret", "addSecret", body="secret_obj")
     @FTDAPIWrapper()
     def create_secret_object(self, secret_obj: dict) -> dict:
         """
@@ -41,6 +58,8 @@ class FTDSecretObjects:
         """
         return self.swagger_client.Secret.addSecret(body=secret_obj).result()
 
+    @cache_put
+    @edit_operation("Secret", "editSecret", body="secret_obj")
     @FTDAPIWrapper()
     def edit_secret_object(self, secret_obj) -> dict:
         """
@@ -51,6 +70,8 @@ class FTDSecretObjects:
         """
         return self.swagger_client.Secret.editSecret(body=secret_obj, objId=secret_obj.id).result()
 
+    @cache_evict("secret_obj_id")
+    @api_operation("Secret", "deleteSecret", objId="secret_obj_id")
     @FTDAPIWrapper()
     def delete_secret_object(self, secret_obj_id: str) -> None:
         """
@@ -58,3 +79,23 @@ class FTDSecretObjects:
         :param secret_obj_id: str uuid of the secret object
         """
         return self.swagger_client.Secret.deleteSecret(objId=secret_obj_id).result()
+
+    def upsert_secret_object(self, secret_obj: dict) -> dict:
+        """
+        Create a secret object, or bring the existing secret object of the same name up to date (see
+        FTDBulkOperations.upsert). The device never returns the password of a secret, so a secret_obj with a password
+        is always sent to the device when the name already exists.
+        :param secret_obj: dict (see create_secret_object)
+        :return: dict the created, edited or unchanged Secret object
+        """
+        return self.upsert(secret_obj, self.create_secret_object, self.edit_secret_object)
+
+    def bulk_upsert_secret_objects(self, secret_objs: Iterable, chunk_size: int = 500) -> list:
+        """
+        Upsert many secret objects, at most max_in_flight at the same time (see upsert_secret_object)
+        :param secret_objs: iterable of secret object dicts (see create_secret_object)
+        :param chunk_size: int the number of objects handled per round
+        :return: list of FTDBulkResult, one per object and in the same order, with the status created, edited,
+                 unchanged or failed
+        """
+        return self.bulk_upsert(secret_objs, self.create_secret_object, self.edit_secret_object, chunk_size=chunk_size)
@@ -0,0 +1,222 @@
+import gzip
+import json
+import logging
+from .compare import to_plain
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from queue import Empty, Full, Queue
+from threading import Event
+from time import perf_counter
+from typing import Callable, Iterable, Iterator, Optional
+
+log = logging.getLogger(__name__)
+
+# The list operations whose records are parents of another list: swagger list operation: child list operation
+SNAPSHOT_CHILDREN = {
+    "getPhysicalInterfaceList": "getSubInterfaceList",
+    "getObjectNatRuleContainerList": "getObjectNatRuleList",
+    "getManualNatRuleContainerList": "getManualNatRuleList",
+    "getVirtualRouterList": "getStaticRouteEntryList",
+}
+
+# The type of the records of the child list operations
+SNAPSHOT_CHILD_TYPES = {
+    "getSubInterfaceList": "subinterface",
+    "getObjectNatRuleList": "objectnatrule",
+    "getManualNatRuleList": "manualnatrule",
+    "getStaticRouteEntryList": "staticrouteentry",
+}
+
+# Operational state rather than configuration, it would differ between any two snapshots
+SNAPSHOT_SKIP = ("getInterfaceDataList",)
+
+# The platform settings that are not paged lists, by the client method that reads them
+SNAPSHOT_SETTINGS = (
+    "get_ntp_servers_list",
+    "get_hostname_list",
+    "get_mgmt_dns_settings_list",
+    "get_data_dns_settings_list",
+)
+
+
+def iter_snapshot(path: str, numbered: bool = False, lines: Optional[set] = None) -> Iterator:
+    """
+    Read the records of a snapshot file one at a time, see FTDSnapshot.snapshot()
+    :param path: str the .jsonl.gz file
+    :param numbered: bool yield tuples (line number, record) instead of the records
+    :param lines: set of int (Optional) only parse and yield these lines, numbered
+    :return: generator of dicts with the type, name, parent and object of every record
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as snapshot_file:
+        for line_no, line in enumerate(snapshot_file):
+            if lines is not None and line_no not in lines:
+                continue
+            record = json.loads(line)
+            if "object" in record:  # not the snapshot header or summary
+                yield (line_no, record) if numbered or lines is not None else record
+
+
+class FTDSnapshot:
+    """
+    Export the configuration of a device to a gzip compressed JSON lines file.
+
+    Every paged list the client wraps is read, with the sub-interfaces, NAT rules and static routes of their
+    interfaces, NAT containers and VRFs, and the platform settings (NTP, hostname and DNS). The lists are read at the
+    same time, at most max_in_flight at a time, one page at a time, and a single writer streams the records to the file
+    as they arrive. Memory use does not grow with the size of the configuration.
+
+    The first line of the file describes the snapshot, the last one summarizes it, and every line in between is a
+    record: {"type": "networkobject", "name": "WEB-SERVER", "parent": None, "object": {...}}. parent is the name of
+    the NAT container, VRF or physical interface of NAT rules, static routes and sub-interfaces. Use iter_snapshot()
+    to read the records back.
+
+    Sample usage:
+
+    summary = ftd_client.snapshot("/backups/ftd1.jsonl.gz")
+    print(summary["records"], summary["errors"])
+    """
+
+    def snapshot_sources(self, page_size: int = 100, obj_types: Optional[Iterable[str]] = None) -> dict:
+        """
+        :param page_size: int the number of records to request per page
+        :param obj_types: iterable of str (Optional) only the sources of these record types, like "networkobject" or
+                          "manualnatrule", by default all of them
+        :return: dict source name: callable that yields the records of one list operation (and of its children) or of
+                 one platform setting
+        """
+        list_methods = {}  # swagger list operation: get_*_list method
+        for name in dir(type(self)):
+            operation = getattr(getattr(type(self), name, None), "swagger_operation", None)
+            if operation is not None:
+                list_methods[operation] = getattr(self, name)
+
+        obj_types = set(obj_types) if obj_types is not None else None
+        sources = {}
+        child_operations = set(SNAPSHOT_CHILDREN.values())
+        for operation, list_method in list_methods.items():
+            if operation in SNAPSHOT_SKIP or operation in child_operations:
+                continue
+            if not hasattr(getattr(self.swagger_client, list_method.swagger_resource, None), operation):
+                continue  # not on this platform or api version
+            child_operation = SNAPSHOT_CHILDREN.get(operation)
+            record_types = {list_method.swagger_obj_type, SNAPSHOT_CHILD_TYPES.get(child_operation)}
+            if obj_types is not None and not record_types & obj_types:
+                continue
+            child_method = list_methods.get(child_operation)
+            sources[operation] = lambda list_method=list_method, child_method=child_method: self.snapshot_records(
+                list_method, child_method, page_size
+            )
+        for name in SNAPSHOT_SETTINGS if obj_types is None else ():
+            sources[name] = lambda name=name: (FTDSnapshot.record(obj, name) for obj in getattr(self, name)() or [])
+        return sources
+
+    def snapshot_records(self, list_method, child_method=None, page_size: int = 100) -> Iterator[dict]:
+        """
+        :param list_method: a get_*_list method tagged with @list_operation
+        :param child_method: (Optional) the get_*_list method of the children of the listed objects
+        :param page_size: int the number of records to request per page
+        :return: generator of the records of list_method, then of the children of every record
+        """
+        parents = []  # (id, name), a handful of containers, VRFs or physical interfaces
+        for obj in self.iter_pages(list_method.swagger_resource, list_method.swagger_operation, page_size):
+            yield FTDSnapshot.record(obj, list_method.swagger_operation)
+            if child_method is not None:
+                parents.append((obj.id, getattr(obj, "hardwareName", None) or obj.name))
+        for parent_id, parent_name in parents:
+            child_records = self.iter_pages(
+                child_method.swagger_resource, child_method.swagger_operation, page_size, parentId=parent_id
+            )
+            for obj in child_records:
+                yield FTDSnapshot.record(obj, child_method.swagger_operation, parent_name)
+
+    @staticmethod
+    def record(obj, source: str, parent: Optional[str] = None) -> dict:
+        """
+        :param obj: a swagger model object
+        :param source: str the list operation or method that read it, the type of objects without one
+        :param parent: str (Optional) the name of the object it belongs to
+        :return: dict one line of a snapshot
+        """
+        obj = to_plain(obj)
+        return {"type": obj.get("type") or source, "name": obj.get("name"), "parent": parent, "object": obj}
+
+    def stream_records(self, sources: dict, queue_size: int = 1000) -> Iterator[tuple]:
+        """
+        Run the sources at the same time, at most max_in_flight at a time, and hand their records to the caller as they
+        arrive. The readers pause when queue_size records are waiting, and give up when the caller stops iterating.
+        :param sources: dict source name: callable that yields records, see snapshot_sources()
+        :param queue_size: int the number of records that may wait for the caller
+        :return: generator of tuples ("record", record) or ("error", source name, exception) for a failed source
+        """
+        records = Queue(maxsize=queue_size)
+        stopped = Event()
+
+        def put(item) -> None:
+            while not stopped.is_set():
+                try:
+                    return records.put(item, timeout=1)
+                except Full:
+                    continue
+
+        def read(name: str, source: Callable) -> None:
+            try:
+                for snapshot_record in source():
+                    if stopped.is_set():
+                        return
+                    put(("record", snapshot_record))
+            except Exception as ex:
+                log.error(f"Reading {name} failed: {ex!r}")
+                put(("error", name, ex))
+            finally:
+                put(("done", name))
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight, thread_name_prefix="pyftd-snapshot") as executor:
+            for name, source in sources.items():
+                executor.submit(read, name, source)
+            try:
+                pending = len(sources)
+                while pending:
+                    try:
+                        item = records.get(timeout=1)
+                    except Empty:
+                        continue
+                    if item[0] == "done":
+                        pending -= 1
+                    else:
+                        yield item
+            finally:
+                stopped.set()
+
+    def snapshot(self, path: str, page_size: int = 100, compresslevel: int = 6, queue_size: int = 1000) -> dict:
+        """
+        Write the configuration of the device to a .jsonl.gz file
+        :param path: str the file to write
+        :param page_size: int the number of records to request per page
+        :param compresslevel: int the gzip compression level, 1 (fastest) to 9 (smallest)
+        :param queue_size: int the number of records that may wait for the writer, the readers pause when it is full
+        :return: dict summary with the number of records per type, the sources that failed and the elapsed seconds
+        """
+        started = perf_counter()
+        counts, errors = {}, {}
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=compresslevel) as snapshot_file:
+            header = {
+                "ftd_ip": self.ftd_ip,
+                "api_version": self.api_version,
+                "taken_at": datetime.now(timezone.utc).isoformat(),
+            }
+            snapshot_file.write(json.dumps({"snapshot": header}) + "\n")
+            for item in self.stream_records(self.snapshot_sources(page_size), queue_size):
+                if item[0] == "record":
+                    snapshot_file.write(json.dumps(item[1], default=str) + "\n")
+                    counts[item[1]["type"]] = counts.get(item[1]["type"], 0) + 1
+                else:
+                    errors[item[1]] = repr(item[2])
+            summary = {
+                "records": sum(counts.values()),
+                "types": counts,
+                "errors": errors,
+                "elapsed": round(perf_counter() - started, 3),
+            }
+            snapshot_file.write(json.dumps({"summary": summary}) + "\n")
+        log.info(f"Snapshot of {self.ftd_ip} to {path}: {summary['records']} records in {summary['elapsed']}s")
+        return summary
@@ -0,0 +1,130 @@
+import json
+import logging
+from .compare import field_changes, normalize_json
+from .snapshot import iter_snapshot
+from hashlib import blake2b
+from typing import Iterable, Iterator, Optional
+
+log = logging.getLogger(__name__)
+
+
+def record_keys(records: Iterable[dict]) -> Iterator[tuple]:
+    """
+    :param records: the numbered records of a snapshot, see iter_snapshot()
+    :return: generator of tuples ((key, record), line number). The key is (type, parent, name, occurrence): records are matched by
+             what they are called, not by their id, which differs between devices. occurrence counts the records with
+             the same type, parent and name, like the unnamed platform settings.
+    """
+    seen = {}
+    for line_no, record in records:
+        key = (record["type"], record["parent"], record["name"])
+        seen[key] = seen.get(key, -1) + 1
+        yield (key + (seen[key],), record), line_no
+
+
+def digest(obj: dict) -> bytes:
+    """:return: bytes a hash of the normalized json object (see compare.normalize)"""
+    return blake2b(
+        json.dumps(normalize_json(obj), sort_keys=True, separators=(",", ":")).encode(), digest_size=16
+    ).digest()
+
+
+class FTDSnapshotChange(object):
+    """
+    One difference between two snapshots, see diff_snapshots()
+
+    status is added (only in the new snapshot), removed (only in the old one) or changed. old and new are the objects
+    of the record in the old and the new snapshot, None where there is none. fields holds the top level fields of a
+    changed record: field name: (old value, new value), without the server managed fields like id and version.
+    """
+
+    def __init__(
+        self,
+        status: str,
+        obj_type: str,
+        name: Optional[str],
+        parent: Optional[str] = None,
+        old: Optional[dict] = None,
+        new: Optional[dict] = None,
+        fields: Optional[dict] = None,
+    ):
+        self.status = status
+        self.obj_type = obj_type
+        self.name = name
+        self.parent = parent
+        self.old = old
+        self.new = new
+        self.fields = fields or {}
+
+    def __repr__(self):
+        return (
+            f"FTDSnapshotChange(status={self.status!r}, type={self.obj_type!r}, name={self.name!r}, "
+            f"parent={self.parent!r}, fields={sorted(self.fields)!r})"
+        )
+
+
+def diff_snapshots(old_path: str, new_path: str, ignore_types: Iterable[str] = ()) -> Iterator[FTDSnapshotChange]:
+    """
+    Compare two snapshot files, of one device at two times or of two devices like an HA pair or a template and a
+    branch. Records are matched by type, parent and name and compared without their server managed fields (see
+    compare.normalize), so the ids of the objects do not matter.
+
+    Neither snapshot is held in memory. The old one is read into an index of two small hashes per record, the new one
+    is streamed against that index, and only the lines of the old one that changed or were removed are parsed again.
+    Added records are yielded while the new snapshot is read, then the changed and removed ones in the order of the
+    old snapshot.
+
+    Sample usage:
+
+    for change in diff_snapshots("/backups/ftd1-monday.jsonl.gz", "/backups/ftd1-tuesday.jsonl.gz"):
+        print(change.status, change.obj_type, change.name, list(change.fields))
+
+    :param old_path: str the .jsonl.gz file of the old (or reference) snapshot
+    :param new_path: str the .jsonl.gz file of the new snapshot
+    :param ignore_types: iterable of str record types to leave out, like "devicehostname" when comparing two devices
+    :return: generator of FTDSnapshotChange
+    """
+    ignore_types = set(ignore_types)
+
+    def records(path: str) -> Iterator[tuple]:
+        for (key, record), line_no in record_keys(iter_snapshot(path, numbered=True)):
+            if record["type"] not in ignore_types:
+                yield blake2b(repr(key).encode(), digest_size=16).digest(), line_no, record
+
+    index = {key_hash: (digest(record["object"]), line_no) for key_hash, line_no, record in records(old_path)}
+    changed = {}  # line of the old record: new record, only for the records that differ
+    for key_hash, _, record in records(new_path):
+        old_digest, line_no = index.pop(key_hash, (None, None))
+        if old_digest is None:
+            yield FTDSnapshotChange("added", record["type"], record["name"], record["parent"], new=record["object"])
+        elif old_digest != digest(record["object"]):
+            changed[line_no] = record
+    removed = {line_no for _, line_no in index.values()}  # what is left of the old snapshot was not in the new one
+
+    # Only the lines we need are parsed again
+    for line_no, record in iter_snapshot(old_path, lines=removed | set(changed)):
+        if line_no in removed:
+            yield FTDSnapshotChange("removed", record["type"], record["name"], record["parent"], old=record["object"])
+        else:
+            new = changed[line_no]["object"]
+            yield FTDSnapshotChange(
+                "changed",
+                record["type"],
+                record["name"],
+                record["parent"],
+                old=record["object"],
+                new=new,
+                fields=field_changes(record["object"], new),
+            )
+
+
+def summarize(changes: Iterable[FTDSnapshotChange]) -> dict:
+    """
+    :param changes: the output of diff_snapshots()
+    :return: dict type: dict with the number of added, removed and changed records of that type
+    """
+    summary = {}
+    for change in changes:
+        counts = summary.setdefault(change.obj_type, {"added": 0, "removed": 0, "changed": 0})
+        counts[change.status] += 1
+    return summary
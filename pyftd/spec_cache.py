@@ -0,0 +1,197 @@
+import logging
+import json
+import os
+import re
+import tempfile
+from os import environ, path
+from threading import Lock
+from time import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FTDSpecCache(object):
+    """
+    An on-disk cache for the ngfw.json swagger spec that FDM serves at /apispec/ngfw.json
+
+    The spec only changes when the software on the device changes, so every spec is stored under a key built from the
+    API version (see FTDBaseClient.get_api_version) and the software build of the device. Any number of clients, for
+    any number of devices running the same code, can then share a single download of the spec.
+
+    The cache also remembers which spec every device was last seen with, under the api version it reported. For
+    device_ttl seconds after its software build was last read, a client of a known device finds its spec with nothing
+    but the /api/versions answer that it needs anyway, without logging in first or asking the device for its software
+    build. A device that reports a different api version, or whose entry is older than device_ttl, is looked up again,
+    so an upgrade that keeps the api version is noticed at the latest device_ttl seconds later.
+
+    The cache is bounded by the number of entries and by the total number of bytes on disk. When either bound is
+    exceeded, the least recently used spec files are removed first.
+
+    Sample usage:
+
+    spec_cache = FTDSpecCache("/var/tmp/pyftd", max_entries=8, device_ttl=600)
+    ftd_client = FTDClient("192.168.100.100", "admin", "Admin123", verify=False, spec_cache=spec_cache)
+    """
+
+    FILE_PREFIX = "ngfw-"
+    FILE_SUFFIX = ".json"
+    DEVICES_FILE = "devices.json"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: int = 16,
+        max_bytes: int = 256 * 1024 * 1024,
+        device_ttl: float = 3600,
+    ):
+        """
+        :param cache_dir: str directory that holds the cached specs. Defaults to $PYFTD_SPEC_CACHE or ~/.cache/pyftd
+        :param max_entries: int the maximum number of specs to keep on disk
+        :param max_bytes: int the maximum number of bytes all cached specs may use on disk
+        :param device_ttl: float seconds a device is trusted to run the software build it was last seen with
+        """
+        if cache_dir is None:
+            cache_dir = environ.get("PYFTD_SPEC_CACHE") or path.join(path.expanduser("~"), ".cache", "pyftd")
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.device_ttl = device_ttl
+        self.devices_lock = Lock()  # clients of a fleet update the devices file at the same time
+
+    @staticmethod
+    def cache_key(api_version: int, software_version: str) -> str:
+        """
+        Build the cache key for a device
+        :param api_version: int the api version as returned by FTDBaseClient.get_api_version()
+        :param software_version: str the software build of the device like "7.0.1-84"
+        :return: str cache key that is safe to use as part of a filename
+        """
+        return re.sub(r"[^A-Za-z0-9._-]", "_", f"v{api_version}-{software_version}")
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return the cached spec for the given key or None if we have not cached this spec yet
+        :param key: str cache key from cache_key()
+        :return: dict swagger spec
+        """
+        spec_file = self._spec_file(key)
+        try:
+            with open(spec_file, "r") as fp:
+                spec_dict = json.load(fp)
+        except FileNotFoundError:
+            logger.debug(f"Swagger spec cache miss for {key}")
+            return None
+        except (OSError, ValueError) as ex:
+            logger.warning(f"Discarding unreadable swagger spec cache file {spec_file}: {ex}")
+            self._remove(spec_file)
+            return None
+        try:
+            os.utime(spec_file)  # Mark the entry as recently used for the eviction policy
+        except OSError:
+            pass
+        logger.debug(f"Swagger spec cache hit for {key}")
+        return spec_dict
+
+    def device_key(self, device: str, api_version: int) -> Optional[str]:
+        """
+        Return the cache key of the spec a device was last seen with, if its software build was read within device_ttl
+        :param device: str the base url of the device like "https://192.168.100.100"
+        :param api_version: int the api version the device reports now
+        :return: str cache key or None if the device is unknown, reported a different api version back then or its
+        software build has to be read again
+        """
+        entry = self._read_devices().get(device)
+        if not entry or entry.get("api_version") != api_version:
+            return None
+        if not 0 <= time() - entry.get("checked_at", 0) < self.device_ttl:
+            logger.debug(f"The software build of {device} is older than {self.device_ttl}s, reading it again")
+            return None
+        return entry.get("key")
+
+    def put_device(self, device: str, api_version: int, key: str) -> None:
+        """
+        Remember the spec of a device after its software build was read, see device_key()
+        :param device: str the base url of the device like "https://192.168.100.100"
+        :param api_version: int the api version the device reports
+        :param key: str cache key from cache_key()
+        """
+        entry = {"api_version": api_version, "key": key, "checked_at": time()}
+        with self.devices_lock:
+            devices = self._read_devices()
+            devices[device] = entry
+            self._write_json(self.DEVICES_FILE, devices)
+
+    def put(self, key: str, spec_dict: dict) -> None:
+        """
+        Store a spec in the cache and then enforce the size bounds of the cache
+        :param key: str cache key from cache_key()
+        :param spec_dict: dict swagger spec
+        """
+        if self._write_json(path.basename(self._spec_file(key)), spec_dict):
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used specs until the cache is within max_entries and max_bytes"""
+        entries = []
+        for file_name in self._spec_files():
+            spec_file = path.join(self.cache_dir, file_name)
+            try:
+                stat = os.stat(spec_file)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, spec_file))
+        entries.sort(reverse=True)  # most recently used first
+
+        total_bytes = 0
+        for count, (_, size, spec_file) in enumerate(entries, start=1):
+            total_bytes += size
+            if count > self.max_entries or total_bytes > self.max_bytes:
+                logger.debug(f"Evicting {spec_file} from the swagger spec cache")
+                self._remove(spec_file)
+
+    def clear(self) -> None:
+        """Remove every cached spec"""
+        for file_name in self._spec_files():
+            self._remove(path.join(self.cache_dir, file_name))
+        self._remove(path.join(self.cache_dir, self.DEVICES_FILE))
+
+    def _write_json(self, file_name: str, data: dict) -> bool:
+        """:return: True if data was written to file_name in the cache directory"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temp file and rename it so concurrent clients never read a partially written file
+        fd, tmp_file = tempfile.mkstemp(dir=self.cache_dir, prefix=".tmp-", suffix=self.FILE_SUFFIX)
+        try:
+            with os.fdopen(fd, "w") as fp:
+                json.dump(data, fp)
+            os.replace(tmp_file, path.join(self.cache_dir, file_name))
+        except OSError as ex:
+            logger.warning(f"Unable to write {file_name} to the swagger spec cache: {ex}")
+            self._remove(tmp_file)
+            return False
+        return True
+
+    def _read_devices(self) -> dict:
+        try:
+            with open(path.join(self.cache_dir, self.DEVICES_FILE), "r") as fp:
+                devices = json.load(fp)
+        except (OSError, ValueError):
+            return {}
+        return devices if isinstance(devices, dict) else {}
+
+    def _spec_file(self, key: str) -> str:
+        return path.join(self.cache_dir, f"{self.FILE_PREFIX}{key}{self.FILE_SUFFIX}")
+
+    def _spec_files(self) -> list:
+        try:
+            file_names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        return [f for f in file_names if f.startswith(self.FILE_PREFIX) and f.endswith(self.FILE_SUFFIX)]
+
+    @staticmethod
+    def _remove(file_path: str) -> None:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
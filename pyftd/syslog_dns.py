@@ -1,6 +1,8 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterator, Optional
 
 log = logging.getLogger(__name__)
 
@@ -8,6 +10,7 @@ log = logging.getLogger(__name__)
 class FTDSyslogDNSObjects:
     #############################
     # DNSGroup Objects
+    @list_operation("DNS", "getDNSServerGroupList", obj_type="dnsservergroup")
     @FTDAPIWrapper()
     def get_dnsgroup_object_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -20,6 +23,18 @@ class FTDSyslogDNSObjects:
         """
         return self.swagger_client.DNS.getDNSServerGroupList(limit=limit, offset=offset, filter=filter).result().items
 
+    @api_operation("DNS", "getDNSServerGroupList", pages=True, filter="filter")
+    def iter_dnsgroup_objects(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the DNS server groups one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of DNSServerGroup objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("DNS", "getDNSServerGroupList", page_size, filter=filter)
+
+    @api_operation("DNS", "getDNSServerGroup", objId="dns_grp_obj_id")
     @FTDAPIWrapper()
     def get_dnsgroup_object(self, dns_grp_obj_id: str) -> dict:
         """
@@ -27,6 +42,8 @@ class FTDSyslogDNSObjects:
         """
         return self.swagger_client.DNS.getDNSServerGroup(objId=dns_grp_obj_id).result()
 
+    @cache_put
+    @api_operation("DNS", "addDNSServerGroup", body="dns_server_group_obj")
     @FTDAPIWrapper()
     def create_dnsgroup_object(self, dns_server_group_obj: dict) -> dict:
         """
@@ -47,6 +64,8 @@ class FTDSyslogDNSObjects:
         """
         return self.swagger_client.DNS.addDNSServerGroup(body=dns_server_group_obj).result()
 
+    @cache_put
+    @edit_operation("DNS", "editDNSServerGroup", body="dns_server_group_obj")
     def edit_dnsgroup_object(self, dns_server_group_obj: dict) -> dict:
         """
         Add a DNSServerGroup object
@@ -58,6 +77,8 @@ class FTDSyslogDNSObjects:
             body=dns_server_group_obj, objId=dns_server_group_obj.id
         ).result()
 
+    @cache_evict("dns_grp_obj_id")
+    @api_operation("DNS", "deleteDNSServerGroup", objId="dns_grp_obj_id")
     @FTDAPIWrapper()
     def delete_dnsgroup_object(self, dns_grp_obj_id: str) -> dict:
         """
@@ -67,6 +88,7 @@ class FTDSyslogDNSObjects:
 
     #############################
     # Syslog Server Objects
+    @list_operation("SyslogServer", "getSyslogServerList", obj_type="syslogserver")
     @FTDAPIWrapper()
     def get_syslog_server_object_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -83,6 +105,18 @@ class FTDSyslogDNSObjects:
             .items
         )
 
+    @api_operation("SyslogServer", "getSyslogServerList", pages=True, filter="filter")
+    def iter_syslog_server_objects(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the syslog server objects one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of SyslogServer objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("SyslogServer", "getSyslogServerList", page_size, filter=filter)
+
+    @api_operation("SyslogServer", "getSyslogServer", objId="syslog_obj_id")
     @FTDAPIWrapper()
     def get_syslog_server_object(self, syslog_obj_id: str) -> dict:
         """
@@ -93,6 +127,8 @@ class FTDSyslogDNSObjects:
         """
         return self.swagger_client.SyslogServer.getSyslogServer(objId=syslog_obj_id).result()
 
+    @cache_put
+    @api_operation("SyslogServer", "addSyslogServer", body="syslog_obj")
     @FTDAPIWrapper()
     def create_syslog_server_object(self, syslog_obj: dict) -> dict:
         """
@@ -116,6 +152,8 @@ class FTDSyslogDNSObjects:
         """
         return self.swagger_client.SyslogServer.addSyslogServer(body=syslog_obj).result()
 
+    @cache_put
+    @edit_operation("SyslogServer", "editSyslogServer", body="syslog_obj")
     @FTDAPIWrapper()
     def edit_syslog_server_object(self, syslog_obj: dict) -> dict:
         """
@@ -126,6 +164,8 @@ class FTDSyslogDNSObjects:
         """
         return self.swagger_client.SyslogServer.editSyslogServer(body=syslog_obj, objId=syslog_obj.id).result()
 
+    @cache_evict("syslog_obj_id")
+    @api_operation("SyslogServer", "deleteSyslogServer", objId="syslog_obj_id")
     @FTDAPIWrapper()
     def delete_syslog_server_object(self, syslog_obj_id: str) -> dict:
         """
@@ -0,0 +1,101 @@
+import logging
+from threading import Lock
+from time import monotonic
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FTDTokenManager(object):
+    """
+    Keeps track of the lifetime of the FDM access token and refreshes it before it expires.
+
+    FDM answers a token request with something like:
+    {
+        "access_token": "eyJhbGciOiJIUzI1NiJ9...",
+        "expires_in": 1800,
+        "token_type": "Bearer",
+        "refresh_token": "eyJhbGciOiJIUzI1NiJ9...",
+        "refresh_expires_in": 2400
+    }
+
+    Once the access token is within refresh_margin seconds of expiring, ensure_token() asks the client for a new one
+    with the refresh_token grant. The password grant is only used when there is no usable refresh token or the refresh
+    is rejected. ensure_token() is called by FTDAPIWrapper before every API call, so long running jobs never have to
+    take the 401 round trip in their hot path.
+    """
+
+    def __init__(self, client, refresh_margin: int = 60):
+        """
+        :param client: FTDBaseClient the client that knows how to talk to /fdm/token
+        :param refresh_margin: int refresh the token this many seconds before it expires
+        """
+        self.client = client
+        self.refresh_margin = refresh_margin
+        self.token = None
+        self.access_expires_at = None
+        self.refresh_expires_at = None
+        self.lock = Lock()
+
+    def set_token(self, token: dict) -> None:
+        """
+        Record a token response from /fdm/token and compute when it, and its refresh token, will expire
+        :param token: dict the json response of the token request
+        """
+        now = monotonic()
+        self.token = token
+        self.access_expires_at = now + token["expires_in"] if token.get("expires_in") else None
+        if token.get("refresh_token") and token.get("refresh_expires_in"):
+            self.refresh_expires_at = now + token["refresh_expires_in"]
+        else:
+            self.refresh_expires_at = None
+
+    def needs_refresh(self) -> bool:
+        """:return: True if we have no token or it is about to expire"""
+        if self.token is None:
+            return True
+        if self.access_expires_at is None:  # The device did not tell us, so let the 401 handler deal with it
+            return False
+        return monotonic() >= self.access_expires_at - self.refresh_margin
+
+    def can_refresh(self) -> bool:
+        """:return: True if we hold a refresh token that is not about to expire"""
+        if self.refresh_expires_at is None:
+            return False
+        return monotonic() < self.refresh_expires_at - self.refresh_margin
+
+    def ensure_token(self) -> None:
+        """Make sure the client holds an access token that will not expire within refresh_margin seconds"""
+        if not self.needs_refresh():
+            return
+        with self.lock:
+            if not self.needs_refresh():  # Another thread refreshed the token while we waited for the lock
+                return
+            self.renew()
+
+    def renew_rejected(self, rejected_token: Optional[str]) -> None:
+        """
+        Log in again after the device rejected a token with a 401. Threads that were rejected at the same time wait for
+        the first one to log in and then use its token, instead of logging in once each.
+        :param rejected_token: str the access token the 401 answered, see access_token
+        """
+        with self.lock:
+            if self.access_token == rejected_token:
+                self.client.get_access_token()
+
+    def renew(self) -> None:
+        """Get a new access token, with the refresh_token grant if we can, otherwise with the password grant"""
+        if self.can_refresh():
+            logger.debug("Access token is about to expire. Refreshing it with the refresh_token grant.")
+            if self.client.refresh_access_token() is None:
+                return
+            logger.warning("The refresh_token grant failed. Falling back to the password grant.")
+        self.client.get_access_token()
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self.token.get("access_token") if self.token else None
+
+    @property
+    def refresh_token(self) -> Optional[str]:
+        return self.token.get("refresh_token") if self.token else None
@@ -1,11 +1,14 @@
 import logging
-from .base import FTDAPIWrapper
-from typing import Optional
+from .base import FTDAPIWrapper, api_operation, list_operation
+from .compare import edit_operation
+from .object_cache import cache_evict, cache_put
+from typing import Iterable, Iterator, Optional
 
 log = logging.getLogger(__name__)
 
 
 class FTDURLObjects:
+    @list_operation("URLObject", "getURLObjectList", obj_type="urlobject")
     @FTDAPIWrapper()
     def get_url_object_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -17,6 +20,18 @@ class FTDURLObjects:
         """
         return self.swagger_client.URLObject.getURLObjectList(limit=limit, offset=offset, filter=filter).result().items
 
+    @api_operation("URLObject", "getURLObjectList", pages=True, filter="filter")
+    def iter_url_objects(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the url objects one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of URLObject objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("URLObject", "getURLObjectList", page_size, filter=filter)
+
+    @api_operation("URLObject", "getURLObject", objId="url_id")
     @FTDAPIWrapper()
     def get_url_object(self, url_id: str) -> dict:
         """
@@ -27,6 +42,8 @@ class FTDURLObjects:
         """
         return self.swagger_client.URLObject.getURLObject(objId=url_id).result()
 
+    @cache_put
+    @api_operation("URLObject", "addURLObject", body="url_obj")
     @FTDAPIWrapper()
     def create_url_object(self, url_obj: dict) -> dict:
         """
@@ -43,6 +60,8 @@ class FTDURLObjects:
         """
         return self.swagger_client.URLObject.addURLObject(body=url_obj).result()
 
+    @cache_put
+    @edit_operation("URLObject", "editURLObject", body="url_obj")
     @FTDAPIWrapper()
     def edit_url_object(self, url_obj: dict) -> dict:
         """
@@ -53,6 +72,8 @@ class FTDURLObjects:
         """
         return self.swagger_client.URLObject.editURLObject(body=url_obj, objId=url_obj.id).result()
 
+    @cache_evict("url_id")
+    @api_operation("URLObject", "deleteURLObject", objId="url_id")
     @FTDAPIWrapper()
     def delete_url_object(self, url_id: str) -> None:
         """
@@ -62,6 +83,7 @@ class FTDURLObjects:
         """
         return self.swagger_client.URLObject.deleteURLObject(objId=url_id).result()
 
+    @list_operation("URLObject", "getURLObjectGroupList", obj_type="urlobjectgroup")
     @FTDAPIWrapper()
     def get_url_object_group_list(self, limit: int = 9999, offset: int = 0, filter: Optional[str] = None) -> list:
         """
@@ -80,6 +102,18 @@ class FTDURLObjects:
             .items
         )
 
+    @api_operation("URLObject", "getURLObjectGroupList", pages=True, filter="filter")
+    def iter_url_object_groups(self, page_size: int = 100, filter: Optional[str] = None) -> Iterator:
+        """
+        Yield the url object groups one page at a time until the device has returned all of them
+        :param page_size: number of records to request per page
+        :param filter: limit returned results based on filters like "name:foo" or "fts~bar"
+        :return: generator of URLObjectGroup objects
+        :rtype: Iterator
+        """
+        return self.iter_pages("URLObject", "getURLObjectGroupList", page_size, filter=filter)
+
+    @api_operation("URLObject", "getURLObjectGroup", objId="url_group_id")
     @FTDAPIWrapper()
     def get_url_object_group(self, url_group_id: str) -> dict:
         """
@@ -90,6 +124,8 @@ class FTDURLObjects:
         """
         return self.swagger_client.URLObject.getURLObjectGroup(objId=url_group_id).result()
 
+    @cache_put
+    @api_operation("URLObject", "addURLObjectGroup", body="url_obj_grp")
     @FTDAPIWrapper()
     def create_url_object_group(self, url_obj_grp: dict) -> dict:
         """
@@ -105,6 +141,8 @@ class FTDURLObjects:
         """
         return self.swagger_client.URLObject.addURLObjectGroup(body=url_obj_grp).result()
 
+    @cache_put
+    @edit_operation("URLObject", "editURLObjectGroup", body="url_group_obj")
     @FTDAPIWrapper()
     def edit_url_object_group(self, url_group_obj: str) -> dict:
         """
@@ -115,6 +153,8 @@ class FTDURLObjects:
         """
         return self.swagger_client.URLObject.editURLObjectGroup(body=url_group_obj, objId=url_group_obj.id).result()
 
+    @cache_evict("url_group_id")
+    @api_operation("URLObject", "deleteURLObjectGroup", objId="url_group_id")
     @FTDAPIWrapper()
     def delete_url_object_group(self, url_group_id: str) -> None:
         """
@@ -122,4 +162,31 @@ class FTDURLObjects:
         :param url_group_id: uuid of the URLObjectGroup object
         :return: none
         """
-        return self.swagger_client.URLObject.deleteURLObjectGroup(objId=url_group_id).result()
\ No newline at end of file
+        return self.swagger_client.URLObject.deleteURLObjectGroup(objId=url_group_id).result()
+
+    def upsert_url_object(self, url_obj: dict) -> dict:
+        """
+        Create a URL object, or bring the existing URL object of the same name up to date. The object is only edited
+        if one of the fields of url_obj differs on the device (see FTDBulkOperations.upsert)
+        :param url_obj: dict (see create_url_object)
+        :return: the created, edited or unchanged URL object
+        """
+        return self.upsert(url_obj, self.create_url_object, self.edit_url_object)
+
+    def bulk_upsert_url_objects(self, url_objs: Iterable, chunk_size: int = 500) -> list:
+        """
+        Upsert many URL objects, at most max_in_flight at the same time
+        :param url_objs: iterable of URL object dicts (see create_url_object)
+        :param chunk_size: int the number of objects handled per round
+        :return: list of FTDBulkResult, one per object and in the same order, with the status created, edited,
+                 unchanged or failed
+        """
+        return self.bulk_upsert(url_objs, self.create_url_object, self.edit_url_object, chunk_size=chunk_size)
+
+    def upsert_url_object_group(self, url_obj_grp: dict) -> dict:
+        """
+        Create a URL object group, or bring the existing group of the same name up to date (see upsert_url_object)
+        :param url_obj_grp: dict (see create_url_object_group)
+        :return: the created, edited or unchanged URL object group
+        """
+        return self.upsert(url_obj_grp, self.create_url_object_group, self.edit_url_object_group)
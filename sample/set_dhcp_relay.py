@@ -1,4 +1,4 @@
-from pyftd import FTDClient
+from pyftd import FTDClient, FTDObjectCache
 from os import environ
 
 
@@ -7,11 +7,9 @@ def main(ftd_client, dhcp_server, dhcp_server_interface, dhcp_relay_interfaces):
     dhcp_relay_intf_objs = []
 
     # Create DHCP Server network object (If this object already exists, it's ok)
-    dhcp_server_obj = ftd_client.get_network_object_list(filter=f"name:{dhcp_server['name']}")
+    dhcp_server_obj = ftd_client.find_object("networkobject", dhcp_server["name"])
     if dhcp_server_obj is None:
         dhcp_server_obj = ftd_client.create_network_object(dhcp_server)
-    else:
-        dhcp_server_obj = dhcp_server_obj[0]
 
     # Get the intf obj of the interface where the DHCP server lives
     dhcp_server_intf_obj = search_interfaces(dhcp_server_interface, ftd_client)
@@ -76,15 +74,7 @@ def search_interfaces(intf_name: str, ftd_client: FTDClient) -> dict:
     :param ftd_client: FTDClient pyftd client obj
     :return: dict interface object
     """
-    if ftd_client.get_physical_interface_list(filter=f"name:{intf_name}"):
-        return ftd_client.get_physical_interface_list(filter=f"name:{intf_name}")[0]
-    elif ftd_client.get_vlan_interface_list(filter=f"name:{intf_name}"):
-        return ftd_client.get_vlan_interface_list(filter=f"name:{intf_name}")[0]
-    else:
-        phys_intf_list = ftd_client.get_physical_interface_list()
-        for intf in phys_intf_list:
-            if ftd_client.get_sub_interface_list(intf.id, filter=f"name:{intf_name}"):
-                return ftd_client.get_sub_interface_list(intf.id, filter=f"name:{intf_name}")[0]
+    return ftd_client.resolve_interface(intf_name)  # all interfaces are loaded once, on the first lookup
 
 
 if __name__ == "__main__":
@@ -103,6 +93,7 @@ if __name__ == "__main__":
         environ.get("FTDPASS"),
         fdm_port=environ.get("FTDPORT"),
         verify=verify,
+        object_cache=FTDObjectCache(),
     )
 
     # TODO: move all of this to a yaml file
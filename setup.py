@@ -30,6 +30,7 @@ setuptools.setup(
     download_url="",
     # keywords=["afi", "top 100", "films", "movies", "all time", "american", "film", "institute"],
     install_requires=["bravado >= 11.0.2", "bravado_core >= 5.17.0", "requests >= 2.25.1", "setuptools >= 51.1.2"],
+    extras_require={"async": ["aiohttp >= 3.7.4"]},
     # entry_points={"console_scripts": ["pyftd = pyftd.__main__:main"]},
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -0,0 +1,54 @@
+from unittest import TestCase
+from pyftd import FTDBaseClient, FTDRetryPolicy
+
+
+class OfflineTestCase(TestCase):
+    """
+    These tests do not need an FTD device. They run against the stubs of this module or against FTDMockServer.
+    """
+
+
+class StubModel:
+    """Stands in for a swagger model object: the fields are attributes and _marshal() returns them as a dict"""
+
+    def __init__(self, **fields):
+        self.__dict__.update(fields)
+        self.fields = fields
+
+    def _marshal(self):
+        return dict(self.fields)
+
+    @classmethod
+    def _unmarshal(cls, fields):
+        return cls(**fields)
+
+
+class StubResponse:
+    """Stands in for the response of a failed request, for the bravado HTTP exceptions"""
+
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.reason = ""
+        self.text = ""
+        self.headers = {}
+
+
+class StubClient:
+    """
+    Stands in for FTDBaseClient where a mixin is tested on its own: no object_cache, no metrics, a retry_policy without
+    delays, a token that is always valid and gather() of the real client. Subclasses add the API methods they need.
+    """
+
+    object_cache = None
+    metrics = None
+    max_in_flight = 4
+    skip_unchanged_edits = False
+    gather = FTDBaseClient.gather
+    access_token = None
+
+    def __init__(self):
+        self.retry_policy = FTDRetryPolicy(base_delay=0, jitter=0)
+        self.token_manager = self
+
+    def ensure_token(self):
+        pass
@@ -0,0 +1,250 @@
+import asyncio
+import threading
+import warnings
+from shutil import which
+from unittest import skipIf
+from bravado.client import SwaggerClient
+from bravado.exception import HTTPLocked, HTTPUnauthorized
+from pyftd import FTDAsyncClient, FTDClient, FTDMockServer, FTDRetryPolicy
+from pyftd.async_client import aiohttp
+from tests.stubs import OfflineTestCase, StubResponse
+
+SPEC = {
+    "swagger": "2.0",
+    "info": {"title": "FDM", "version": "6"},
+    "basePath": "/api/fdm/latest",
+    "paths": {
+        "/object/networks": {
+            "get": {
+                "tags": ["NetworkObject"],
+                "operationId": "getNetworkObjectList",
+                "parameters": [
+                    {"name": "offset", "in": "query", "type": "integer"},
+                    {"name": "limit", "in": "query", "type": "integer"},
+                    {"name": "filter", "in": "query", "type": "string"},
+                ],
+                "responses": {"200": {"description": "", "schema": {"$ref": "#/definitions/NetworkObjectList"}}},
+            }
+        }
+    },
+    "definitions": {
+        "NetworkObject": {"type": "object", "properties": {"name": {"type": "string"}}},
+        "Paging": {
+            "type": "object",
+            "properties": {
+                "count": {"type": "integer"},
+                "offset": {"type": "integer"},
+                "next": {"type": "array", "items": {"type": "string"}},
+            },
+        },
+        "NetworkObjectList": {
+            "type": "object",
+            "properties": {
+                "items": {"type": "array", "items": {"$ref": "#/definitions/NetworkObject"}},
+                "paging": {"$ref": "#/definitions/Paging"},
+            },
+        },
+    },
+}
+
+
+@skipIf(aiohttp is None, "aiohttp is not installed")
+class TestFTDAsyncClient(OfflineTestCase):
+    """
+    Requests are answered by a stub call_operation() from a list of 25 network objects.
+    """
+
+    def setUp(self):
+        self.ftd_client = FTDAsyncClient("192.0.2.1", "admin", "Admin123", verify=False)
+        self.ftd_client.swagger_client = SwaggerClient.from_spec(
+            SPEC, origin_url="https://192.0.2.1/apispec/ngfw.json", config={"validate_swagger_spec": False}
+        )
+        self.ftd_client.token_manager.set_token({"access_token": "token"})
+        self.ftd_client.in_flight = asyncio.Semaphore(4)
+        self.ftd_client.call_operation = self.call_operation
+        self.sent = []
+        self.locked = set()  # offsets answered with 423 Locked once
+        self.count = 25  # the paging count of the responses, None like devices that only link the next page
+        self.in_flight = 0  # the operations being sent right now
+        self.max_in_flight = 0
+        self.threads = []  # the number of threads while an operation was sent
+
+    async def call_operation(self, callable_operation, op_kwargs, call_record=None):
+        self.sent.append((callable_operation.operation.operation_id, op_kwargs))
+        self.threads.append(threading.active_count())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        offset, limit = op_kwargs.get("offset", 0), op_kwargs.get("limit", 9999)
+        if offset in self.locked:
+            self.locked.remove(offset)
+            raise HTTPLocked(StubResponse(423))
+        NetworkObject = self.ftd_client.swagger_client.get_model("NetworkObject")
+        NetworkObjectList = self.ftd_client.swagger_client.get_model("NetworkObjectList")
+        Paging = self.ftd_client.swagger_client.get_model("Paging")
+        items = [NetworkObject(name=f"obj-{i}") for i in range(25)][offset : offset + limit]
+        next_page = ["https://192.0.2.1/next"] if offset + limit < 25 else []
+        return NetworkObjectList(items=items, paging=Paging(count=self.count, offset=offset, next=next_page))
+
+    def test_api_method(self):
+        net_objs = asyncio.run(self.ftd_client.get_network_object_list(filter="name:obj"))
+        self.assertEqual(len(net_objs), 25)
+        self.assertEqual(self.sent, [("getNetworkObjectList", {"limit": 9999, "offset": 0, "filter": "name:obj"})])
+
+    def test_iter_method(self):
+        async def names():
+            return [net_obj.name async for net_obj in self.ftd_client.iter_network_objects(page_size=10)]
+
+        self.assertEqual(asyncio.run(names()), [f"obj-{i}" for i in range(25)])
+        self.assertEqual(len(self.sent), 3)
+
+    def test_get_list_parallel(self):
+        net_objs = asyncio.run(
+            self.ftd_client.get_list_parallel(self.ftd_client.get_network_object_list, filter="name:obj", page_size=10)
+        )
+        self.assertEqual([net_obj.name for net_obj in net_objs], [f"obj-{i}" for i in range(25)])
+        self.assertEqual([op_kwargs["limit"] for _, op_kwargs in self.sent], [10, 10, 10])
+
+    def test_get_list_parallel_without_count(self):
+        self.count = None
+        net_objs = asyncio.run(self.ftd_client.get_list_parallel(self.ftd_client.get_network_object_list, page_size=10))
+        self.assertEqual([net_obj.name for net_obj in net_objs], [f"obj-{i}" for i in range(25)])
+        self.assertEqual([op_kwargs["offset"] for _, op_kwargs in self.sent], [0, 10, 20])
+
+    def test_retry_failed_operation_only(self):
+        self.ftd_client.retry_policy = FTDRetryPolicy(base_delay=0, jitter=0)
+        self.locked = {10}
+
+        async def names():
+            return [net_obj.name async for net_obj in self.ftd_client.iter_network_objects(page_size=10)]
+
+        self.assertEqual(len(asyncio.run(names())), 25)
+        self.assertEqual([op_kwargs["offset"] for _, op_kwargs in self.sent], [0, 10, 10, 20])
+
+    def test_single_thread(self):
+        threads = threading.active_count()
+
+        async def sweep():
+            return await asyncio.gather(
+                *[self.ftd_client.get_network_object_list(filter="name:obj") for _ in range(50)]
+            )
+
+        self.assertEqual(len(asyncio.run(sweep())), 50)
+        self.assertEqual(set(self.threads), {threads})  # every operation was sent from the thread of the event loop
+        self.assertEqual(self.max_in_flight, 50)
+
+    def test_gather(self):
+        results = asyncio.run(
+            self.ftd_client.gather(
+                *[lambda offset=offset: self.ftd_client.get_network_object_list(offset=offset) for offset in range(10)]
+            )
+        )
+        self.assertEqual([len(net_objs) for net_objs in results], [25 - offset for offset in range(10)])
+        self.assertEqual(self.max_in_flight, 4)  # max_in_flight of the client
+
+    def test_renew_token_once(self):
+        logins = []
+
+        async def get_access_token():
+            logins.append(self.ftd_client.headers["Authorization"])
+            await asyncio.sleep(0.01)
+            self.ftd_client.headers["Authorization"] = "Bearer new"
+
+        async def call_operation(callable_operation, op_kwargs, call_record=None):
+            if self.ftd_client.headers["Authorization"] != "Bearer new":
+                raise HTTPUnauthorized(StubResponse(401))
+            return await self.call_operation(callable_operation, op_kwargs, call_record)
+
+        async def sweep():
+            self.ftd_client.token_lock = asyncio.Lock()
+            return await asyncio.gather(*[self.ftd_client.get_network_object_list() for _ in range(10)])
+
+        self.ftd_client.headers["Authorization"] = "Bearer old"
+        self.ftd_client.get_access_token = get_access_token
+        self.ftd_client.call_operation = call_operation
+        self.assertEqual(len(asyncio.run(sweep())), 10)
+        self.assertEqual(logins, ["Bearer old"])  # the calls rejected at the same time shared one login
+
+    def test_api_methods(self):
+        for name in dir(FTDClient):
+            method = getattr(FTDClient, name)
+            if any(hasattr(method, tag) for tag in ("swagger_operation", "edit_operation", "api_operation")):
+                self.assertTrue(hasattr(FTDAsyncClient, name), name)
+
+    def test_unsupported_method(self):
+        with self.assertRaises(AttributeError):
+            self.ftd_client.bulk_create_network_objects
+
+    def test_object_lookup(self):
+        net_objs = asyncio.run(self.ftd_client.load_object_index("networkobject"))
+        self.assertEqual(len(net_objs), 25)
+        self.assertEqual(asyncio.run(self.ftd_client.find_object("networkobject", "obj-3")).name, "obj-3")
+
+
+@skipIf(aiohttp is None, "aiohttp is not installed")
+@skipIf(which("openssl") is None, "the mock FDM generates its certificate with openssl")
+class TestFTDAsyncClientMockFDM(OfflineTestCase):
+    """
+    Run the async client against a local mock FDM API server.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mock_fdm = FTDMockServer().start()
+        cls.mock_fdm.seed("NetworkObject", 120)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.mock_fdm.stop()
+
+    def setUp(self):
+        warnings.simplefilter("ignore")  # the mock has a self-signed certificate
+
+    def run_client(self, session):
+        async def run():
+            async with FTDAsyncClient(
+                "127.0.0.1", "admin", "Admin123", verify=False, fdm_port=self.mock_fdm.port
+            ) as ftd_client:
+                return await session(ftd_client)
+
+        return asyncio.run(run())
+
+    def test_crud(self):
+        async def session(ftd_client):
+            net_obj = await ftd_client.create_network_object(
+                {"name": "async-crud", "subType": "HOST", "value": "192.168.1.1", "type": "networkobject"}
+            )
+            duplicate = await ftd_client.create_network_object(
+                {"name": "async-crud", "subType": "HOST", "value": "192.168.1.1", "type": "networkobject"}
+            )
+            net_obj.value = "192.168.1.2"
+            edited = await ftd_client.edit_network_object(net_obj)
+            unchanged = await ftd_client.edit_network_object(edited, skip_unchanged=True)
+            found = await ftd_client.find_object("networkobject", "async-crud")
+            await ftd_client.delete_network_object(net_obj.id)
+            return duplicate, edited, unchanged, found, await ftd_client.find_object("networkobject", "async-crud")
+
+        duplicate, edited, unchanged, found, deleted = self.run_client(session)
+        self.assertIsNone(duplicate)  # duplicates are skipped like FTDAPIWrapper does
+        self.assertEqual(edited.value, "192.168.1.2")
+        self.assertEqual(unchanged.id, edited.id)
+        self.assertEqual(found.id, edited.id)
+        self.assertIsNone(deleted)
+        self.assertEqual(self.mock_fdm.stats()["operations"]["editNetworkObject"], 1)
+
+    def test_list(self):
+        async def session(ftd_client):
+            return await ftd_client.get_list_parallel(ftd_client.get_network_object_list, page_size=25)
+
+        self.assertEqual(len(self.run_client(session)), 120)
+
+    def test_find_object_by_id(self):
+        net_obj = self.mock_fdm.objects("NetworkObject")[5]
+        self.mock_fdm.reset_stats()
+
+        async def session(ftd_client):
+            return await ftd_client.find_object_by_id("networkobject", net_obj["id"])
+
+        self.assertEqual(self.run_client(session).name, net_obj["name"])
+        self.assertNotIn("getNetworkObjectList", self.mock_fdm.stats()["operations"])
@@ -34,3 +34,34 @@ class TestBaseCient(TestCase):
             verify=self.verify,
         )
         self.assertIn("access_token", self.ftd_client.token)
+
+    def test_token_refresh_reuses_swagger_client(self):
+        self.ftd_client = FTDClient(
+            self.ftd_ip,
+            self.username,
+            self.password,
+            fdm_port=self.fdm_port,
+            proxies=self.proxies,
+            verify=self.verify,
+        )
+        swagger_client = self.ftd_client.swagger_client
+        old_token = self.ftd_client.token["access_token"]
+        self.ftd_client.logout()  # invalidate the token so that the next call gets a 401
+        self.assertTrue(self.ftd_client.get_system_information())
+        self.assertNotEqual(self.ftd_client.token["access_token"], old_token)
+        self.assertIs(self.ftd_client.swagger_client, swagger_client)
+
+    def test_lazy_client_instance(self):
+        self.ftd_client = FTDClient(
+            self.ftd_ip,
+            self.username,
+            self.password,
+            fdm_port=self.fdm_port,
+            proxies=self.proxies,
+            verify=self.verify,
+            lazy=True,
+        )
+        self.assertIsNone(self.ftd_client.token)  # nothing has been sent to the device yet
+        self.assertTrue(self.ftd_client.get_system_information())
+        self.assertIn("access_token", self.ftd_client.token)
+        self.assertTrue(self.ftd_client.api_version)
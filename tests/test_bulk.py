@@ -0,0 +1,103 @@
+from concurrent.futures import ThreadPoolExecutor
+from requests import Response
+from requests.exceptions import HTTPError
+from unittest.mock import patch
+from pyftd import FTDBulkOperations
+from tests.stubs import OfflineTestCase, StubClient
+
+
+class BulkClient(FTDBulkOperations, StubClient):
+    """Creates and edits objects in a dict instead of on a device"""
+
+    def __init__(self, objs: list):
+        super().__init__()
+        self.device = {(obj["type"], obj["name"]): dict(obj, id=f"id-{index}") for index, obj in enumerate(objs)}
+        self.edits = []
+
+    def find_object(self, obj_type: str, name: str):
+        return self.device.get((obj_type, name))
+
+    def load_object_index(self, obj_type: str) -> list:
+        return [obj for (device_type, _), obj in self.device.items() if device_type == obj_type]
+
+    def create(self, obj: dict):
+        if (obj["type"], obj["name"]) in self.device:
+            return None  # a duplicate, like FTDAPIWrapper reports it
+        self.device[(obj["type"], obj["name"])] = dict(obj, id="id-new")
+        return self.device[(obj["type"], obj["name"])]
+
+    def edit(self, obj: dict):
+        self.edits.append(obj)
+        self.device[(obj["type"], obj["name"])] = obj
+        return obj
+
+
+class TestFTDBulkOperations(OfflineTestCase):
+    def setUp(self):
+        self.stub_client = BulkClient(
+            [
+                {"name": "obj-1", "type": "networkobject", "value": "10.1.1.1", "description": "old"},
+                {
+                    "name": "dns-1",
+                    "type": "dnsservergroup",
+                    "dnsServers": [{"ipAddress": "10.1.1.1"}, {"ipAddress": "10.1.1.2"}],
+                },
+                {"name": "grp-1", "type": "networkobjectgroup", "objects": [{"name": "a"}, {"name": "b"}]},
+            ]
+        )
+
+    def upsert(self, obj: dict):
+        return self.stub_client.upsert(obj, self.stub_client.create, self.stub_client.edit)
+
+    def test_upsert_cleared_field(self):
+        edited = self.upsert({"name": "obj-1", "type": "networkobject", "value": "10.1.1.1", "description": None})
+        self.assertIsNone(edited["description"])
+        self.assertEqual(edited["id"], "id-0")
+        self.assertEqual(len(self.stub_client.edits), 1)
+        self.upsert({"name": "obj-1", "type": "networkobject", "description": None})  # cleared already
+        self.assertEqual(len(self.stub_client.edits), 1)
+
+    def test_upsert_list_order(self):
+        dns_servers = [{"ipAddress": "10.1.1.2"}, {"ipAddress": "10.1.1.1"}]
+        edited = self.upsert({"name": "dns-1", "type": "dnsservergroup", "dnsServers": dns_servers})
+        self.assertEqual(edited["dnsServers"], dns_servers)
+        self.upsert({"name": "grp-1", "type": "networkobjectgroup", "objects": [{"name": "b"}, {"name": "a"}]})
+        self.assertEqual(len(self.stub_client.edits), 1)  # the members of a group have no order
+
+    def test_bulk_upsert(self):
+        results = self.stub_client.bulk_upsert(
+            [
+                {"name": "obj-1", "type": "networkobject", "description": None},
+                {
+                    "name": "dns-1",
+                    "type": "dnsservergroup",
+                    "dnsServers": [{"ipAddress": "10.1.1.2"}, {"ipAddress": "10.1.1.1"}],
+                },
+                {"name": "grp-1", "type": "networkobjectgroup", "objects": [{"name": "b"}, {"name": "a"}]},
+                {"name": "obj-2", "type": "networkobject", "value": "10.1.1.2"},
+            ],
+            self.stub_client.create,
+            self.stub_client.edit,
+        )
+        self.assertEqual([result.status for result in results], ["edited", "edited", "unchanged", "created"])
+        self.assertEqual([edit["name"] for edit in self.stub_client.edits], ["obj-1", "dns-1"])
+
+    def test_bulk_fewer_results(self):
+        objs = [{"name": f"obj-{i}", "type": "networkobject"} for i in range(5)]
+        results = self.stub_client.run_bulk(objs, "created", self.stub_client.create, lambda chunk: chunk[:-1], 3)
+        self.assertEqual([result.status for result in results], ["created", "created", "failed", "created", "failed"])
+        self.assertIsInstance(results[2].error, ValueError)
+        self.assertNotIn(("networkobject", "obj-2"), self.stub_client.device)  # not sent again
+
+    def test_bulk_refused_one_pool(self):
+        refused = Response()
+        refused.status_code = 400
+
+        def bulk_call(chunk):
+            raise HTTPError(response=refused)
+
+        objs = [{"name": f"obj-{i}", "type": "networkobject"} for i in range(2, 12)]
+        with patch("pyftd.bulk.ThreadPoolExecutor", wraps=ThreadPoolExecutor) as executor:
+            results = self.stub_client.run_bulk(objs, "created", self.stub_client.create, bulk_call, 3)
+        self.assertEqual([result.status for result in results], ["created"] * 10)
+        self.assertEqual(executor.call_count, 1)  # for all four chunks
@@ -0,0 +1,95 @@
+import gzip
+import os
+import warnings
+from tempfile import TemporaryDirectory
+from bravado.exception import BravadoConnectionError
+from requests.exceptions import ConnectionError
+from shutil import which
+from time import perf_counter
+from unittest import skipIf
+from pyftd import FTDCassette, FTDClient, FTDMockServer
+from tests.stubs import OfflineTestCase
+
+
+@skipIf(which("openssl") is None, "the mock FDM generates its certificate with openssl")
+class TestCassette(OfflineTestCase):
+    """
+    Record a session with a local mock FDM API server and replay it.
+    """
+
+    def setUp(self):
+        warnings.simplefilter("ignore")  # the mock has a self-signed certificate
+        self.tmp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "ftd1.jsonl.gz")
+        with FTDMockServer(latency=0.02) as mock_fdm:
+            mock_fdm.seed("NetworkObject", 250)
+            cassette = FTDCassette()
+            ftd_client = FTDClient("127.0.0.1", "admin", "Admin123", verify=False, fdm_port=mock_fdm.port, lazy=True)
+            cassette.record(ftd_client.http_session)
+            self.recorded = self.session(ftd_client)
+            cassette.save(self.path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @staticmethod
+    def session(ftd_client: FTDClient) -> list:
+        net_objs = ftd_client.get_list_parallel(ftd_client.get_network_object_list, page_size=50)
+        net_obj = ftd_client.create_network_object(
+            {"name": "cassette", "subType": "HOST", "value": "192.168.1.1", "type": "networkobject"}
+        )
+        return [net_obj.name for net_obj in net_objs] + [net_obj.id]
+
+    def replay(self, time_scale: float) -> tuple:
+        cassette = FTDCassette.load(self.path)
+        ftd_client = FTDClient("192.0.2.1", "admin", "not-recorded", verify=False, lazy=True)
+        cassette.replay(ftd_client.http_session, time_scale=time_scale)
+        started = perf_counter()
+        return self.session(ftd_client), perf_counter() - started
+
+    def test_record(self):
+        cassette = FTDCassette.load(self.path)
+        paths = [interaction["path"] for interaction in cassette.interactions]
+        self.assertIn("/apispec/ngfw.json", paths)
+        self.assertIn("/api/fdm/latest/fdm/token", paths)
+        self.assertEqual(paths.count("/api/fdm/latest/object/networks"), 6)  # 5 pages and the create
+        with gzip.open(self.path, "rt") as cassette_file:
+            content = cassette_file.read()
+        self.assertNotIn("Admin123", content)
+        self.assertIn("cassette-access-token", content)
+
+    def test_replay(self):
+        replayed, elapsed = self.replay(time_scale=1)
+        self.assertEqual(replayed, self.recorded)
+        self.assertGreater(elapsed, 0.04)  # the first page, then the other pages at the same time, then the create
+        replayed, elapsed = self.replay(time_scale=0)
+        self.assertEqual(replayed, self.recorded)
+
+    def test_replay_body_changed(self):
+        cassette = FTDCassette.load(self.path)
+        posts = [interaction for interaction in cassette.interactions if interaction["method"] == "POST"]
+        self.assertIn("body_sha256", posts[-1])  # the create
+        self.assertNotIn("body_sha256", posts[0])  # the token request
+        ftd_client = FTDClient("192.0.2.1", "admin", "not-recorded", verify=False, lazy=True)
+        cassette.replay(ftd_client.http_session, time_scale=0)
+        with self.assertLogs("pyftd.cassette", "WARNING") as logs:
+            ftd_client.create_network_object(
+                {"name": "cassette", "subType": "HOST", "value": "192.168.1.2", "type": "networkobject"}
+            )
+        self.assertIn("POST /api/fdm/latest/object/networks sends a different body", logs.output[0])
+
+    def test_replay_miss(self):
+        cassette = FTDCassette.load(self.path)
+        ftd_client = FTDClient("192.0.2.1", "admin", "not-recorded", verify=False, lazy=True)
+        cassette.replay(ftd_client.http_session, time_scale=0)
+        # bravado raises a RequestsFutureAdapterConnectionError, a subclass of both, and keeps the message on the
+        # ConnectionError of the cassette it was raised from
+        with self.assertRaises(ConnectionError) as raised:  # the VRFs were never recorded
+            ftd_client.get_vrf_list()
+        self.assertIsInstance(raised.exception, BravadoConnectionError)
+        self.assertEqual(type(raised.exception).__name__, "RequestsFutureAdapterConnectionError")
+        self.assertEqual(
+            str(raised.exception.__context__),
+            "The cassette has no (more) responses for GET /api/fdm/latest/devices/default/routing/virtualrouters"
+            "?limit=9999&offset=0",
+        )
@@ -0,0 +1,100 @@
+from pyftd.compare import changed_fields, edit_operation, edit_target, normalize
+from tests.stubs import OfflineTestCase, StubClient, StubModel
+
+
+class RouteClient(StubClient):
+    def __init__(self, skip_unchanged_edits=False):
+        super().__init__()
+        self.skip_unchanged_edits = skip_unchanged_edits
+        self.edits_sent = 0
+        self.edits_skipped = 0
+        self.device = {"id-1": {"id": "id-1", "version": "v1", "name": "route-1", "gateway": "10.1.1.1"}}
+        self.sent = []
+
+    def current_object(self, edit_method, *args, **kwargs):
+        obj, params = edit_target(edit_method, *args, **kwargs)
+        return obj, self.device.get(params["objId"])
+
+    @edit_operation("Routing", "editStaticRouteEntry", body="route_obj", parentId="parent_id")
+    def edit_static_route(self, route_obj, parent_id="default"):
+        self.sent.append(route_obj)
+        return route_obj
+
+
+class TestCompare(OfflineTestCase):
+    def test_server_managed_fields_are_ignored(self):
+        current = StubModel(id="id-1", version="abc", links={"self": "https://ftd"}, name="obj-1", value="10.1.1.1")
+        self.assertEqual(changed_fields(current, {"name": "obj-1", "value": "10.1.1.1", "version": "old"}), [])
+        self.assertEqual(changed_fields(current, {"name": "obj-1", "value": "10.1.1.2"}), ["value"])
+
+    def test_device_defaults_are_ignored(self):
+        current = {"name": "obj-1", "dnsResolution": "IPV4_AND_IPV6", "ipv4": {"ipType": "STATIC", "type": "x"}}
+        self.assertEqual(changed_fields(current, {"name": "obj-1", "ipv4": {"ipType": "STATIC"}}), [])
+        self.assertEqual(changed_fields(current, {"name": "obj-1", "ipv4": {"ipType": "DHCP"}}), ["ipv4"])
+
+    def test_member_order_and_references(self):
+        current = {
+            "name": "grp-1",
+            "objects": [
+                {"id": "id-2", "version": "v", "name": "obj-2", "type": "networkobject"},
+                {"id": "id-1", "version": "v", "name": "obj-1", "type": "networkobject"},
+            ],
+        }
+        desired = {
+            "name": "grp-1",
+            "objects": [{"name": "obj-1", "type": "networkobject"}, {"name": "obj-2", "type": "networkobject"}],
+        }
+        self.assertEqual(changed_fields(current, desired), [])
+        desired["objects"].pop()
+        self.assertEqual(changed_fields(current, desired), ["objects"])
+
+    def test_cleared_field(self):
+        current = {"name": "obj-1", "value": "10.1.1.1", "description": "old"}
+        self.assertEqual(changed_fields(current, {"name": "obj-1", "description": None}), ["description"])
+        self.assertEqual(changed_fields({"name": "obj-1"}, {"name": "obj-1", "description": None}), [])
+        self.assertEqual(changed_fields({"name": "obj-1", "description": None}, {"description": None}), [])
+
+    def test_ordered_lists(self):
+        current = {
+            "name": "dns-1",
+            "dnsServers": [
+                {"ipAddress": "10.1.1.1", "type": "dnsserver"},
+                {"ipAddress": "10.1.1.2", "type": "dnsserver"},
+            ],
+        }
+        desired = {"name": "dns-1", "dnsServers": [{"ipAddress": "10.1.1.2"}, {"ipAddress": "10.1.1.1"}]}
+        self.assertEqual(changed_fields(current, desired), ["dnsServers"])
+        desired["dnsServers"].reverse()
+        self.assertEqual(changed_fields(current, desired), [])
+        current = {"name": "ntp", "ntpServers": ["0.pool.ntp.org", "1.pool.ntp.org"]}
+        self.assertEqual(changed_fields(current, {"ntpServers": ["1.pool.ntp.org", "0.pool.ntp.org"]}), ["ntpServers"])
+
+    def test_normalize(self):
+        self.assertEqual(normalize(StubModel(id="id-1", name="obj-1", description=None)), {"name": "obj-1"})
+        self.assertEqual(normalize({"description": None}, keep_none=True), {"description": None})
+        self.assertEqual(normalize([3, 1, 2]), [3, 1, 2])
+        self.assertEqual(
+            normalize({"objects": [3, 1, 2], "ntpServers": [3, 1, 2]}), {"objects": [1, 2, 3], "ntpServers": [3, 1, 2]}
+        )
+
+    def test_edit_target(self):
+        route_obj, params = edit_target(RouteClient.edit_static_route, {"id": "id-1", "name": "route-1"})
+        self.assertEqual(route_obj["name"], "route-1")
+        self.assertEqual(params, {"parentId": "default", "objId": "id-1"})
+
+    def test_skip_unchanged(self):
+        stub_client = RouteClient()
+        unchanged = {"id": "id-1", "version": "v0", "name": "route-1", "gateway": "10.1.1.1"}
+        self.assertEqual(stub_client.edit_static_route(unchanged, skip_unchanged=True)["version"], "v1")
+        self.assertEqual(stub_client.sent, [])
+        stub_client.edit_static_route(unchanged)  # skipping is opt-in
+        stub_client.edit_static_route(dict(unchanged, gateway="10.1.1.2"), skip_unchanged=True)
+        self.assertEqual(len(stub_client.sent), 2)
+        self.assertEqual((stub_client.edits_sent, stub_client.edits_skipped), (2, 1))
+
+    def test_skip_unchanged_edits(self):
+        stub_client = RouteClient(skip_unchanged_edits=True)
+        unchanged = {"id": "id-1", "name": "route-1", "gateway": "10.1.1.1"}
+        stub_client.edit_static_route(unchanged)
+        stub_client.edit_static_route(unchanged, skip_unchanged=False)
+        self.assertEqual((stub_client.edits_sent, stub_client.edits_skipped), (1, 1))
@@ -0,0 +1,49 @@
+import random
+from pyftd.digests import compare_digests, digest_records
+from tests.stubs import OfflineTestCase
+
+
+def records(objs):
+    return [{"type": obj["type"], "name": obj["name"], "parent": None, "object": obj} for obj in objs]
+
+
+class TestDigests(OfflineTestCase):
+    def setUp(self):
+        self.template = [
+            {"id": f"t-{i}", "version": "a", "name": f"obj-{i}", "type": "networkobject", "value": f"10.1.1.{i}"}
+            for i in range(100)
+        ] + [{"id": "t-grp", "version": "a", "name": "grp", "type": "networkobjectgroup", "objects": []}]
+        # The branch has the same objects in another order and with its own ids
+        self.branch = [dict(obj, id=obj["id"].replace("t-", "b-"), version="b") for obj in self.template]
+        random.Random(1).shuffle(self.branch)
+
+    def test_same_configuration(self):
+        template, branch = digest_records(records(self.template)), digest_records(records(self.branch))
+        self.assertEqual(
+            {obj_type: digest.digest for obj_type, digest in template.items()},
+            {obj_type: digest.digest for obj_type, digest in branch.items()},
+        )
+        self.assertEqual(template["networkobject"].count, 100)
+        self.assertEqual(compare_digests(template, branch), {})
+
+    def test_drift(self):
+        branch = [obj for obj in self.branch if obj["name"] != "obj-7"]
+        next(obj for obj in branch if obj["name"] == "obj-42")["value"] = "10.9.9.9"
+        branch.append({"id": "b-new", "name": "obj-new", "type": "networkobject", "value": "10.2.2.2"})
+        template = digest_records(records(self.template), bucket_count=16)
+        branch = digest_records(records(branch), bucket_count=16)
+        self.assertEqual(template["networkobjectgroup"].digest, branch["networkobjectgroup"].digest)
+        differing_buckets = [
+            bucket
+            for bucket in range(16)
+            if template["networkobject"].buckets.get(bucket) != branch["networkobject"].buckets.get(bucket)
+        ]
+        self.assertLessEqual(len(differing_buckets), 3)
+        self.assertEqual(
+            compare_digests(template, branch),
+            {"networkobject": [(None, "obj-42", 0), (None, "obj-7", 0), (None, "obj-new", 0)]},
+        )
+
+    def test_obj_types(self):
+        digests = digest_records(records(self.template), obj_types=["networkobjectgroup"])
+        self.assertEqual(list(digests), ["networkobjectgroup"])
@@ -0,0 +1,60 @@
+from time import sleep
+from pyftd import FTDFleet
+from tests.stubs import OfflineTestCase
+
+
+class FleetClient:
+    def __init__(self, ftd_ip, username, password, delay=0.0):
+        if ftd_ip == "192.0.2.99":
+            raise ValueError("We failed to acquire a token from the FTD")
+        self.ftd_ip = ftd_ip
+        self.delay = delay
+
+    def get_system_information(self):
+        sleep(self.delay)
+        return {"ipv4": self.ftd_ip}
+
+
+class TestFTDFleet(OfflineTestCase):
+    """
+    The fleet builds FleetClient objects instead of FTDClient.
+    """
+
+    def inventory(self, *ftd_ips, **device):
+        return [dict({"ftd_ip": ftd_ip, "username": "admin", "password": "Admin123"}, **device) for ftd_ip in ftd_ips]
+
+    def test_run(self):
+        fleet = FTDFleet(self.inventory("192.0.2.1", "192.0.2.2", "192.0.2.3"), client_class=FleetClient)
+        fleet_results = list(fleet.run("get_system_information"))
+        self.assertEqual(sorted(r.result["ipv4"] for r in fleet_results), ["192.0.2.1", "192.0.2.2", "192.0.2.3"])
+        self.assertTrue(all(r.ok for r in fleet_results))
+        self.assertEqual(len(fleet.clients), 3)
+
+    def test_callable_and_error_isolation(self):
+        fleet = FTDFleet(self.inventory("192.0.2.1", "192.0.2.99"), client_class=FleetClient)
+        fleet_results = {r.ftd_ip: r for r in fleet.run(lambda ftd_client, suffix: ftd_client.ftd_ip + suffix, "/32")}
+        self.assertEqual(fleet_results["192.0.2.1"].result, "192.0.2.1/32")
+        self.assertIsInstance(fleet_results["192.0.2.99"].error, ValueError)
+
+    def test_results_stream_as_they_complete(self):
+        inventory = self.inventory("192.0.2.1", delay=0.5) + self.inventory("192.0.2.2")
+        fleet = FTDFleet(inventory, client_class=FleetClient)
+        self.assertEqual([r.ftd_ip for r in fleet.run("get_system_information")], ["192.0.2.2", "192.0.2.1"])
+
+    def test_timeout(self):
+        inventory = self.inventory("192.0.2.1", delay=2) + self.inventory("192.0.2.2")
+        fleet = FTDFleet(inventory, timeout=0.2, client_class=FleetClient)
+        fleet_results = {r.ftd_ip: r for r in fleet.run("get_system_information")}
+        self.assertTrue(fleet_results["192.0.2.2"].ok)
+        self.assertIsInstance(fleet_results["192.0.2.1"].error, TimeoutError)
+
+    def test_inventory_keys(self):
+        fleet = FTDFleet(self.inventory("192.0.2.1", site="lab", tag="edge"), client_class=FleetClient)
+        fleet_result = next(fleet.run("get_system_information"))
+        self.assertTrue(fleet_result.ok)
+        self.assertEqual(fleet_result.device["site"], "lab")
+
+    def test_unknown_devices(self):
+        fleet = FTDFleet(self.inventory("192.0.2.1"), client_class=FleetClient)
+        with self.assertRaises(ValueError):
+            list(fleet.run("get_system_information", devices=self.inventory("192.0.2.2")))
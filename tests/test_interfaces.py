@@ -162,3 +162,11 @@ class TestInterfafces(TestCase):
     def test_get_interface_info_list(self):
         int_info_list = self.ftd_client.get_interface_info_list()
         self.assertTrue(int_info_list)
+
+    def test_resolve_interface(self):
+        phys_int_list = self.ftd_client.get_physical_interface_list()
+        named_intf = next(intf for intf in phys_int_list if intf.name)
+        self.assertEqual(self.ftd_client.resolve_interface(named_intf.name).id, named_intf.id)
+        self.assertEqual(self.ftd_client.resolve_interface(named_intf.hardwareName).id, named_intf.id)
+        self.assertIsNone(self.ftd_client.resolve_interface("no-such-interface"))
+        self.assertTrue(self.ftd_client.refresh_interface_index())
@@ -0,0 +1,78 @@
+import warnings
+from shutil import which
+from unittest import skipIf
+from pyftd import FTDClient, FTDMetrics, FTDMockServer, FTDRetryPolicy
+from pyftd.metrics import active_call_records
+from tests.stubs import OfflineTestCase
+
+
+class TestFTDMetrics(OfflineTestCase):
+    def test_call_record(self):
+        metrics = FTDMetrics()
+        outer = metrics.start("get_list_parallel")
+        inner = metrics.start("get_page")
+        self.assertEqual(active_call_records(), [outer, inner])
+        for call_record in active_call_records():
+            call_record.operations.append("getNetworkObjectList")
+            call_record.add_request(0.01, 2048)
+        inner.retries = 2
+        metrics.finish(inner)
+        metrics.finish(outer, ValueError())
+        self.assertEqual(active_call_records(), [])
+        self.assertEqual(inner.requests, 1)
+        self.assertEqual(outer.response_bytes, 2048)
+        self.assertEqual(outer.exception, "ValueError")
+        self.assertGreaterEqual(inner.wall_time, 0)
+
+    def test_summary(self):
+        metrics = FTDMetrics()
+        for _ in range(3):
+            call_record = metrics.start("get_network_object_list")
+            call_record.operations.append("getNetworkObjectList")
+            call_record.add_request(0.0, 100)
+            metrics.finish(call_record)
+        rows = metrics.summary()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["operation"], "getNetworkObjectList")
+        self.assertEqual(rows[0]["count"], 3)
+        self.assertEqual(rows[0]["response_bytes"], 300)
+
+    def test_export_prometheus(self):
+        metrics = FTDMetrics()
+        call_record = metrics.start("create_network_object")
+        call_record.operations.append("addNetworkObject")
+        metrics.finish(call_record, KeyError())
+        text = metrics.export_prometheus()
+        labels = 'method="create_network_object",operation="addNetworkObject"'
+        self.assertIn(f'pyftd_call_duration_seconds_bucket{{{labels},le="+Inf"}} 1', text)
+        self.assertIn(f"pyftd_call_duration_seconds_count{{{labels}}} 1", text)
+        self.assertIn('pyftd_call_errors_total{method="create_network_object",exception="KeyError"} 1', text)
+
+    @skipIf(which("openssl") is None, "the mock FDM generates its certificate with openssl")
+    def test_backoff_and_worker_threads(self):
+        warnings.simplefilter("ignore")  # the mock has a self-signed certificate
+        metrics = FTDMetrics()
+        with FTDMockServer() as mock_fdm:
+            mock_fdm.seed("NetworkObject", 30)
+            ftd_client = FTDClient(
+                "127.0.0.1",
+                "admin",
+                "Admin123",
+                verify=False,
+                fdm_port=mock_fdm.port,
+                metrics=metrics,
+                retry_policy=FTDRetryPolicy(base_delay=0.2, jitter=0),
+            )
+            mock_fdm.fail_next(423)
+            ftd_client.get_network_object_list(filter="name:networkobject-1")
+            row = [row for row in metrics.summary() if row["method"] == "get_network_object_list"][0]
+            self.assertEqual(row["retries"], 1)
+            self.assertGreaterEqual(row["backoff_time"], 0.2)
+            self.assertLess(row["unmarshal_time"], 0.2)  # the backoff is not counted as unmarshal time
+
+            outer = metrics.start("outer")
+            ftd_client.get_list_parallel(ftd_client.get_network_object_list, page_size=10)
+            ftd_client.gather(lambda: ftd_client.get_vrf_list(), lambda: ftd_client.get_hostname_list())
+            metrics.finish(outer)
+        self.assertEqual(outer.requests, 5)  # 3 pages and 2 lists, most of them sent by worker threads
+        self.assertEqual(outer.operations.count("getNetworkObjectList"), 3)
@@ -0,0 +1,180 @@
+import warnings
+from shutil import which
+from unittest import skipIf
+from bravado.exception import HTTPLocked
+from pyftd import FTDClient, FTDMockServer, FTDObjectCache, FTDRetryPolicy
+from tests.stubs import OfflineTestCase
+
+
+@skipIf(which("openssl") is None, "the mock FDM generates its certificate with openssl")
+class TestMockFDM(OfflineTestCase):
+    """
+    Run the client against a local mock FDM API server.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mock_fdm = FTDMockServer().start()
+        cls.mock_fdm.seed(
+            "NetworkObject",
+            1200,
+            make=lambda i: {"name": f"obj-{i}", "subType": "HOST", "value": f"10.1.{i // 256}.{i % 256}"},
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.mock_fdm.stop()
+
+    def setUp(self):
+        warnings.simplefilter("ignore")  # the mock has a self-signed certificate
+        self.ftd_client = FTDClient(
+            "127.0.0.1",
+            "admin",
+            "Admin123",
+            verify=False,
+            fdm_port=self.mock_fdm.port,
+            retry_policy=FTDRetryPolicy(base_delay=0.01, jitter=0),
+        )
+        self.mock_fdm.reset_stats()
+
+    def test_list_and_filter(self):
+        net_objs = self.ftd_client.get_list_parallel(self.ftd_client.get_network_object_list, page_size=100)
+        self.assertEqual(len(net_objs), 1200)
+        self.assertEqual([net_obj.name for net_obj in net_objs[:2]], ["obj-0", "obj-1"])
+        self.assertEqual(self.mock_fdm.stats()["operations"]["getNetworkObjectList"], 12)
+        self.assertEqual(len(list(self.ftd_client.iter_network_objects(page_size=500))), 1200)
+        self.assertEqual(self.ftd_client.get_network_object_list(filter="name:obj-7")[0].value, "10.1.0.7")
+        self.assertEqual(len(self.ftd_client.get_network_object_list(filter="fts~10.1.4.")), 176)
+
+    def test_list_parallel_page_size(self):
+        # Regression: the pages after the second one asked for as many records as had been received so far
+        ftd_client = FTDClient(
+            "127.0.0.1", "admin", "Admin123", verify=False, fdm_port=self.mock_fdm.port, max_in_flight=1
+        )
+        net_objs = ftd_client.get_list_parallel(ftd_client.get_network_object_list, page_size=100)
+        self.assertEqual([net_obj.name for net_obj in net_objs], [f"obj-{i}" for i in range(1200)])
+
+    def test_crud(self):
+        net_obj = self.ftd_client.create_network_object(
+            {"name": "mock-crud", "subType": "HOST", "value": "192.168.1.1", "type": "networkobject"}
+        )
+        self.assertIsNotNone(net_obj.id)
+        self.assertIsNone(  # the wrapper skips duplicates
+            self.ftd_client.create_network_object(
+                {"name": "mock-crud", "subType": "HOST", "value": "192.168.1.1", "type": "networkobject"}
+            )
+        )
+        net_obj.value = "192.168.1.2"
+        edited = self.ftd_client.edit_network_object(net_obj)
+        self.assertEqual(edited.value, "192.168.1.2")
+        self.assertNotEqual(edited.version, net_obj.version)
+        self.ftd_client.delete_network_object(net_obj.id)
+        self.assertEqual(self.ftd_client.get_network_object_list(filter="name:mock-crud"), [])
+
+    def test_bulk_create(self):
+        net_objs = [
+            {"name": f"mock-bulk-{i}", "subType": "HOST", "value": "192.168.2.1", "type": "networkobject"}
+            for i in range(30)
+        ]
+        results = self.ftd_client.bulk_create_network_objects(net_objs, chunk_size=10)
+        self.assertEqual([result.status for result in results], ["created"] * 30)
+        self.assertEqual(self.mock_fdm.stats()["operations"]["addNetworkObjectBulk"], 3)
+        deleted = self.ftd_client.bulk_delete_network_objects([result.result.id for result in results])
+        self.assertEqual([result.status for result in deleted], ["deleted"] * 30)
+        self.assertEqual(self.mock_fdm.stats()["operations"]["deleteNetworkObjectBulk"], 1)
+        self.assertNotIn("deleteNetworkObject", self.mock_fdm.stats()["operations"])
+        self.assertEqual(self.ftd_client.get_network_object_list(filter="fts~mock-bulk"), [])
+
+    def test_bulk_delete_format(self):
+        obj_id = self.mock_fdm.objects("NetworkObject")[0]["id"]
+        headers = {"Authorization": self.ftd_client.http_session.headers["Authorization"]}
+        url = "/api/fdm/latest/object/networks?bulk=true"
+        for body, query in (([{"id": obj_id, "type": "networkobject"}], ""), ([obj_id], ""), (None, "&filter=name:x")):
+            status, _ = self.mock_fdm.handle("DELETE", url + query, headers, body)
+            self.assertEqual(status, 400)
+        self.assertEqual(len(self.mock_fdm.objects("NetworkObject")), 1200)
+
+    def test_bulk_faults(self):
+        net_objs = [
+            {"name": f"mock-bulk-fault-{i}", "subType": "HOST", "value": "192.168.3.1", "type": "networkobject"}
+            for i in range(10)
+        ]
+        self.mock_fdm.expire_tokens()
+        self.mock_fdm.fail_next(423)
+        results = self.ftd_client.bulk_create_network_objects(net_objs)
+        self.assertEqual([result.status for result in results], ["created"] * 10)
+        stats = self.mock_fdm.stats()
+        self.assertEqual(stats["statuses"][401], 1)
+        self.assertEqual(stats["statuses"][423], 1)
+        self.assertEqual(stats["operations"]["addNetworkObjectBulk"], 1)
+        self.assertNotIn("addNetworkObject", stats["operations"])  # no fall back to single calls
+        self.ftd_client.retry_policy = FTDRetryPolicy(base_delay=0.01, jitter=0, rules={"HTTPLocked": 2})
+        self.mock_fdm.fail_next(423, 3)  # more than the retry_policy allows
+        with self.assertRaises(HTTPLocked):
+            self.ftd_client.bulk_delete_network_objects([result.result.id for result in results])
+        self.assertNotIn("deleteNetworkObject", self.mock_fdm.stats()["operations"])
+        self.ftd_client.bulk_delete_network_objects([result.result.id for result in results])
+
+    def test_faults(self):
+        self.mock_fdm.expire_tokens()
+        self.assertEqual(len(self.ftd_client.get_network_object_list(filter="name:obj-1")), 1)
+        self.assertEqual(self.mock_fdm.stats()["statuses"][401], 1)
+        self.mock_fdm.fail_next(423, 2)
+        self.assertEqual(len(self.ftd_client.get_network_object_list(filter="name:obj-1")), 1)
+        self.assertEqual(self.ftd_client.retry_policy.stats()["retries"], {"HTTPLocked": 2})
+
+    def test_list_operations(self):
+        paths = self.mock_fdm.swagger_spec()["paths"].values()
+        operations = {operation["operationId"] for path_item in paths for operation in path_item.values()}
+        for name in dir(FTDClient):
+            operation = getattr(getattr(FTDClient, name), "swagger_operation", None)
+            if operation is not None:
+                self.assertIn(operation, operations, f"{name} calls {operation}")
+        icmp_obj = self.ftd_client.create_ipv4_icmp_port_object(
+            {"name": "mock-icmp", "icmpv4Type": "ECHO_REQUEST", "type": "icmpv4portobject"}
+        )
+        self.assertEqual(self.ftd_client.search_port_objects("mock-icmp").id, icmp_obj.id)
+        self.assertEqual([port_obj.id for port_obj in self.ftd_client.find_port_objects("mock-icmp")], [icmp_obj.id])
+        self.ftd_client.delete_ipv4_icmp_port_object(icmp_obj.id)
+
+    def test_platform_defaults(self):
+        self.assertEqual(self.ftd_client.get_vrf_list()[0].name, "Global")
+        self.assertEqual(len(self.ftd_client.get_manual_nat_container_list()), 2)
+        self.assertEqual(self.ftd_client.get_hostname_list()[0].hostname, "firepower")
+
+    def test_find_object_by_id(self):
+        net_obj = self.mock_fdm.objects("NetworkObject")[5]
+        self.assertEqual(self.ftd_client.find_object_by_id("networkobject", net_obj["id"]).name, net_obj["name"])
+        self.assertIsNone(self.ftd_client.find_object_by_id("networkobject", "no-such-id"))
+        operations = self.mock_fdm.stats()["operations"]
+        self.assertEqual(operations["getNetworkObject"], 2)
+        self.assertNotIn("getNetworkObjectList", operations)  # only the id is read, not every object of the type
+
+    def test_search_port_objects(self):
+        port_objs = [
+            self.ftd_client.create_tcp_port_object({"name": name, "port": "8080", "type": "tcpportobject"})
+            for name in ("mock-web-proxy", "mock-web")
+        ]
+        cached_client = FTDClient(
+            "127.0.0.1", "admin", "Admin123", verify=False, fdm_port=self.mock_fdm.port, object_cache=FTDObjectCache()
+        )
+        for ftd_client in (self.ftd_client, cached_client):  # the same exact match with and without an object_cache
+            self.assertEqual(ftd_client.search_port_objects("mock-web").id, port_objs[1].id)
+            self.assertIsNone(ftd_client.search_port_objects("mock-we"))
+        for port_obj in port_objs:
+            self.ftd_client.delete_tcp_port_object(port_obj.id)
+
+    def test_resolve_interface(self):
+        for model, parent_model, hardware_name in (
+            ("PhysicalInterface", None, "GigabitEthernet0/1"),
+            ("SubInterface", "PhysicalInterface", "GigabitEthernet0/1.10"),
+            ("EtherChannelInterface", None, "Port-channel1"),
+            ("EtherChannelSubInterface", "EtherChannelInterface", "Port-channel1.20"),
+        ):
+            parent_id = self.mock_fdm.objects(parent_model)[0]["id"] if parent_model else None
+            self.mock_fdm.seed(
+                model, 1, parent_id, make=lambda i: {"name": model.lower(), "hardwareName": hardware_name}
+            )
+        self.assertEqual(self.ftd_client.resolve_interface("Port-channel1.20").name, "etherchannelsubinterface")
+        self.assertEqual(self.ftd_client.resolve_interface("subinterface").hardwareName, "GigabitEthernet0/1.10")
+        self.assertEqual(len(self.ftd_client.refresh_interface_index()), 4)
@@ -100,3 +100,77 @@ class TestFTDNetworkObjects(TestCase):
         self.ftd_client.delete_network_object_group(updated_net_obj_grp.id)
         self.assertFalse(self.ftd_client.get_network_object_group_list(filter="name:Test-Group"))
         self.ftd_client.delete_network_object(net_obj_1.id)
+
+    def test_iter_network_objects(self):
+        net_object_list = self.ftd_client.get_network_object_list(filter="fts~any")
+        net_object_iter = list(self.ftd_client.iter_network_objects(page_size=2, filter="fts~any"))
+        self.assertEqual([obj.id for obj in net_object_iter], [obj.id for obj in net_object_list])
+
+    def test_get_list_parallel(self):
+        net_object_list = self.ftd_client.get_network_object_list(filter="fts~any")
+        net_object_parallel = self.ftd_client.get_list_parallel(
+            self.ftd_client.get_network_object_list, page_size=2, filter="fts~any"
+        )
+        self.assertEqual([obj.id for obj in net_object_parallel], [obj.id for obj in net_object_list])
+
+    def test_bulk_network_objects(self):
+        host_objs = [
+            {"name": f"TEST-BULK-{i}", "subType": "HOST", "value": f"10.1.1.{i}", "type": "networkobject"}
+            for i in range(1, 6)
+        ]
+        # Create (the last object is a duplicate of the first)
+        results = self.ftd_client.bulk_create_network_objects(host_objs + host_objs[:1], chunk_size=2)
+        self.assertEqual([result.status for result in results], ["created"] * 5 + ["duplicate"])
+
+        # Update
+        created = [result.result for result in results if result.ok]
+        for net_obj in created:
+            net_obj.description = "bulk edit"
+        results = self.ftd_client.bulk_edit_network_objects(created)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(self.ftd_client.get_network_object(created[0].id).description, "bulk edit")
+
+        # Delete
+        results = self.ftd_client.bulk_delete_network_objects([net_obj.id for net_obj in created])
+        self.assertTrue(all(result.ok for result in results))
+        self.assertFalse(self.ftd_client.get_network_object_list(filter="name:TEST-BULK-1"))
+
+    def test_upsert_network_objects(self):
+        host_obj = {"name": "TEST-UPSERT", "subType": "HOST", "value": "10.1.1.1", "type": "networkobject"}
+
+        # Create, then upsert the same object again
+        created = self.ftd_client.upsert_network_object(host_obj)
+        unchanged = self.ftd_client.upsert_network_object(host_obj)
+        self.assertEqual(unchanged.version, created.version)
+
+        # Only a real difference is sent to the device
+        edited = self.ftd_client.upsert_network_object(dict(host_obj, value="10.1.1.2"))
+        self.assertEqual(edited.id, created.id)
+        self.assertEqual(edited.value, "10.1.1.2")
+
+        # Batch mode
+        host_objs = [dict(host_obj, value="10.1.1.2"), dict(host_obj, name="TEST-UPSERT-2")]
+        results = self.ftd_client.bulk_upsert_network_objects(host_objs)
+        self.assertEqual([result.status for result in results], ["unchanged", "created"])
+
+        # Delete
+        self.ftd_client.delete_network_object(created.id)
+        self.ftd_client.delete_network_object(results[1].result.id)
+
+    def test_skip_unchanged_edits(self):
+        net_obj = self.ftd_client.create_network_object(
+            {"name": "TEST-SKIP-EDIT", "subType": "HOST", "value": "10.1.1.1", "type": "networkobject"}
+        )
+
+        # Nothing changed, so nothing is sent
+        unchanged = self.ftd_client.edit_network_object(net_obj, skip_unchanged=True)
+        self.assertEqual(unchanged.version, net_obj.version)
+        self.assertEqual(self.ftd_client.edits_skipped, 1)
+
+        net_obj.value = "10.1.1.2"
+        edited = self.ftd_client.edit_network_object(net_obj, skip_unchanged=True)
+        self.assertEqual(edited.value, "10.1.1.2")
+        self.assertEqual(self.ftd_client.edits_sent, 1)
+
+        # Delete
+        self.ftd_client.delete_network_object(net_obj.id)
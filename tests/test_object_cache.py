@@ -0,0 +1,78 @@
+from time import sleep
+from pyftd import FTDObjectCache
+from pyftd.object_cache import FTDInterfaceIndex, cache_evict, cache_put
+from tests.stubs import OfflineTestCase, StubClient, StubModel
+
+
+def net_obj(obj_id, name):
+    return StubModel(id=obj_id, name=name, type="networkobject")
+
+
+class CacheClient(StubClient):
+    def __init__(self, object_cache):
+        super().__init__()
+        self.object_cache = object_cache
+
+    @cache_put
+    def create_network_object(self, network_obj):
+        return net_obj("id-new", network_obj["name"])
+
+    @cache_evict("network_obj_id")
+    def delete_network_object(self, network_obj_id):
+        return None
+
+
+class TestFTDObjectCache(OfflineTestCase):
+    def test_get_by_name_and_id(self):
+        object_cache = FTDObjectCache()
+        object_cache.put(net_obj("id-1", "obj-1"))
+        self.assertEqual(object_cache.get("networkobject", name="obj-1").id, "id-1")
+        self.assertEqual(object_cache.get("networkobject", obj_id="id-1").name, "obj-1")
+        self.assertIsNone(object_cache.get("tcpportobject", name="obj-1"))
+        self.assertEqual(object_cache.stats()["hits"], 2)
+
+    def test_rename(self):
+        object_cache = FTDObjectCache()
+        object_cache.put(net_obj("id-1", "obj-1"))
+        object_cache.put(net_obj("id-1", "obj-renamed"))
+        self.assertIsNone(object_cache.get("networkobject", name="obj-1"))
+        self.assertEqual(object_cache.get("networkobject", name="obj-renamed").id, "id-1")
+
+    def test_load_is_complete(self):
+        object_cache = FTDObjectCache()
+        self.assertFalse(object_cache.is_complete("networkobject"))
+        object_cache.load("networkobject", [net_obj("id-1", "obj-1"), {"id": "id-2", "name": "obj-2"}])
+        self.assertTrue(object_cache.is_complete("networkobject"))
+        self.assertEqual(object_cache.get("networkobject", name="obj-2")["id"], "id-2")
+        object_cache.invalidate("networkobject")
+        self.assertFalse(object_cache.is_complete("networkobject"))
+
+    def test_ttl(self):
+        object_cache = FTDObjectCache(ttl=0.1)
+        object_cache.load("networkobject", [net_obj("id-1", "obj-1")])
+        sleep(0.2)
+        self.assertFalse(object_cache.is_complete("networkobject"))
+        self.assertIsNone(object_cache.get("networkobject", name="obj-1"))
+
+    def test_write_through(self):
+        stub_client = CacheClient(FTDObjectCache())
+        stub_client.create_network_object({"name": "obj-new"})
+        self.assertEqual(stub_client.object_cache.get("networkobject", name="obj-new").id, "id-new")
+        stub_client.delete_network_object("id-new")
+        self.assertIsNone(stub_client.object_cache.get("networkobject", obj_id="id-new"))
+
+    def test_interface_index(self):
+        interface_index = FTDInterfaceIndex()
+        interface_index.load(
+            [
+                StubModel(name="inside", hardwareName="GigabitEthernet0/1"),
+                StubModel(name="", hardwareName="GigabitEthernet0/2"),
+                StubModel(name="dmz", hardwareName="GigabitEthernet0/1.101"),
+            ]
+        )
+        self.assertTrue(interface_index.loaded)
+        self.assertEqual(interface_index.get("inside").hardwareName, "GigabitEthernet0/1")
+        self.assertEqual(interface_index.get("GigabitEthernet0/1.101").name, "dmz")
+        self.assertEqual(interface_index.get("GigabitEthernet0/2").name, "")
+        self.assertIsNone(interface_index.get(""))
+        self.assertIsNone(interface_index.get("outside"))
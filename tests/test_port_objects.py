@@ -137,4 +137,20 @@ class TestURLObjects(TestCase):
 
         self.ftd_client.delete_tcp_port_object(tcp_obj.id)
         self.ftd_client.delete_udp_port_object(udp_obj.id)
-        self.ftd_client.delete_ipv4_icmp_port_object(icmp_obj.id)
\ No newline at end of file
+        self.ftd_client.delete_ipv4_icmp_port_object(icmp_obj.id)
+
+    def test_resolve_port_objects(self):
+        tcp_obj = self.ftd_client.create_tcp_port_object(
+            {"name": "Port-Test", "description": "test", "port": "53", "type": "tcpportobject"}
+        )
+        udp_obj = self.ftd_client.create_udp_port_object(
+            {"name": "Port-Test", "description": "test", "port": "53", "type": "udpportobject"}
+        )
+
+        self.assertEqual(len(self.ftd_client.find_port_objects("Port-Test")), 2)
+        port_objs = self.ftd_client.resolve_port_objects(["Port-Test", "No-Such-Port-Test"])
+        self.assertEqual({port_obj.type for port_obj in port_objs["Port-Test"]}, {"tcpportobject", "udpportobject"})
+        self.assertEqual(port_objs["No-Such-Port-Test"], [])
+
+        self.ftd_client.delete_tcp_port_object(tcp_obj.id)
+        self.ftd_client.delete_udp_port_object(udp_obj.id)
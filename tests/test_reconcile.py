@@ -0,0 +1,108 @@
+from pyftd.reconcile import FTDReconciler, resolve_references
+from tests.stubs import OfflineTestCase, StubClient, StubModel
+
+
+class ReconcileClient(FTDReconciler, StubClient):
+    def __init__(self, device: list):
+        super().__init__()
+        self.device = {(obj.type, getattr(obj, "parent", None), obj.name): obj for obj in device}
+        self.containers = {
+            "objectnatrule": [],
+            "manualnatrule": [StubModel(id="id-before", name="before"), StubModel(id="id-after", name="after")],
+        }
+        self.sent = []
+
+    def object_list_methods(self):
+        return {}
+
+    def load_state(self, obj_types, vrf_id="default"):
+        known = {key: obj for key, obj in self.device.items() if key[0] in obj_types}
+        return known, self.containers
+
+    def gather(self, *calls):
+        return [call() for call in calls]
+
+    def resolve_interface(self, name):
+        return StubModel(id="id-inside", version="v", name=name, type="physicalinterface")
+
+    def reconcile_methods(self, obj_type):
+        def create(*args, **kwargs):
+            obj = args[-1]
+            self.sent.append(("create", obj["name"]))
+            return StubModel(id=f"id-{obj['name']}", version="v1", **obj)
+
+        def edit(*args, skip_unchanged=None, **kwargs):
+            self.sent.append(("edit", args[-1].name))
+            return args[-1]
+
+        def delete(*args, **kwargs):
+            self.sent.append(("delete", args[-1]))
+
+        return create, edit, delete
+
+
+class TestReconcile(OfflineTestCase):
+    def setUp(self):
+        self.ftd_client = ReconcileClient(
+            [
+                StubModel(id="id-web", version="v", name="WEB", type="networkobject", subType="HOST", value="10.1.1.1"),
+                StubModel(id="id-old", version="v", name="OLD", type="networkobject", subType="HOST", value="10.1.1.9"),
+                StubModel(
+                    id="id-grp",
+                    version="v",
+                    name="GRP",
+                    type="networkobjectgroup",
+                    objects=[{"id": "id-old", "name": "OLD", "type": "networkobject"}],
+                ),
+                StubModel(id="id-sys", version="v", name="any-ipv4", type="networkobject", isSystemDefined=True),
+            ]
+        )
+        self.desired = [
+            {"type": "networkobjectgroup", "name": "GRP", "objects": [{"type": "networkobject", "name": "NEW"}]},
+            {"type": "networkobject", "name": "WEB", "subType": "HOST", "value": "10.1.1.1"},
+            {"type": "networkobject", "name": "NEW", "subType": "HOST", "value": "10.1.1.2"},
+        ]
+
+    def test_plan_order(self):
+        plan = self.ftd_client.plan_changes(self.desired, prune=True)
+        self.assertEqual(plan.summary(), {"create": 1, "edit": 1, "delete": 1, "unchanged": 1})
+        self.assertEqual(
+            [[(change.action, change.name) for change in wave] for wave in plan.waves],
+            [[("create", "NEW")], [("edit", "GRP")], [("delete", "OLD")]],
+        )
+        self.assertEqual(self.ftd_client.plan_changes(self.desired).summary()["delete"], 0)  # prune is opt-in
+
+    def test_apply_plan(self):
+        results = self.ftd_client.reconcile(self.desired, prune=True)
+        self.assertTrue(all(change_result.ok for change_result in results))
+        self.assertEqual(self.ftd_client.sent, [("create", "NEW"), ("edit", "GRP"), ("delete", "id-old")])
+        # The group refers to the object created in the wave before it
+        self.assertEqual(results[1].result.objects[0]["id"], "id-NEW")
+
+    def test_delete_in_use(self):
+        desired = [{"type": "networkobject", "name": "WEB", "subType": "HOST", "value": "10.1.1.1"}]
+        with self.assertRaises(ValueError):  # GRP still uses OLD and is not managed by this plan
+            self.ftd_client.plan_changes(desired, prune=True)
+
+    def test_resolve_references(self):
+        known = {("physicalinterface", None, "inside"): StubModel(id="id-inside", version="v1")}
+        rule = {
+            "type": "manualnatrule",
+            "name": "NAT",
+            "sourceInterface": {"type": "physicalinterface", "name": "inside"},
+        }
+        resolved = resolve_references(rule, known)
+        self.assertEqual(resolved["sourceInterface"]["id"], "id-inside")
+        self.assertNotIn("id", resolved)
+        self.assertNotIn("id", rule["sourceInterface"])
+
+    def test_same_name_in_other_container(self):
+        nat_rule = {"type": "manualnatrule", "name": "NAT-1", "enabled": True}
+        self.ftd_client.device[("manualnatrule", "id-after", "NAT-1")] = StubModel(
+            id="id-nat-after", version="v", name="NAT-1", type="manualnatrule", enabled=False, parent="id-after"
+        )
+        plan = self.ftd_client.plan_changes([nat_rule], prune=True, manual_nat_container="before")
+        self.assertEqual([(change.action, change.parent_id) for change in plan], [("create", "id-before")])
+        plan = self.ftd_client.plan_changes([nat_rule], prune=True, manual_nat_container="after")
+        self.assertEqual([(change.action, change.parent_id) for change in plan], [("edit", "id-after")])
+        self.assertEqual(list(plan)[0].key, ("manualnatrule", "id-after", "NAT-1"))
@@ -0,0 +1,65 @@
+from pyftd import FTDRetryPolicy
+from pyftd.base import FTDAPIWrapper
+from bravado.exception import HTTPLocked, HTTPNotFound
+from tests.stubs import OfflineTestCase, StubClient, StubResponse
+
+
+class LockedClient(StubClient):
+    """A client whose get_page() fails with 423 Locked the number of times in locked"""
+
+    def __init__(self, locked: int):
+        super().__init__()
+        self.locked = locked
+        self.attempts = {"get_page": 0, "search": 0}
+
+    @FTDAPIWrapper()
+    def get_page(self, offset: int) -> int:
+        self.attempts["get_page"] += 1
+        if self.locked:
+            self.locked -= 1
+            raise HTTPLocked(StubResponse(423))
+        return offset
+
+    @FTDAPIWrapper()
+    def search(self) -> list:
+        self.attempts["search"] += 1
+        return self.gather(lambda: self.get_page(0), lambda: self.get_page(1))
+
+
+class TestFTDRetryPolicy(OfflineTestCase):
+    def test_retry_reason(self):
+        self.assertEqual(FTDRetryPolicy.retry_reason(HTTPLocked(StubResponse(423))), "HTTPLocked")
+        self.assertIsNone(FTDRetryPolicy.retry_reason(HTTPNotFound(StubResponse(404))))
+        self.assertIsNone(FTDRetryPolicy.retry_reason(ValueError()))
+
+    def test_exponential_backoff(self):
+        retry_policy = FTDRetryPolicy(base_delay=1, multiplier=2, max_delay=5, jitter=0)
+        delays = [retry_policy.next_delay("HTTPLocked", retries, 0) for retries in range(5)]
+        self.assertEqual(delays, [1, 2, 4, 5, 5])
+        self.assertEqual(retry_policy.stats()["retries"], {"HTTPLocked": 5})
+
+    def test_jitter(self):
+        retry_policy = FTDRetryPolicy(base_delay=10, jitter=0.5)
+        for _ in range(100):
+            self.assertTrue(5 <= retry_policy.next_delay("HTTPLocked", 0, 0) <= 10)
+
+    def test_give_up_on_rule(self):
+        retry_policy = FTDRetryPolicy(rules={"HTTPLocked": 2})
+        self.assertIsNotNone(retry_policy.next_delay("HTTPLocked", 1, 0))
+        self.assertIsNone(retry_policy.next_delay("HTTPLocked", 2, 0))
+        self.assertIsNone(retry_policy.next_delay("SomethingElse", 0, 0))
+        self.assertEqual(retry_policy.stats()["giveups"], {"HTTPLocked": 1, "SomethingElse": 1})
+
+    def test_give_up_on_max_elapsed(self):
+        retry_policy = FTDRetryPolicy(base_delay=10, jitter=0, max_elapsed=60)
+        self.assertEqual(retry_policy.next_delay("HTTPLocked", 0, 45), 10)
+        self.assertIsNone(retry_policy.next_delay("HTTPLocked", 0, 55))
+
+    def test_retry_outermost_call(self):
+        stub_client = LockedClient(locked=1)
+        self.assertEqual(stub_client.search(), [0, 1])
+        self.assertEqual(stub_client.attempts["search"], 2)  # the inner get_page did not retry on its own
+        self.assertEqual(stub_client.retry_policy.stats()["retries"], {"HTTPLocked": 1})
+        stub_client = LockedClient(locked=1)
+        self.assertEqual(stub_client.get_page(2), 2)  # not inside another call, so it retries itself
+        self.assertEqual(stub_client.attempts["get_page"], 2)
@@ -0,0 +1,105 @@
+import gzip
+import json
+import os
+import tempfile
+from types import SimpleNamespace
+from pyftd.base import list_operation
+from pyftd.snapshot import FTDSnapshot, iter_snapshot
+from pyftd.snapshot_diff import diff_snapshots, summarize
+from tests.stubs import OfflineTestCase, StubClient, StubModel
+
+
+class SnapshotClient(FTDSnapshot, StubClient):
+    ftd_ip = "192.168.100.100"
+    api_version = 6
+    swagger_client = SimpleNamespace(
+        NetworkObject=SimpleNamespace(getNetworkObjectList=None),
+        NAT=SimpleNamespace(getManualNatRuleContainerList=None, getManualNatRuleList=None),
+    )
+    pages = {
+        "getNetworkObjectList": [
+            StubModel(id=f"id-{i}", name=f"obj-{i}", type="networkobject", value="10.1.1.1") for i in range(250)
+        ],
+        "getManualNatRuleContainerList": [StubModel(id="id-before", name="NGFW-Before-Auto-NAT-Policy")],
+        "getManualNatRuleList": [StubModel(id="id-nat", name="NAT-1", type="manualnatrule")],
+    }
+
+    @list_operation("NetworkObject", "getNetworkObjectList", obj_type="networkobject")
+    def get_network_object_list(self):
+        pass
+
+    @list_operation("NetworkObjectGroup", "getNetworkObjectGroupList", obj_type="networkobjectgroup")
+    def get_network_object_group_list(self):
+        pass  # not in the spec of this device
+
+    @list_operation("NAT", "getManualNatRuleContainerList", obj_type="manualnatrulecontainer")
+    def get_manual_nat_container_list(self):
+        pass
+
+    @list_operation("NAT", "getManualNatRuleList", parentId="manual_nat_parent_id")
+    def get_manual_nat_policy_list(self, manual_nat_parent_id):
+        pass
+
+    def iter_pages(self, resource, operation, page_size=100, **params):
+        yield from self.pages[operation]
+
+    def get_ntp_servers_list(self):
+        return [StubModel(id="id-ntp", type="ntp", name=None, ntpServers=["0.pool.ntp.org"])]
+
+    def get_hostname_list(self):
+        return [StubModel(id="id-host", type="devicehostname", name=None, hostname="ftd1")]
+
+    def get_mgmt_dns_settings_list(self):
+        raise ValueError("not on this device")
+
+    def get_data_dns_settings_list(self):
+        return []
+
+
+def write_snapshot(path, objs):
+    with gzip.open(path, "wt") as snapshot_file:
+        snapshot_file.write(json.dumps({"snapshot": {"ftd_ip": "192.168.100.100"}}) + "\n")
+        for obj in objs:
+            record = FTDSnapshot.record(StubModel(**obj), "getNetworkObjectList")
+            snapshot_file.write(json.dumps(record) + "\n")
+
+
+class TestSnapshot(OfflineTestCase):
+    def test_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "ftd1.jsonl.gz")
+            summary = SnapshotClient().snapshot(path, queue_size=10)
+            records = list(iter_snapshot(path))
+        self.assertEqual(summary["records"], 254)
+        self.assertEqual(len(records), 254)
+        self.assertEqual(summary["types"]["networkobject"], 250)
+        self.assertEqual(list(summary["errors"]), ["get_mgmt_dns_settings_list"])
+        nat_rule = next(record for record in records if record["type"] == "manualnatrule")
+        self.assertEqual((nat_rule["name"], nat_rule["parent"]), ("NAT-1", "NGFW-Before-Auto-NAT-Policy"))
+        self.assertEqual(next(record for record in records if record["type"] == "devicehostname")["name"], None)
+
+    def test_diff_snapshots(self):
+        old = [
+            {"id": f"old-{i}", "version": "a", "name": f"obj-{i}", "type": "networkobject", "value": "10.1.1.1"}
+            for i in range(5)
+        ]
+        # The other device has its own ids and versions for the same objects
+        new = [dict(obj, id=f"new-{i}", version="b") for i, obj in enumerate(old)]
+        new[1]["value"] = "10.1.1.2"
+        new[2]["description"] = "added field"
+        del new[3]
+        new.append({"id": "new-9", "name": "obj-9", "type": "networkobject", "value": "10.1.1.9"})
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            old_path, new_path = os.path.join(tmp_dir, "old.jsonl.gz"), os.path.join(tmp_dir, "new.jsonl.gz")
+            write_snapshot(old_path, old)
+            write_snapshot(new_path, new)
+            changes = list(diff_snapshots(old_path, new_path))
+            self.assertEqual(list(diff_snapshots(old_path, old_path)), [])
+            self.assertEqual(list(diff_snapshots(old_path, new_path, ignore_types=["networkobject"])), [])
+        self.assertEqual(
+            [(change.status, change.name) for change in changes],
+            [("added", "obj-9"), ("changed", "obj-1"), ("changed", "obj-2"), ("removed", "obj-3")],
+        )
+        self.assertEqual(changes[1].fields, {"value": ("10.1.1.1", "10.1.1.2")})
+        self.assertEqual(changes[2].fields, {"description": (None, "added field")})
+        self.assertEqual(summarize(changes), {"networkobject": {"added": 1, "removed": 1, "changed": 2}})
@@ -0,0 +1,88 @@
+import warnings
+from shutil import which
+from unittest import skipIf
+from pyftd import FTDClient, FTDMockServer, FTDSpecCache
+from tests.stubs import OfflineTestCase
+from os import listdir, utime
+from tempfile import TemporaryDirectory
+
+
+class TestFTDSpecCache(OfflineTestCase):
+    """
+    Exercise the on-disk swagger spec cache in a temporary directory.
+    """
+
+    def setUp(self):
+        self.tmp_dir = TemporaryDirectory()
+        self.spec_cache = FTDSpecCache(self.tmp_dir.name, max_entries=2)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_cache_key(self):
+        self.assertEqual(FTDSpecCache.cache_key(6, "7.0.1-84"), "v6-7.0.1-84")
+        self.assertEqual(FTDSpecCache.cache_key(6, "7.0/1 84"), "v6-7.0_1_84")
+
+    def test_get_put(self):
+        key = FTDSpecCache.cache_key(6, "7.0.1-84")
+        self.assertIsNone(self.spec_cache.get(key))
+        self.spec_cache.put(key, {"swagger": "2.0", "paths": {}})
+        self.assertEqual(self.spec_cache.get(key), {"swagger": "2.0", "paths": {}})
+
+    def test_evict_least_recently_used(self):
+        for count, key in enumerate(["v5-6.7.0-65", "v6-7.0.0-94", "v6-7.0.1-84"]):
+            self.spec_cache.put(key, {"swagger": "2.0"})
+            utime(self.spec_cache._spec_file(key), (1000 + count, 1000 + count))
+            self.spec_cache.evict()
+        self.assertEqual(len(listdir(self.tmp_dir.name)), 2)
+        self.assertIsNone(self.spec_cache.get("v5-6.7.0-65"))
+
+    def test_evict_max_bytes(self):
+        self.spec_cache.max_bytes = 1
+        self.spec_cache.put("v6-7.0.1-84", {"swagger": "2.0"})
+        self.assertIsNone(self.spec_cache.get("v6-7.0.1-84"))
+
+    def test_corrupt_entry(self):
+        with open(self.spec_cache._spec_file("v6-7.0.1-84"), "w") as fp:
+            fp.write("{not json")
+        self.assertIsNone(self.spec_cache.get("v6-7.0.1-84"))
+        self.assertEqual(listdir(self.tmp_dir.name), [])
+
+    def test_device_key(self):
+        self.assertIsNone(self.spec_cache.device_key("https://192.168.100.100", 6))
+        self.spec_cache.put_device("https://192.168.100.100", 6, "v6-7.0.1-84")
+        self.assertEqual(self.spec_cache.device_key("https://192.168.100.100", 6), "v6-7.0.1-84")
+        self.assertIsNone(self.spec_cache.device_key("https://192.168.100.100", 7))  # upgraded
+        self.assertIsNone(self.spec_cache.device_key("https://192.168.100.101", 6))
+        self.spec_cache.device_ttl = 0  # the software build has to be read again
+        self.assertIsNone(self.spec_cache.device_key("https://192.168.100.100", 6))
+        self.spec_cache.clear()
+        self.assertIsNone(self.spec_cache.device_key("https://192.168.100.100", 6))
+
+    @skipIf(which("openssl") is None, "the mock FDM generates its certificate with openssl")
+    def test_cache_hit_without_requests(self):
+        warnings.simplefilter("ignore")  # the mock has a self-signed certificate
+        with FTDMockServer() as mock_fdm:
+            for _ in range(2):
+                mock_fdm.reset_stats()
+                FTDClient(
+                    "127.0.0.1", "admin", "Admin123", verify=False, fdm_port=mock_fdm.port, spec_cache=self.spec_cache
+                )
+            operations = mock_fdm.stats()["operations"]
+        self.assertNotIn("getSpec", operations)
+        self.assertNotIn("getSystemInformation", operations)
+        self.assertEqual(operations["getVersions"], 1)
+
+    @skipIf(which("openssl") is None, "the mock FDM generates its certificate with openssl")
+    def test_cache_hit_checks_software_build(self):
+        warnings.simplefilter("ignore")  # the mock has a self-signed certificate
+        self.spec_cache.device_ttl = 0
+        with FTDMockServer() as mock_fdm:
+            for _ in range(2):
+                mock_fdm.reset_stats()
+                FTDClient(
+                    "127.0.0.1", "admin", "Admin123", verify=False, fdm_port=mock_fdm.port, spec_cache=self.spec_cache
+                )
+            operations = mock_fdm.stats()["operations"]
+        self.assertNotIn("getSpec", operations)
+        self.assertEqual(operations["getSystemInformation"], 1)
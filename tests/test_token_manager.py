@@ -0,0 +1,78 @@
+from threading import Thread
+from pyftd.token_manager import FTDTokenManager
+from tests.stubs import OfflineTestCase
+
+
+class StubTokenClient:
+    """Stands in for FTDBaseClient and records which grant the token manager asked for"""
+
+    def __init__(self, refresh_ok=True):
+        self.grants = []
+        self.refresh_ok = refresh_ok
+        self.token_manager = FTDTokenManager(self)
+
+    def get_access_token(self):
+        self.grants.append("password")
+        self.token_manager.set_token(
+            {
+                "access_token": f"a-{len(self.grants)}",
+                "expires_in": 1800,
+                "refresh_token": "r",
+                "refresh_expires_in": 2400,
+            }
+        )
+
+    def refresh_access_token(self):
+        self.grants.append("refresh_token")
+        if not self.refresh_ok:
+            return {"status_code": 400}
+        self.token_manager.set_token(
+            {"access_token": "b", "expires_in": 1800, "refresh_token": "r", "refresh_expires_in": 2400}
+        )
+
+
+class TestFTDTokenManager(OfflineTestCase):
+    def test_no_token(self):
+        client = StubTokenClient()
+        client.token_manager.ensure_token()
+        self.assertEqual(client.grants, ["password"])
+
+    def test_valid_token(self):
+        client = StubTokenClient()
+        client.get_access_token()
+        client.token_manager.ensure_token()
+        self.assertEqual(client.grants, ["password"])
+
+    def test_refresh_before_expiry(self):
+        client = StubTokenClient()
+        client.get_access_token()
+        client.token_manager.access_expires_at -= 1800 - 30  # 30 seconds left, inside the refresh margin
+        client.token_manager.ensure_token()
+        self.assertEqual(client.grants, ["password", "refresh_token"])
+        self.assertEqual(client.token_manager.token["access_token"], "b")
+
+    def test_password_grant_when_refresh_token_expired(self):
+        client = StubTokenClient()
+        client.get_access_token()
+        client.token_manager.access_expires_at -= 1800
+        client.token_manager.refresh_expires_at -= 2400
+        client.token_manager.ensure_token()
+        self.assertEqual(client.grants, ["password", "password"])
+
+    def test_password_grant_when_refresh_rejected(self):
+        client = StubTokenClient(refresh_ok=False)
+        client.get_access_token()
+        client.token_manager.access_expires_at -= 1800
+        client.token_manager.ensure_token()
+        self.assertEqual(client.grants, ["password", "refresh_token", "password"])
+
+    def test_renew_rejected_once(self):
+        client = StubTokenClient()
+        client.get_access_token()
+        rejected = client.token_manager.access_token
+        threads = [Thread(target=client.token_manager.renew_rejected, args=(rejected,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(client.grants, ["password", "password"])  # the other threads use the new token